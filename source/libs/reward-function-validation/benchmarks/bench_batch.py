@@ -0,0 +1,49 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compare validating a reward function against every track one request at a
+time, as a client looping over the tracks does, with a single batch
+validation.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/bench_batch.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "tests"))
+from parallel import default_workers
+from reward_function_fixtures import OBJECT_AVOIDANCE_REWARD_FUNCTION
+from test_reward_function import run_suites, run_suites_on_tracks
+from tracks import get_track_registry
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    registry = get_track_registry()
+    registry.preload()
+    names = sorted(registry.names)
+    source = OBJECT_AVOIDANCE_REWARD_FUNCTION
+
+    single = timed(lambda: run_suites(source, names[0]))
+    serial = timed(lambda: [run_suites(source, name) for name in names])
+    batch = timed(lambda: run_suites_on_tracks(source, "*"))
+    print(f"tracks: {len(names)}, workers: {default_workers()}")
+    print(f"one track:           {single * 1e3:8.1f} ms")
+    print(f"one request a track: {serial * 1e3:8.1f} ms")
+    print(f"batch:               {batch * 1e3:8.1f} ms ({serial / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
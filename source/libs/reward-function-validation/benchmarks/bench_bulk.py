@@ -0,0 +1,63 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compare validation throughput of single-item lambda_handler calls with one
+bulk call carrying the same items.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/bench_bulk.py [items]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "tests"))
+import reward_function_fixtures
+from lambda_function import lambda_handler
+from parallel import default_workers
+
+TRACK_NAMES = ["reInvent2019_track_ccw", "Oval_track", "Bowtie_track"]
+SOURCES = [
+    reward_function_fixtures.BASIC_REWARD_FUNCTION,
+    reward_function_fixtures.ADVANCED_REWARD_FUNCTION_PENALIZING_STEERING,
+    reward_function_fixtures.ADVANCED_REWARD_FUNCTION_PENALIZING_SPEED,
+    reward_function_fixtures.OBJECT_AVOIDANCE_REWARD_FUNCTION,
+]
+
+
+def make_items(count, tag):
+    # A unique comment per item keeps the result cache from serving repeats
+    return [
+        {
+            "reward_function": f"{SOURCES[i % len(SOURCES)]}# {tag} {i}\n",
+            "track_name": TRACK_NAMES[i % len(TRACK_NAMES)],
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    lambda_handler(make_items(1, "warm")[0], None)
+
+    start = time.perf_counter()
+    for item in make_items(count, "single"):
+        lambda_handler(item, None)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lambda_handler({"items": make_items(count, "bulk")}, None)
+    bulk = time.perf_counter() - start
+
+    print(f"items: {count}, workers: {default_workers()}")
+    print(f"single-item calls: {count / single:8.1f} items/s")
+    print(f"one bulk call:     {count / bulk:8.1f} items/s ({single / bulk:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
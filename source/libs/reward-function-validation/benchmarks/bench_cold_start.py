@@ -0,0 +1,100 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Measure the cold start of the validation Lambda in fresh interpreters: the
+import time of each module, the init phase (importing lambda_function as
+the Lambda runtime does) and the first and second invocations.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/bench_cold_start.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+LIB_DIR = os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+TOP_MODULES = 15
+
+# Runs in the fresh interpreter; prints the phase timings as JSON
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.append({lib_dir!r})
+from lambda_function import lambda_handler
+init = time.perf_counter()
+event = {{"reward_function": {source!r}, "track_name": "reInvent2019_track_ccw"}}
+assert json.loads(lambda_handler(event, None)["body"]) == []
+first = time.perf_counter()
+# Another source, so the result is not served from the cache
+event["reward_function"] += "\\n\\n\\nSECOND = 2\\n"
+assert json.loads(lambda_handler(event, None)["body"]) == []
+second = time.perf_counter()
+print(json.dumps({{
+    "init": init - start, "first": first - init, "second": second - first
+}}))
+"""
+
+
+def _environment():
+    # As in the Lambda execution environment, which init() checks for
+    return dict(os.environ, AWS_LAMBDA_FUNCTION_NAME="bench_cold_start")
+
+
+def import_times():
+    """Return {module: (self_us, cumulative_us)} of the imports a request
+    needs, whether lambda_function imports them or the handler does.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import lambda_function, validator"],
+        cwd=os.getcwd(),
+        env=dict(_environment(), PYTHONPATH=LIB_DIR),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:") :].split("|")
+        if not fields[0].strip().isdigit():
+            continue
+        times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return times
+
+
+def cold_start(source):
+    script = COLD_START.format(lib_dir=LIB_DIR, source=source)
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        env=_environment(),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main(runs):
+    sys.path.append(os.path.join(os.path.dirname(__file__), "..", "tests"))
+    from reward_function_fixtures import BASIC_REWARD_FUNCTION
+
+    times = import_times()
+    print(f"{'module':40} {'self ms':>8} {'total ms':>9}")
+    slowest = sorted(times.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in slowest[:TOP_MODULES]:
+        print(f"{name:40} {self_us / 1e3:8.1f} {cumulative_us / 1e3:9.1f}")
+    print(f"{len(times)} modules imported")
+
+    samples = [cold_start(BASIC_REWARD_FUNCTION) for _ in range(runs)]
+    for phase in ("init", "first", "second"):
+        median = statistics.median(sample[phase] for sample in samples)
+        print(f"{phase:6} invocation median {median * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
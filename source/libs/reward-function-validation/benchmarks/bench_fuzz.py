@@ -0,0 +1,62 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Measure how fast fuzzing generates params and runs a reward function on
+them, for several chunk sizes. A chunk size of 1 is the cost of building
+the samples one at a time.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/bench_fuzz.py [samples]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+from fuzz import fuzz, generate_params
+from tracks import get_track_registry
+
+TRACK_NAME = "reInvent2019_track_ccw"
+CHUNK_SIZES = (1, 16, 250, 2000)
+
+
+def generation_rate(track, samples, chunk_size):
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(samples // chunk_size):
+        generate_params(track, chunk_size, rng)
+    return samples / (time.perf_counter() - start)
+
+
+def fuzz_rate(track, samples, chunk_size):
+    start = time.perf_counter()
+    report = fuzz(
+        lambda params: float(params["speed"]),
+        track,
+        budget=600,
+        samples=samples,
+        chunk_size=chunk_size,
+    )
+    return report.samples / (time.perf_counter() - start)
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    track = get_track_registry().get(TRACK_NAME)
+    print(f"{samples} samples on {TRACK_NAME}")
+    for chunk_size in CHUNK_SIZES:
+        print(
+            f"chunk {chunk_size:5d}: "
+            f"generate {generation_rate(track, samples, chunk_size):9.0f}/s, "
+            f"fuzz {fuzz_rate(track, samples, chunk_size):9.0f}/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compare the vectorized TrackGeometry with the former scalar track length loop.
+
+Run from anywhere: python benchmarks/bench_geometry.py
+"""
+
+import math
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+from geometry import TrackGeometry
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "..", "routes")
+REPEAT = 5
+
+
+def scalar_track_length(waypoints):
+    track_length = 0
+    for i in range(1, waypoints.shape[0]):
+        track_length += math.sqrt(
+            (waypoints[i, 2] - waypoints[i - 1, 2]) ** 2
+            + (waypoints[i, 3] - waypoints[i - 1, 3]) ** 2
+        )
+    return track_length
+
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=REPEAT)) / number
+
+
+def resample(waypoints, count):
+    """Linearly resample a track to count waypoints."""
+    src = np.linspace(0, 1, len(waypoints))
+    dst = np.linspace(0, 1, count)
+    return np.column_stack([np.interp(dst, src, col) for col in waypoints.T])
+
+
+def main():
+    tracks = [
+        (name[: -len(".npy")], np.load(os.path.join(ROUTES_DIR, name)))
+        for name in sorted(os.listdir(ROUTES_DIR))
+        if name.endswith(".npy")
+    ]
+    longest = max(tracks, key=lambda t: len(t[1]))[1]
+    tracks.append(("resampled_5000", resample(longest, 5000)))
+
+    print(
+        f"{'track':<32}{'waypoints':>10}{'loop us':>12}{'vector us':>12}{'speedup':>10}"
+    )
+    loop_total = vector_total = 0.0
+    for name, waypoints in tracks:
+        loop = best_of(lambda: scalar_track_length(waypoints), 20) * 1e6
+        vector = best_of(lambda: TrackGeometry(waypoints), 200) * 1e6
+        loop_total += loop
+        vector_total += vector
+        print(
+            f"{name:<32}{len(waypoints):>10}{loop:>12.1f}{vector:>12.1f}{loop / vector:>9.1f}x"
+        )
+    print(
+        f"{'total (' + str(len(tracks)) + ' tracks)':<42}"
+        f"{loop_total:>12.1f}{vector_total:>12.1f}{loop_total / vector_total:>9.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compare the runtime checks run in-process, one thread per test, with the
+same checks run by the pre-forked worker pool.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/bench_pool.py [requests]
+"""
+
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "tests"))
+from context import ValidationContext
+from parallel import default_workers
+from pool import get_worker_pool
+from reward_function_fixtures import OBJECT_AVOIDANCE_REWARD_FUNCTION
+from test_reward_function import (
+    _run_runtime_request,
+    run_runtime_checks,
+    run_runtime_checks_in_process,
+)
+
+TRACK_NAME = "reInvent2019_track_ccw"
+# CPU bound on purpose, so the GIL limits the in-process threads
+CPU_BOUND_REWARD_FUNCTION = """import math
+
+
+def reward_function(params):
+    total = 0.0
+    for i in range(20000):
+        total += math.sqrt(i)
+    return 1.0
+"""
+
+
+def latencies(check, source, count):
+    samples = []
+    for _ in range(count):
+        context = ValidationContext(source, TRACK_NAME)
+        start = time.perf_counter()
+        check(context)
+        samples.append(time.perf_counter() - start)
+        context.close()
+    return samples
+
+
+def concurrent_throughput(source, count):
+    def one(_):
+        context = ValidationContext(source, TRACK_NAME)
+        try:
+            return run_runtime_checks(context)
+        finally:
+            context.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(default_workers()) as executor:
+        list(executor.map(one, range(count)))
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    get_worker_pool(_run_runtime_request)
+    print(f"requests: {count}, workers: {default_workers()}")
+    print(f"{'reward function':<18}{'mode':<12}{'p50 ms':>10}{'max ms':>10}")
+    for label, source in (
+        ("object avoidance", OBJECT_AVOIDANCE_REWARD_FUNCTION),
+        ("cpu bound", CPU_BOUND_REWARD_FUNCTION),
+    ):
+        for mode, check in (
+            ("in-process", run_runtime_checks_in_process),
+            ("pool", run_runtime_checks),
+        ):
+            samples = latencies(check, source, count)
+            print(
+                f"{label:<18}{mode:<12}{statistics.median(samples) * 1e3:>10.2f}"
+                f"{max(samples) * 1e3:>10.2f}"
+            )
+        print(
+            f"{label:<18}{'pool, concurrent':<22}"
+            f"{concurrent_throughput(source, count):>10.1f} requests/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
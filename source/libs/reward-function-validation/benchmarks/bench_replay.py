@@ -0,0 +1,50 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Time a full lap replay on the longest track, split into building the
+trajectory and streaming its steps through a reward function.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/bench_replay.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "tests"))
+from loader import load_reward_function, source_filename
+from replay import Trajectory, replay
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from tracks import get_track_registry
+
+REPEAT = 5
+
+
+def best_of(fn):
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT))
+
+
+def main():
+    registry = get_track_registry()
+    registry.preload()
+    track = max(
+        (registry.get(name) for name in registry.names), key=lambda t: t.track_length
+    )
+    reward_function = load_reward_function(
+        BASIC_REWARD_FUNCTION, source_filename()
+    ).reward_function
+    steps = len(Trajectory(track))
+    print(f"{track.name}: {track.track_length:.1f} m, {steps} steps")
+    print(f"trajectory  {best_of(lambda: Trajectory(track)) * 1e3:7.2f} ms")
+    print(
+        f"full replay {best_of(lambda: replay(reward_function, track)) * 1e3:7.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Time lambda_handler on passing reward functions from 1 KB to 1 MB, in this
+process and with logging on, to check that the cost of a validation grows
+linearly with the size of the source. Sources over the size limit are
+rejected; --no-limit lifts it to time every check up to the lint timeout.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/bench_source_size.py [--no-limit]
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+# Every stage runs in this process, so it shows in the stage timings
+os.environ["VALIDATION_POOL_WORKERS"] = "0"
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import test_reward_function
+from corpus import source_of_size
+from lambda_function import lambda_handler
+from validator import warm_up
+
+TRACK_NAME = "reInvent2019_track_ccw"
+SIZES_KB = (1, 4, 16, 64, 256, 1024)
+RUNS = 3
+STAGES = ("lint", "static", "import", "runtime")
+
+
+def validate(source):
+    # Another statement per run, so no result comes from the cache
+    source += f"\n\nRUN = {time.perf_counter_ns()}\n"
+    event = {"reward_function": source, "track_name": TRACK_NAME}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        response = lambda_handler(event, None)
+    elapsed = time.perf_counter() - start
+    return elapsed, json.loads(response["body"]), response.get("metrics", {})
+
+
+def main(no_limit):
+    if no_limit:
+        test_reward_function.REWARD_FUNCTION_MAX_BYTES = float("inf")
+    # Logged as in Lambda, but to a file rather than the terminal
+    handler = logging.FileHandler(os.devnull)
+    logging.getLogger().handlers = [handler]
+    warm_up([TRACK_NAME])
+    validate(source_of_size(1024))
+
+    print(f"{'size':>8} {'ms':>9} {'ms/KB':>7} " + " ".join(f"{s:>8}" for s in STAGES))
+    for kb in SIZES_KB:
+        source = source_of_size(kb * 1024)
+        samples = sorted((validate(source) for _ in range(RUNS)), key=lambda s: s[0])
+        elapsed, errors, metrics = samples[len(samples) // 2]
+        timings = metrics.get("timings", {})
+        stages = " ".join(f"{timings.get(s, 0.0):8.1f}" for s in STAGES)
+        outcome = errors[0]["message"] if errors else "passed"
+        print(
+            f"{kb:6} KB {elapsed * 1e3:9.1f} {elapsed * 1e3 / kb:7.2f} {stages}"
+            f"  {outcome}"
+        )
+
+
+if __name__ == "__main__":
+    main("--no-limit" in sys.argv[1:])
@@ -0,0 +1,76 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Time 10^5 nearest segment queries per track with the track index against a
+full scan of the segments, for positions near the track (up to a track
+width off the center line) and anywhere around it.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/bench_spatial.py [track_name ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+from spatial import SegmentGrid
+from tracks import get_track_registry
+
+QUERIES = 10**5
+
+
+def queries(geometry, rng):
+    points = geometry.center
+    segments = rng.integers(0, len(points) - 1, QUERIES)
+    fractions = rng.random(QUERIES)[:, None]
+    offsets = rng.uniform(-1, 1, QUERIES) * geometry.widths[segments]
+    near = (
+        points[segments]
+        + (points[segments + 1] - points[segments]) * fractions
+        + geometry.normals[segments] * offsets[:, None]
+    )
+    low, high = points.min(axis=0) - 2, points.max(axis=0) + 2
+    return {"near": near, "around": rng.uniform(low, high, (QUERIES, 2))}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(track_names):
+    registry = get_track_registry()
+    track_names = track_names or sorted(registry.names)
+    rng = np.random.default_rng(0)
+    build = 0.0
+    print(f"{'track':32} {'segments':>8} {'queries':>7} {'index':>8} {'scan':>8}")
+    for name in track_names:
+        geometry = registry.get(name).geometry
+        index, seconds = timed(
+            lambda: SegmentGrid(
+                geometry.center,
+                geometry.center_cumulative_length,
+                float(geometry.widths.max()),
+            )
+        )
+        build += seconds
+        for label, xy in queries(geometry, rng).items():
+            (closest, _, _), indexed = timed(lambda: index.nearest(xy))
+            scanned, scan = timed(lambda: index.scan(xy))
+            assert np.array_equal(closest[:, 0], scanned), name
+            print(
+                f"{name:32} {len(geometry.center) - 1:8} {label:>7}"
+                f" {indexed:7.3f}s {scan:7.3f}s"
+            )
+    print(f"index build for {len(track_names)} tracks: {build * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,368 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark get_validation_response over the corpus of corpus.py on a
+selection of tracks, and write the results to a JSON file.
+
+Reports, in milliseconds, percentiles of the latency of cold starts (the
+init phase and first validation of a fresh interpreter), of warm
+validations (each run of a source is a new source to the cache) and of
+cached ones, the mean duration of each stage, per corpus entry and over
+all of them, and the peak RSS of the benchmark and of a cold start.
+
+--compare flags the metrics that regressed against a baseline results
+file, after running or on the results given with --results, and exits
+with status 1 if any did.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/bench_suite.py [--output results.json]
+python benchmarks/bench_suite.py --compare baseline.json [--results results.json]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import logging
+import math
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+LIB_DIR = os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+sys.path.append(LIB_DIR)
+from corpus import FAIL, PASS, TIMEOUT, build_corpus
+from test_reward_function import TIMED_OUT_MESSAGE
+from validator import get_validation_response, warm_up
+
+RESULTS_VERSION = 1
+TRACK_NAMES = ["reInvent2019_track_ccw", "Oval_track", "2022_summit_speedway_ccw"]
+STAGES = ("lint", "static", "import", "runtime", "latency", "fuzz", "total")
+# Regressions smaller than these are noise, whatever their ratio
+MIN_REGRESSION_MS = 2.0
+MIN_REGRESSION_MB = 10.0
+
+# Runs in the fresh interpreter; prints the phase timings as JSON
+COLD_START = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.append({lib_dir!r})
+from validator import get_validation_response, initialize
+initialize()
+init = time.perf_counter()
+get_validation_response({source!r}, {track_name!r})
+first = time.perf_counter()
+print(json.dumps({{
+    "init": init - start,
+    "first": first - init,
+    "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}}))
+"""
+
+
+def percentiles(samples):
+    """Summary of samples in milliseconds, by the nearest rank method."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(q):
+        return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)], 3)
+
+    return {
+        "n": len(ordered),
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": rank(0.5),
+        "p90": rank(0.9),
+        "p99": rank(0.99),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _mean_stages(timings):
+    return {
+        stage: round(statistics.fmean(t.get(stage, 0.0) for t in timings), 3)
+        for stage in STAGES
+        if any(stage in t for t in timings)
+    }
+
+
+def _outcome(errors):
+    if not errors:
+        return PASS
+    return TIMEOUT if errors[0].get("message") == TIMED_OUT_MESSAGE else FAIL
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cold_starts(runs, source, track_name):
+    """Init and first validation times of runs fresh interpreters, in ms,
+    and the peak RSS of one in MB.
+    """
+    script = COLD_START.format(
+        lib_dir=os.path.abspath(LIB_DIR), source=source, track_name=track_name
+    )
+    init, first, rss = [], [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        init.append(result["init"] * 1000)
+        first.append(result["first"] * 1000)
+        rss.append(result["rss"] / 1024)
+    return {
+        "init_ms": percentiles(init),
+        "first_ms": percentiles(first),
+        "peak_rss_mb": round(max(rss), 1),
+    }
+
+
+def run_suite(corpus, track_names, runs, cold_runs):
+    """Return the results of validating every entry of corpus runs times
+    on each track.
+    """
+
+    def validate(source, track_name):
+        metrics = {}
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            errors = get_validation_response(source, track_name, metrics)
+        return (time.perf_counter() - start) * 1000, errors, metrics
+
+    results = {
+        "version": RESULTS_VERSION,
+        "environment": {
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "pool_workers": os.environ.get("VALIDATION_POOL_WORKERS"),
+        },
+        "tracks": track_names,
+        "runs": runs,
+    }
+    if cold_runs:
+        results["cold"] = cold_starts(cold_runs, corpus[0].source, track_names[0])
+
+    warm_up(track_names)
+    validate(corpus[0].source, track_names[0])
+    print(f"{'entry':<45} {'p50 ms':>9} {'p90 ms':>9}  outcome", file=sys.stderr)
+    warm, cached, timings, entries = [], [], [], {}
+    for entry in corpus:
+        samples, entry_timings, outcomes = [], [], set()
+        for track_name in track_names:
+            for _ in range(runs):
+                # Another statement per run, so no result comes from the cache
+                source = (
+                    entry.source.rstrip("\n")
+                    + f"\n\n\nRUN = {time.perf_counter_ns()}\n"
+                )
+                ms, errors, metrics = validate(source, track_name)
+                samples.append(ms)
+                entry_timings.append(metrics.get("timings", {}))
+                outcomes.add(_outcome(errors))
+            # The same source again, now from the cache
+            cached.append(validate(source, track_name)[0])
+        warm.extend(samples)
+        timings.extend(entry_timings)
+        entries[entry.name] = result = {
+            "category": entry.category,
+            "bytes": len(entry.source.encode("utf-8")),
+            "expected": entry.expected,
+            "outcome": "/".join(sorted(outcomes)),
+            "ms": percentiles(samples),
+            "stages": _mean_stages(entry_timings),
+        }
+        print(
+            f"{entry.name:<45} {result['ms']['p50']:9.1f} {result['ms']['p90']:9.1f}"
+            f"  {result['outcome']}",
+            file=sys.stderr,
+        )
+
+    results["warm"] = percentiles(warm)
+    results["cached"] = percentiles(cached)
+    results["stages"] = _mean_stages(timings)
+    results["peak_rss_mb"] = round(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+    )
+    results["entries"] = entries
+    return results
+
+
+def compare(baseline, current, threshold):
+    """Return a description of every metric of current that is more than
+    threshold (a ratio) over baseline, and of every outcome that changed.
+    """
+    regressions = []
+
+    def check(label, old, new, floor, unit):
+        if old is None or new is None:
+            return
+        if new > old * (1 + threshold) and new - old > floor:
+            ratio = f"+{(new / old - 1) * 100:.0f}%" if old else "new"
+            regressions.append(f"{label}: {old:.1f} -> {new:.1f} {unit} ({ratio})")
+
+    def check_percentiles(label, old, new):
+        for key in ("p50", "p90", "p99"):
+            check(f"{label} {key}", old.get(key), new.get(key), MIN_REGRESSION_MS, "ms")
+
+    for key in ("init_ms", "first_ms"):
+        check_percentiles(
+            f"cold {key[:-3]}",
+            baseline.get("cold", {}).get(key, {}),
+            current.get("cold", {}).get(key, {}),
+        )
+    check_percentiles("warm", baseline.get("warm", {}), current.get("warm", {}))
+    check_percentiles("cached", baseline.get("cached", {}), current.get("cached", {}))
+    for stage, ms in current.get("stages", {}).items():
+        old = baseline.get("stages", {}).get(stage)
+        check(f"stage {stage}", old, ms, MIN_REGRESSION_MS, "ms")
+    check(
+        "peak RSS",
+        baseline.get("peak_rss_mb"),
+        current.get("peak_rss_mb"),
+        MIN_REGRESSION_MB,
+        "MB",
+    )
+    check(
+        "cold peak RSS",
+        baseline.get("cold", {}).get("peak_rss_mb"),
+        current.get("cold", {}).get("peak_rss_mb"),
+        MIN_REGRESSION_MB,
+        "MB",
+    )
+    for name, entry in current.get("entries", {}).items():
+        old = baseline.get("entries", {}).get(name)
+        if old is None:
+            continue
+        if entry["outcome"] != old["outcome"]:
+            regressions.append(
+                f"{name}: outcome {old['outcome']} -> {entry['outcome']}"
+            )
+        for key in ("p50", "p90"):
+            check(
+                f"{name} {key}",
+                old["ms"].get(key),
+                entry["ms"].get(key),
+                MIN_REGRESSION_MS,
+                "ms",
+            )
+    return regressions
+
+
+def _environment_differences(baseline, current):
+    old, new = baseline.get("environment", {}), current.get("environment", {})
+    return [
+        f"{key}: {old.get(key)} -> {new.get(key)}"
+        for key in ("python", "cpus", "pool_workers")
+        if old.get(key) != new.get(key)
+    ]
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n\n")[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE")
+    parser.add_argument(
+        "--results", help="compare these results rather than running the suite"
+    )
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--tracks", default=",".join(TRACK_NAMES))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--cold-runs", type=int, default=3)
+    parser.add_argument(
+        "--categories",
+        default="fixture,sample,large,pathological",
+        help="comma separated corpus categories to run",
+    )
+    parser.add_argument(
+        "--timeouts",
+        action="store_true",
+        help="also run the entries that time out, which take the whole "
+        "request budget",
+    )
+    parser.add_argument(
+        "--pool",
+        action="store_true",
+        help="run the runtime checks in the worker pool, as in Lambda",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = _parse_args(argv)
+    if args.results:
+        with open(args.results) as f:
+            results = json.load(f)
+    else:
+        if not args.pool:
+            # Every stage runs in this process, so it shows in the stage
+            # timings and the peak RSS
+            os.environ["VALIDATION_POOL_WORKERS"] = "0"
+        # Logged as in Lambda, but to a file rather than the terminal
+        logging.getLogger().handlers = [logging.FileHandler(os.devnull)]
+        categories = args.categories.split(",")
+        corpus = [
+            entry
+            for entry in build_corpus()
+            if entry.category in categories
+            and (args.timeouts or entry.expected != TIMEOUT)
+        ]
+        results = run_suite(corpus, args.tracks.split(","), args.runs, args.cold_runs)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+        unexpected = [
+            name
+            for name, entry in results["entries"].items()
+            if entry["outcome"] != entry["expected"]
+        ]
+        if unexpected:
+            print(f"Unexpected outcomes: {', '.join(unexpected)}", file=sys.stderr)
+
+    print(
+        json.dumps(
+            {key: results.get(key) for key in ("cold", "warm", "cached", "stages")},
+            indent=2,
+        )
+    )
+    print(f"peak RSS: {results.get('peak_rss_mb')} MB")
+    if not args.compare:
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    for difference in _environment_differences(baseline, results):
+        print(f"Environment differs from the baseline, {difference}")
+    regressions = compare(baseline, results, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regressions over {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,225 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Reward functions the benchmarks validate: the UI fixtures, the AWS sample
+functions, and generated large and pathological ones. Each entry states
+the outcome a validation should have.
+"""
+
+import collections
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "tests"))
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import reward_function_fixtures
+from constants import REWARD_FUNCTION_MAX_BYTES
+
+PASS = "pass"
+FAIL = "fail"
+TIMEOUT = "timeout"
+
+# category is one of "fixture", "sample", "large" and "pathological"
+Entry = collections.namedtuple("Entry", "name category source expected")
+
+# AWS sample functions, which the validator was first tested against. The
+# first imports every allowlisted module without using it.
+FOLLOW_CENTER_LINE = (
+    "import random\nimport math\nimport numpy as np\nimport shapely\n"
+    + reward_function_fixtures.BASIC_REWARD_FUNCTION
+)
+STAY_INSIDE_BORDERS = """def reward_function(params):
+    '''
+    Example of rewarding the agent to stay inside the two borders of the track
+    '''
+
+    # Read input parameters
+    all_wheels_on_track = params['all_wheels_on_track']
+    distance_from_center = params['distance_from_center']
+    track_width = params['track_width']
+
+    # Give a very low reward by default
+    reward = 1e-3
+
+    # Give a high reward if no wheels go off the track and
+    # the agent is somewhere in between the track borders
+    if all_wheels_on_track and (0.5*track_width - distance_from_center) >= 0.05:
+        reward = 1.0
+
+    # Always return a float value
+    return float(reward)"""
+PREVENT_ZIG_ZAG = """def reward_function(params):
+    '''
+    Example of penalize steering, which helps mitigate zig-zag behaviors
+    '''
+
+    # Read input parameters
+    distance_from_center = params['distance_from_center']
+    track_width = params['track_width']
+    abs_steering = abs(params['steering_angle']) # Only need the absolute steering angle
+
+    # Calculate 3 marks that are farther and father away from the center line
+    marker_1 = 0.1 * track_width
+    marker_2 = 0.25 * track_width
+    marker_3 = 0.5 * track_width
+
+    # Give higher reward if the car is closer to center line and vice versa
+    if distance_from_center <= marker_1:
+        reward = 1.0
+    elif distance_from_center <= marker_2:
+        reward = 0.5
+    elif distance_from_center <= marker_3:
+        reward = 0.1
+    else:
+        reward = 1e-3  # likely crashed/ close to off track
+
+    # Steering penality threshold, change the number based on your action space setting
+    ABS_STEERING_THRESHOLD = 15
+
+    # Penalize reward if the car is steering too much
+    if abs_steering > ABS_STEERING_THRESHOLD:
+        reward *= 0.8
+    return float(reward)"""
+
+HEADER = """import math
+
+
+def reward_function(params):
+    reward = 1e-3
+    if params["all_wheels_on_track"]:
+        reward = 1.0
+    return float(reward)
+"""
+HELPER = '''
+
+def helper_{i}(params):
+    """Scale the speed by a constant."""
+    speed = params["speed"] * {i}
+    return math.sqrt(abs(speed)) + {i}
+'''
+
+HEAVY_IMPORT = """import numpy as np
+from scipy.spatial import distance
+from shapely.geometry import Point, Polygon
+
+
+def reward_function(params):
+    waypoints = np.array(params['waypoints'])
+    car = (params['x'], params['y'])
+    closest = waypoints[params['closest_waypoints'][1]]
+    reward = 1.0 / (1.0 + distance.euclidean(car, closest))
+    border = Polygon(waypoints[:8]).buffer(params['track_width'])
+    if not border.contains(Point(car)):
+        reward *= 0.5
+    return float(reward)
+"""
+SLOW_CALLS = """import math
+
+
+def reward_function(params):
+    total = 0.0
+    for i in range(2000):
+        total += math.sqrt(i)
+    return 1.0 if params['all_wheels_on_track'] else 1e-3
+"""
+RUNAWAY = """def reward_function(params):
+    while True:
+        pass
+"""
+SYNTAX_ERROR = """def reward_function(params):
+    return float(params['speed']
+"""
+ILLEGAL_IMPORT = """import os
+
+
+def reward_function(params):
+    return float(len(os.sep))
+"""
+OUT_OF_RANGE = """def reward_function(params):
+    if params['progress'] > 99:
+        return 1e9
+    return 1.0
+"""
+
+
+def source_of_size(size):
+    """A reward function passing every check, of at least size characters."""
+    parts = [HEADER]
+    length = len(HEADER)
+    while length < size:
+        helper = HELPER.format(i=len(parts))
+        parts.append(helper)
+        length += len(helper)
+    return "".join(parts)
+
+
+def _lint_errors(count):
+    # One unused variable per line
+    lines = [f"    x{i}=1" for i in range(count)]
+    return "def reward_function(params):\n" + "\n".join(lines) + "\n    return 1.0\n"
+
+
+def _long_expression(terms):
+    # A left-leaning chain of terms deep in the AST, deeper than pyflakes
+    # can recurse, which the lint stage reports
+    expression = " + ".join(f"params['speed'] * {i}" for i in range(terms))
+    return f"def reward_function(params):\n    return float(min(1.0, {expression}))\n"
+
+
+def _nested_branches(depth):
+    lines = ["def reward_function(params):", "    reward = 1.0"]
+    for i in range(depth):
+        indent = "    " * (i + 1)
+        lines.append(f"{indent}if params['speed'] > {i / depth:.3f}:")
+        lines.append(f"{indent}    reward *= 0.99")
+    lines.append("    return float(reward)")
+    return "\n".join(lines) + "\n"
+
+
+def build_corpus():
+    """Return every Entry, in a stable order."""
+    entries = [
+        Entry(name.lower(), "fixture", getattr(reward_function_fixtures, name), PASS)
+        for name in (
+            "BASIC_REWARD_FUNCTION",
+            "ADVANCED_REWARD_FUNCTION_PENALIZING_STEERING",
+            "ADVANCED_REWARD_FUNCTION_PENALIZING_SPEED",
+            "OBJECT_AVOIDANCE_REWARD_FUNCTION",
+        )
+    ]
+    entries += [
+        Entry("follow_center_line", "sample", FOLLOW_CENTER_LINE, FAIL),
+        Entry("stay_inside_borders", "sample", STAY_INSIDE_BORDERS, PASS),
+        Entry("prevent_zig_zag", "sample", PREVENT_ZIG_ZAG, PASS),
+    ]
+    entries += [
+        Entry("large_16kb", "large", source_of_size(16 * 1024), PASS),
+        Entry("large_64kb", "large", source_of_size(64 * 1024), PASS),
+        Entry(
+            "large_near_limit",
+            "large",
+            source_of_size(REWARD_FUNCTION_MAX_BYTES - 1024),
+            PASS,
+        ),
+        Entry(
+            "large_over_limit",
+            "large",
+            source_of_size(REWARD_FUNCTION_MAX_BYTES + 1024),
+            FAIL,
+        ),
+    ]
+    entries += [
+        Entry("heavy_import", "pathological", HEAVY_IMPORT, PASS),
+        Entry("slow_calls", "pathological", SLOW_CALLS, PASS),
+        Entry("lint_errors", "pathological", _lint_errors(500), FAIL),
+        Entry("long_expression", "pathological", _long_expression(500), FAIL),
+        Entry("nested_branches", "pathological", _nested_branches(19), PASS),
+        Entry("syntax_error", "pathological", SYNTAX_ERROR, FAIL),
+        Entry("illegal_import", "pathological", ILLEGAL_IMPORT, FAIL),
+        Entry("out_of_range", "pathological", OUT_OF_RANGE, FAIL),
+        Entry("runaway", "pathological", RUNAWAY, TIMEOUT),
+    ]
+    return entries
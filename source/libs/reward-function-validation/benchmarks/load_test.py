@@ -0,0 +1,443 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Load test the validator with a mix of passing, lint failing, heavy import
+and timing out submissions from the corpus of corpus.py, and check that
+each response is the one its submission should get.
+
+Drives lambda_handler in this process, or the HTTP service of server.py
+with --url, either with --concurrency clients sending back to back or at
+--rate submissions per second. Latencies of --rate are measured from when
+each submission was due, so they include any time spent waiting for a
+free client. Reports the throughput, latency percentiles and histograms
+and the rates of unexpected responses and errors, and exits with status 1
+if there were any.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/load_test.py [--concurrency 8 | --rate 20] [--duration 30]
+python benchmarks/load_test.py --url http://127.0.0.1:8080/validate
+"""
+
+import argparse
+import bisect
+import contextlib
+import http.client
+import json
+import logging
+import math
+import os
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+from corpus import PASS, build_corpus
+from test_reward_function import TIMED_OUT_MESSAGE
+
+TRACK_NAMES = ["reInvent2019_track_ccw", "Oval_track", "Bowtie_track"]
+DEFAULT_MIX = "pass=80,lint=15,heavy=4,timeout=1"
+# Upper bounds of the latency histogram buckets, in milliseconds
+BUCKETS_MS = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 60000)
+HTTP_TIMEOUT_SEC = 120
+LINT_CODE = re.compile(r"^[EFW]\d+$")
+
+# Outcomes of a submission
+OK = "ok"
+UNEXPECTED = "unexpected"
+REJECTED = "rejected"
+ERROR = "error"
+
+
+def _expect_pass(errors):
+    return errors == []
+
+
+def _expect_lint(errors):
+    return bool(errors) and bool(LINT_CODE.match(str(errors[0].get("type", ""))))
+
+
+def _expect_timeout(errors):
+    return bool(errors) and errors[0].get("message") == TIMED_OUT_MESSAGE
+
+
+# Kinds of submission: the corpus entries they draw from, and whether a
+# list of errors is the response they should get
+KINDS = {
+    "pass": (
+        lambda e: e.category in ("fixture", "sample") and e.expected == PASS,
+        _expect_pass,
+    ),
+    "lint": (lambda e: e.name in ("follow_center_line", "lint_errors"), _expect_lint),
+    "heavy": (lambda e: e.name == "heavy_import", _expect_pass),
+    "timeout": (lambda e: e.name == "runaway", _expect_timeout),
+}
+
+
+class Submissions:
+    """Random submissions following mix, a {kind: weight} dict.
+
+    Each source gets another statement unless repeat is set, so that no
+    response comes from the result cache.
+    """
+
+    def __init__(self, mix, track_names, seed=None, repeat=False):
+        corpus = build_corpus()
+        self.kinds = list(mix)
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.entries = {
+            kind: [e for e in corpus if KINDS[kind][0](e)] for kind in self.kinds
+        }
+        self.track_names = track_names
+        self.repeat = repeat
+        self._random = random.Random(seed)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            kind = self._random.choices(self.kinds, self.weights)[0]
+            entry = self._random.choice(self.entries[kind])
+            track_name = self._random.choice(self.track_names)
+            self._count += 1
+            count = self._count
+        source = entry.source
+        if not self.repeat:
+            source = source.rstrip("\n") + f"\n\n\nLOAD_TEST = {count}\n"
+        return kind, {"reward_function": source, "track_name": track_name}
+
+
+def parse_mix(spec):
+    """Parse "kind=weight,..." into a {kind: weight} dict."""
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in KINDS:
+            raise ValueError(f"Unknown kind {kind!r}, expected one of {list(KINDS)}")
+        mix[kind] = float(weight or 1)
+    return {kind: weight for kind, weight in mix.items() if weight > 0}
+
+
+def in_process_sender():
+    from lambda_function import lambda_handler
+
+    def send(event):
+        response = lambda_handler(event, None)
+        return response["statusCode"], json.loads(response["body"])
+
+    return send
+
+
+def http_sender(url):
+    """Return a sender POSTing to url, over one connection per thread."""
+    parsed = urllib.parse.urlsplit(url)
+    path = parsed.path or "/validate"
+    local = threading.local()
+
+    def connection():
+        if getattr(local, "connection", None) is None:
+            local.connection = http.client.HTTPConnection(
+                parsed.hostname, parsed.port or 80, timeout=HTTP_TIMEOUT_SEC
+            )
+        return local.connection
+
+    def send(event):
+        body = json.dumps(event).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        try:
+            conn = connection()
+            conn.request("POST", path, body, headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            # Typically a kept alive connection the server closed since the
+            # last request. Sent again once, on a fresh connection.
+            local.connection.close()
+            local.connection = None
+            conn = connection()
+            conn.request("POST", path, body, headers)
+            response = conn.getresponse()
+            data = response.read()
+        if response.getheader("Connection", "").lower() == "close":
+            conn.close()
+            local.connection = None
+        if response.status != 200:
+            return response.status, None
+        return response.status, json.loads(data)
+
+    return send
+
+
+class Recorder:
+    """Outcome and latency of every submission."""
+
+    def __init__(self):
+        self.results = []
+        self._lock = threading.Lock()
+
+    def record(self, kind, outcome, ms, detail=None):
+        with self._lock:
+            self.results.append((kind, outcome, ms, detail))
+
+
+def submit(send, check, kind, event, due, recorder):
+    try:
+        status, errors = send(event)
+    except Exception as e:
+        recorder.record(kind, ERROR, (time.perf_counter() - due) * 1000, repr(e))
+        return
+    ms = (time.perf_counter() - due) * 1000
+    if status == 503:
+        recorder.record(kind, REJECTED, ms)
+    elif status != 200:
+        recorder.record(kind, ERROR, ms, f"HTTP {status}")
+    elif check(errors):
+        recorder.record(kind, OK, ms)
+    else:
+        recorder.record(kind, UNEXPECTED, ms, json.dumps(errors)[:200])
+
+
+def run_concurrency(send, submissions, concurrency, duration, count):
+    """Run concurrency clients sending back to back, for duration seconds
+    or until count submissions were sent.
+    """
+    recorder = Recorder()
+    end = time.perf_counter() + duration
+    remaining = [count]
+    lock = threading.Lock()
+
+    def client():
+        while time.perf_counter() < end:
+            with lock:
+                if remaining[0] is not None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+            kind, event = submissions.next()
+            due = time.perf_counter()
+            submit(send, KINDS[kind][1], kind, event, due, recorder)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder
+
+
+def run_rate(send, submissions, rate, duration, count, max_in_flight):
+    """Send rate submissions per second, spaced evenly, for duration seconds
+    or until count submissions were sent, with up to max_in_flight at a time.
+    """
+    recorder = Recorder()
+    total = math.ceil(rate * duration)
+    if count is not None:
+        total = min(total, count)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for i in range(total):
+            due = start + i / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            kind, event = submissions.next()
+            executor.submit(submit, send, KINDS[kind][1], kind, event, due, recorder)
+    return recorder
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    def rank(q):
+        return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)], 1)
+
+    return {
+        "mean": round(statistics.fmean(ordered), 1),
+        "p50": rank(0.5),
+        "p90": rank(0.9),
+        "p99": rank(0.99),
+        "max": round(ordered[-1], 1),
+    }
+
+
+def histogram(samples):
+    """Counts of samples per bucket of BUCKETS_MS, and over the last one."""
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for ms in samples:
+        counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+    return counts
+
+
+def summarize(recorder, elapsed):
+    results = recorder.results
+    total = len(results)
+    summary = {
+        "submissions": total,
+        "seconds": round(elapsed, 3),
+        "throughput": round(total / elapsed, 2) if elapsed else 0.0,
+        "outcomes": {},
+        "kinds": {},
+    }
+    for outcome in (OK, UNEXPECTED, REJECTED, ERROR):
+        n = sum(1 for r in results if r[1] == outcome)
+        summary["outcomes"][outcome] = {
+            "count": n,
+            "rate": round(n / total, 4) if total else 0.0,
+        }
+    for kind in sorted({r[0] for r in results}):
+        of_kind = [r for r in results if r[0] == kind]
+        latencies = [r[2] for r in of_kind if r[1] in (OK, UNEXPECTED)]
+        summary["kinds"][kind] = {
+            "count": len(of_kind),
+            "outcomes": {
+                outcome: sum(1 for r in of_kind if r[1] == outcome)
+                for outcome in (OK, UNEXPECTED, REJECTED, ERROR)
+            },
+            "ms": percentiles(latencies),
+            "histogram": histogram(latencies),
+        }
+    answered = [r[2] for r in results if r[1] in (OK, UNEXPECTED)]
+    summary["ms"] = percentiles(answered)
+    summary["histogram"] = histogram(answered)
+    summary["buckets_ms"] = list(BUCKETS_MS)
+    summary["failures"] = [
+        {"kind": r[0], "outcome": r[1], "detail": r[3]}
+        for r in results
+        if r[1] in (UNEXPECTED, ERROR)
+    ][:20]
+    return summary
+
+
+def print_report(summary):
+    outcomes = summary["outcomes"]
+    print(
+        f"{summary['submissions']} submissions in {summary['seconds']:.1f} s: "
+        f"{summary['throughput']:.1f}/s"
+    )
+    print(
+        "  ".join(
+            f"{outcome} {o['count']} ({o['rate']:.1%})"
+            for outcome, o in outcomes.items()
+        )
+    )
+    print(
+        f"\n{'kind':<10}{'count':>7}{'ok':>7}{'unexp':>7}{'rej':>7}{'err':>7}"
+        f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    )
+    rows = list(summary["kinds"].items()) + [
+        ("all", {"count": summary["submissions"], "outcomes": {}, "ms": summary["ms"]})
+    ]
+    for kind, k in rows:
+        counts = k["outcomes"] or {o: v["count"] for o, v in outcomes.items()}
+        ms = k["ms"]
+        print(
+            f"{kind:<10}{k['count']:>7}"
+            + "".join(f"{counts[o]:>7}" for o in (OK, UNEXPECTED, REJECTED, ERROR))
+            + "".join(f"{ms.get(p, 0.0):>10.1f}" for p in ("p50", "p90", "p99", "max"))
+        )
+    answered = sum(summary["histogram"])
+    if answered:
+        print("\nlatency histogram")
+        labels = [f"<= {b} ms" for b in BUCKETS_MS] + [f" > {BUCKETS_MS[-1]} ms"]
+        peak = max(summary["histogram"])
+        for label, n in zip(labels, summary["histogram"]):
+            if n:
+                bar = "#" * max(1, round(40 * n / peak))
+                print(f"{label:>12} {n:>7} {n / answered:6.1%} {bar}")
+    for failure in summary["failures"]:
+        print(f"{failure['outcome'].upper()} {failure['kind']}: {failure['detail']}")
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n\n")[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=4)
+    load.add_argument("--rate", type=float, help="submissions per second")
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--requests", type=int, help="stop after this many")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument(
+        "--tracks",
+        default=",".join(TRACK_NAMES),
+        help='comma separated track names, or "*" for every track',
+    )
+    parser.add_argument("--url", help="POST to this URL rather than in-process")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--repeat",
+        action="store_true",
+        help="send the corpus sources as they are, so repeats hit the cache",
+    )
+    parser.add_argument("--output", help="also write the report as JSON here")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = _parse_args(argv)
+    if args.tracks == "*":
+        from tracks import get_track_registry
+
+        track_names = sorted(get_track_registry().names)
+    else:
+        track_names = args.tracks.split(",")
+    submissions = Submissions(parse_mix(args.mix), track_names, args.seed, args.repeat)
+
+    if args.url:
+        send = http_sender(args.url)
+    else:
+        from validator import initialize
+
+        # As the Lambda init phase does, ahead of the first request. The
+        # validations log as in Lambda, but to files rather than the terminal.
+        logging.getLogger().handlers = [logging.FileHandler(os.devnull)]
+        initialize()
+        send = in_process_sender()
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(
+        sys.stdout if args.url else devnull
+    ):
+        if args.rate:
+            recorder = run_rate(
+                send,
+                submissions,
+                args.rate,
+                args.duration,
+                args.requests,
+                args.max_in_flight,
+            )
+        else:
+            recorder = run_concurrency(
+                send, submissions, args.concurrency, args.duration, args.requests
+            )
+    summary = summarize(recorder, time.perf_counter() - start)
+    summary["target"] = args.url or "lambda_handler"
+    summary["load"] = (
+        {"rate": args.rate} if args.rate else {"concurrency": args.concurrency}
+    )
+    summary["mix"] = parse_mix(args.mix)
+    print_report(summary)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+    failed = (
+        summary["outcomes"][UNEXPECTED]["count"] + summary["outcomes"][ERROR]["count"]
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,53 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Soak the validator with runaway reward functions mixed into regular
+traffic, and print the throughput of the regular requests between each
+runaway one. With enforced timeouts the throughput stays flat; without,
+every runaway function left spinning lowers it further.
+
+Run from the reward-function-validation directory so the routes resolve:
+python benchmarks/soak_runaway.py [rounds] [requests per round]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "tests"))
+from pool import get_worker_pool
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from test_reward_function import _run_runtime_request, run_suites
+
+TRACK_NAME = "reInvent2019_track_ccw"
+RUNAWAY_REWARD_FUNCTION = """def reward_function(params):
+    while params['is_offtrack']:
+        pass
+    return 1.0
+"""
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    per_round = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    pool = get_worker_pool(_run_runtime_request)
+    for round_number in range(rounds):
+        start = time.perf_counter()
+        for i in range(per_round):
+            # A unique comment so no result comes from the cache
+            run_suites(f"{BASIC_REWARD_FUNCTION}# {round_number} {i}\n", TRACK_NAME)
+        elapsed = time.perf_counter() - start
+        print(
+            f"round {round_number}: {per_round / elapsed:8.1f} requests/s, "
+            f"workers replaced: {pool.replaced if pool else 'n/a'}"
+        )
+        result = run_suites(f"{RUNAWAY_REWARD_FUNCTION}# {round_number}\n", TRACK_NAME)
+        print(f"  runaway: {result[0]['message']}")
+
+
+if __name__ == "__main__":
+    main()
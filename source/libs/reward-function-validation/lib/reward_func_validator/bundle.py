@@ -0,0 +1,143 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Pack the routes/*.npy waypoint arrays into a single track bundle.
+
+Run from the reward-function-validation directory:
+python lib/reward_func_validator/bundle.py routes <bundle_path>
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+# Layout: header, JSON name index, then one float64 waypoint block per
+# track. The checksum is the SHA-256 of everything after the header.
+MAGIC = b"RFVTRACK"
+VERSION = 1
+_HEADER = struct.Struct("<8sII32s")
+# Blocks start on cache line boundaries, so views are aligned float64
+_ALIGNMENT = 64
+_DTYPE = np.dtype("<f8")
+
+
+class TrackBundleError(Exception):
+    pass
+
+
+def _aligned(offset):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_bundle(routes_dir, path):
+    """Write the .npy tracks of routes_dir to a bundle at path.
+
+    Returns the bundle index. The file is replaced atomically, so a running
+    process never maps a partially written bundle.
+    """
+    names = sorted(
+        f[: -len(".npy")] for f in os.listdir(routes_dir) if f.endswith(".npy")
+    )
+    blocks = {}
+    for name in names:
+        waypoints = np.load(os.path.join(routes_dir, f"{name}.npy"))
+        if waypoints.ndim != 2:
+            raise TrackBundleError(
+                f"{name}: expected a 2-d array, got {waypoints.shape}"
+            )
+        blocks[name] = np.ascontiguousarray(waypoints, dtype=_DTYPE)
+
+    # Offsets are relative to the start of the data, which follows the
+    # index, so the index can be serialized before its size is known
+    index = {}
+    size = 0
+    for name, waypoints in blocks.items():
+        index[name] = {"offset": size, "shape": list(waypoints.shape)}
+        size = _aligned(size + waypoints.nbytes)
+    index_bytes = json.dumps(index, sort_keys=True).encode()
+    data_start = _aligned(_HEADER.size + len(index_bytes))
+
+    body = bytearray(data_start - _HEADER.size + size)
+    body[: len(index_bytes)] = index_bytes
+    base = data_start - _HEADER.size
+    for name, waypoints in blocks.items():
+        start = base + index[name]["offset"]
+        body[start : start + waypoints.nbytes] = waypoints.tobytes()
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(index_bytes), hashlib.sha256(body).digest()
+    )
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(temporary, path)
+    return index
+
+
+class TrackBundle:
+    """Read-only memory map of a track bundle.
+
+    The file is mapped once and verified against its checksum; waypoints()
+    then returns read-only views into the map, without copying or reading
+    the file again. Forked workers share the mapped pages.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise TrackBundleError(f"{path}: empty file") from e
+        if len(self._map) < _HEADER.size:
+            raise TrackBundleError(f"{path}: truncated header")
+        magic, version, index_size, checksum = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise TrackBundleError(f"{path}: not a version {VERSION} track bundle")
+        body = memoryview(self._map)[_HEADER.size :]
+        try:
+            if hashlib.sha256(body).digest() != checksum:
+                raise TrackBundleError(f"{path}: checksum mismatch")
+            index = json.loads(bytes(body[:index_size]))
+        finally:
+            body.release()
+        self._data_start = _aligned(_HEADER.size + index_size)
+        self.checksum = checksum.hex()
+        self.metadata = index
+        self.names = frozenset(index)
+
+    def __contains__(self, name):
+        return name in self.metadata
+
+    def waypoints(self, name):
+        """Return a read-only view of the waypoints of name."""
+        entry = self.metadata[name]
+        shape = tuple(entry["shape"])
+        return np.frombuffer(
+            self._map,
+            dtype=_DTYPE,
+            count=shape[0] * shape[1],
+            offset=self._data_start + entry["offset"],
+        ).reshape(shape)
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(__doc__.strip())
+        return 2
+    routes_dir, path = argv
+    write_bundle(routes_dir, path)
+    bundle = TrackBundle(path)
+    print(f"{path}: {len(bundle.names)} tracks, {os.path.getsize(path)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
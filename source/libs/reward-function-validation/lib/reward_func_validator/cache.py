@@ -0,0 +1,203 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+from collections import OrderedDict
+
+import flake8
+from constants import (
+    ALLOWLIST_IMPORTS,
+    CACHE_DISK_MAX_ENTRIES,
+    CACHE_MAX_ENTRIES,
+    CACHE_PATH_ENV,
+    CACHE_VERSION,
+    FLAKE8_ARGS,
+    FORBID_ACCESS,
+    FORBID_STRINGS,
+    FUZZ_BUDGET_SEC,
+    FUZZ_CHUNK_SIZE,
+    FUZZ_SAMPLES,
+    FUZZ_SEED,
+    LATENCY_BUDGET_SEC,
+    LATENCY_CALLS,
+    LATENCY_FAIL_MS,
+    LATENCY_WARMUP_CALLS,
+    LATENCY_WARN_MS,
+    TIMEOUT_SEC,
+)
+from parallel import fork_safe_lock
+from tracks import get_track_registry
+
+logger = logging.getLogger()
+
+
+def source_digest(source):
+    """sha256 hex digest of a reward function source."""
+    return hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _namespace(tracks_digest):
+    # Results are only valid for the rules, limits, tool versions and tracks
+    # that produced them, so those are part of every key. This matters for
+    # the disk tier, which can outlive a deployment.
+    config = json.dumps(
+        [
+            CACHE_VERSION,
+            FLAKE8_ARGS,
+            ALLOWLIST_IMPORTS,
+            FORBID_ACCESS,
+            FORBID_STRINGS,
+            TIMEOUT_SEC,
+            [FUZZ_SEED, FUZZ_SAMPLES, FUZZ_CHUNK_SIZE, FUZZ_BUDGET_SEC],
+            [
+                LATENCY_CALLS,
+                LATENCY_WARMUP_CALLS,
+                LATENCY_BUDGET_SEC,
+                LATENCY_WARN_MS,
+                LATENCY_FAIL_MS,
+            ],
+            tracks_digest,
+            flake8.__version__,
+            list(sys.version_info[:2]),
+        ],
+        sort_keys=True,
+    )
+    return hashlib.sha256(config.encode()).hexdigest()[:16]
+
+
+class LRUCache:
+    """Bounded in-memory tier, evicting the least recently used entry."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = fork_safe_lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """On-disk tier shared by every process using the same database file."""
+
+    # Pruning is checked once every PRUNE_INTERVAL writes
+    PRUNE_INTERVAL = 256
+
+    def __init__(self, path, max_entries=CACHE_DISK_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = fork_safe_lock()
+        self._conn = sqlite3.connect(path, timeout=1, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created INTEGER NOT NULL DEFAULT (strftime('%s', 'now')))"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_INTERVAL == 0:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results "
+                    "ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+
+class ValidationCache:
+    """Stage results cached in memory and, optionally, on disk.
+
+    Values are stored as JSON text, so every get() returns a fresh copy that
+    callers are free to modify. Disk errors are logged and treated as misses
+    so a broken disk tier never fails a validation.
+    """
+
+    def __init__(self, memory=None, disk=None):
+        self.memory = memory if memory is not None else LRUCache()
+        self.disk = disk
+        self.namespace = _namespace(get_track_registry().digest)
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def get(self, key):
+        key = self._key(key)
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.error(f"Validation cache read failed: {str(e)}")
+            if value is not None:
+                self.memory.put(key, value)
+        return None if value is None else json.loads(value)
+
+    def put(self, key, results):
+        key = self._key(key)
+        value = json.dumps(results)
+        self.memory.put(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, value)
+            except sqlite3.Error as e:
+                logger.error(f"Validation cache write failed: {str(e)}")
+
+
+_cache = None
+_cache_lock = fork_safe_lock()
+
+
+def get_validation_cache():
+    """Return the process-wide ValidationCache, building it on first use.
+
+    The disk tier is enabled by setting the VALIDATION_CACHE_PATH environment
+    variable to an SQLite database path, e.g. under /tmp on Lambda.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                disk = None
+                path = os.environ.get(CACHE_PATH_ENV)
+                if path:
+                    try:
+                        disk = SQLiteCache(path)
+                    except sqlite3.Error as e:
+                        logger.error(f"Validation cache disabled on disk: {str(e)}")
+                _cache = ValidationCache(disk=disk)
+    return _cache
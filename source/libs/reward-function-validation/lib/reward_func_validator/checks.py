@@ -0,0 +1,154 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import time
+import traceback
+
+from constants import CHECK_COST_SMOOTHING, INLINE_CHECK_MS
+from parallel import fork_safe_lock
+
+FAILURE_TYPE = "TEST_FAILURE"
+
+
+class DeepRacerError(Exception):
+    def __init__(self, **kwargs):
+        self._dict = kwargs
+
+    def __str__(self):
+        return json.dumps(self._dict)
+
+    @property
+    def error(self):
+        """The structured error, as reported in the response."""
+        return self._dict
+
+
+class CheckCancelled(DeepRacerError):
+    """Raised by a check stopped because its result is no longer needed."""
+
+    def __init__(self):
+        super().__init__(message="Cancelled", type=FAILURE_TYPE)
+
+
+class CheckResult:
+    """Outcome of one check: its name, how long it took and, if it failed,
+    the structured error to report.
+    """
+
+    __slots__ = ("name", "error", "seconds")
+
+    def __init__(self, name, error=None, seconds=0.0):
+        self.name = name
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    def __repr__(self):
+        return f"CheckResult({self.name!r}, {self.error!r}, {self.seconds!r})"
+
+
+class CheckCosts:
+    """Typical duration of each check in milliseconds, an exponential moving
+    average of its measured durations in this process.
+    """
+
+    def __init__(self, smoothing=CHECK_COST_SMOOTHING):
+        self.smoothing = smoothing
+        self._ms = {}
+        self._lock = fork_safe_lock()
+
+    def observe(self, name, ms):
+        with self._lock:
+            typical = self._ms.get(name)
+            if typical is None:
+                self._ms[name] = ms
+            else:
+                self._ms[name] = typical + self.smoothing * (ms - typical)
+
+    def get(self, name, default=0.0):
+        return self._ms.get(name, default)
+
+
+_costs = CheckCosts()
+
+
+def get_check_costs():
+    """Return the process-wide CheckCosts, which run_check() feeds."""
+    return _costs
+
+
+def calls_reward_function(check):
+    """Mark check as calling the reward function, which may not return."""
+    check.calls_reward_function = True
+    return check
+
+
+def plan_checks(checks, costs=None, inline_ms=INLINE_CHECK_MS):
+    """Split checks, in the order their failures are reported, into the
+    ones to run inline first and the ones to run concurrently after them.
+
+    The inline checks are the leading checks that do not call the reward
+    function and are typically cheaper than inline_ms. They come first in
+    the reporting order, so when one fails its error is the one reported
+    and the others need not start.
+    """
+    if costs is None:
+        costs = get_check_costs()
+    inline = 0
+    for check in checks:
+        if getattr(check, "calls_reward_function", False):
+            break
+        if costs.get(check.__name__) > inline_ms:
+            break
+        inline += 1
+    return checks[:inline], checks[inline:]
+
+
+def unexpected_error(exc):
+    """Structured error of an exception that is not a DeepRacerError.
+
+    The message is the last line of the formatted exception, such as
+    "SystemExit: 3", as the validator has always reported them.
+    """
+    line = "".join(traceback.format_exception_only(type(exc), exc)).splitlines()[-1]
+    return {"message": line, "type": FAILURE_TYPE}
+
+
+def run_check(check, context):
+    """Run check(context) and return its CheckResult.
+
+    The duration is recorded in context.timings under the name of the check,
+    and feeds its typical cost.
+    """
+    start = time.perf_counter()
+    try:
+        check(context)
+        error = None
+    except DeepRacerError as e:
+        error = e.error
+    except KeyboardInterrupt:
+        raise
+    except BaseException as e:
+        # Includes SystemExit, e.g. from a reward function calling exit()
+        error = unexpected_error(e)
+    seconds = time.perf_counter() - start
+    context.timings.record(check.__name__, seconds)
+    _costs.observe(check.__name__, seconds * 1000)
+    return CheckResult(check.__name__, error, seconds)
+
+
+def run_checks(checks, context):
+    """Run checks in order, stopping at the first failure.
+
+    Returns the list of errors: empty if every check passed, otherwise the
+    error of the check that failed.
+    """
+    for check in checks:
+        result = run_check(check, context)
+        if result.failed:
+            return [result.error]
+    return []
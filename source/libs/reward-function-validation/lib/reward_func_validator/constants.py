@@ -1,8 +1,14 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-REWARD_FUNCTION_PATH = "/tmp/reward_function.py" # NOSONAR
-TRACK_NAME_PATH = "/tmp/track_name" # NOSONAR
+import os
+
+# Relative to the working directory; used where there is no track bundle
+ROUTES_DIR = "routes"
+# Built from ROUTES_DIR into the Lambda task root by the image, see bundle.py
+TRACK_BUNDLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracks.bundle")
+# track_name value that selects every known track
+ALL_TRACKS = "*"
 
 ALLOWLIST_IMPORTS = ["math", "random", "numpy", "scipy", "shapely"]
 # compile and exec are not set to 0 because
@@ -23,3 +29,109 @@ FORBID_STRINGS = {
 }
 
 TIMEOUT_SEC = 5
+
+# Reward functions over REWARD_FUNCTION_MAX_BYTES, UTF-8 encoded, are
+# rejected before any check runs. Lint takes about 10 ms per KB, so much
+# larger sources could not pass within LINT_TIMEOUT_SEC anyway.
+REWARD_FUNCTION_MAX_BYTES = 128 * 1024
+# Logs carry at most LOG_EXCERPT_CHARS characters of a reward function, its
+# head and tail, and at most LOG_MAX_ITEMS items of a bulk event
+LOG_EXCERPT_CHARS = 2000
+LOG_MAX_ITEMS = 10
+
+# End-to-end budget of one validation, shared by lint, static and runtime
+# checks. It stays under the 29 second API Gateway integration timeout.
+REQUEST_BUDGET_SEC = 20
+# Each runtime scenario may take SCENARIO_BUDGET_FACTOR times as long as
+# the first reward function call, but at least SCENARIO_MIN_BUDGET_SEC and
+# at most TIMEOUT_SEC.
+SCENARIO_BUDGET_FACTOR = 20
+SCENARIO_MIN_BUDGET_SEC = 0.5
+# Time a worker gets past the budget to report its own timeout before it is
+# killed
+DEADLINE_GRACE_SEC = 0.5
+
+# Checks that do not call the reward function and typically take less than
+# INLINE_CHECK_MS run ahead of the scenario threads, which then only start
+# if they pass. Typical durations are moving averages of the measured ones,
+# weighted by CHECK_COST_SMOOTHING.
+INLINE_CHECK_MS = 1
+CHECK_COST_SMOOTHING = 0.1
+
+# Randomized params the runtime checks call the reward function with once
+# the fixed scenarios pass: up to FUZZ_SAMPLES per track, generated
+# FUZZ_CHUNK_SIZE at a time from FUZZ_SEED, within FUZZ_BUDGET_SEC.
+FUZZ_SEED = 2019
+FUZZ_SAMPLES = 2000
+FUZZ_CHUNK_SIZE = 250
+FUZZ_BUDGET_SEC = 2
+
+# Per call latency of the reward function, which training pays on every
+# simulation step (15 per second). LATENCY_CALLS calls are timed after
+# LATENCY_WARMUP_CALLS untimed ones, within LATENCY_BUDGET_SEC. A 99th
+# percentile over LATENCY_WARN_MS is reported as a warning, a median over
+# LATENCY_FAIL_MS fails the validation.
+LATENCY_CALLS = 300
+LATENCY_WARMUP_CALLS = 20
+LATENCY_BUDGET_SEC = 1
+LATENCY_WARN_MS = 10
+LATENCY_FAIL_MS = 50
+
+# Synthetic laps of the replay harness: the car drives at REPLAY_SPEED m/s
+# along the center line shifted by each of REPLAY_OFFSETS, in half track
+# widths towards the outer border.
+REPLAY_SPEED = 1.0
+REPLAY_OFFSETS = (0.0, -0.5, 0.5)
+
+# Bulk validation of many reward functions in one request. A bulk item that
+# has not finished after BULK_ITEM_TIMEOUT_SEC has its worker killed. In
+# Lambda, the items still running or queued BULK_RESPONSE_MARGIN_SEC before
+# the function times out time out, leaving time to send the results.
+BULK_MAX_WORKERS = None  # defaults to the number of CPUs
+BULK_ITEM_TIMEOUT_SEC = 30
+BULK_RESPONSE_MARGIN_SEC = 2
+
+# Pre-forked worker processes that run the runtime checks. The pool size is
+# read from POOL_WORKERS_ENV, defaulting to the number of CPUs; 0 runs the
+# checks in the validator process instead. Workers are replaced after
+# POOL_MAX_REQUESTS requests or once their RSS exceeds POOL_MAX_RSS_MB.
+POOL_WORKERS_ENV = "VALIDATION_POOL_WORKERS"
+POOL_MAX_REQUESTS = 500
+POOL_MAX_RSS_MB = 512
+
+# Long-running HTTP service (server.py), for deployments outside of Lambda.
+# SERVER_WORKERS_ENV requests are validated at a time, defaulting to the
+# number of CPUs, and up to SERVER_QUEUE_ENV more (default
+# SERVER_QUEUE_SIZE) wait for a worker; past that, requests get a 503. On
+# SIGTERM the service stops accepting connections and waits up to
+# SERVER_DRAIN_TIMEOUT_SEC for the requests it has accepted.
+SERVER_PORT = 8080
+SERVER_WORKERS_ENV = "VALIDATION_SERVER_WORKERS"
+SERVER_QUEUE_ENV = "VALIDATION_SERVER_QUEUE"
+SERVER_QUEUE_SIZE = 64
+SERVER_MAX_BODY_BYTES = 16 * 1024 * 1024
+SERVER_IDLE_TIMEOUT_SEC = 60
+SERVER_DRAIN_TIMEOUT_SEC = 30
+
+# Lambda init phase. The modules in ALLOWLIST_IMPORTS are imported ahead of
+# the first request unless PRELOAD_MODULES_ENV is set to 0, and every track
+# is loaded unless PRELOAD_TRACKS_ENV is set to 0, trading memory and init
+# time for the first request that needs them.
+PRELOAD_MODULES_ENV = "VALIDATION_PRELOAD_MODULES"
+PRELOAD_TRACKS_ENV = "VALIDATION_PRELOAD_TRACKS"
+
+# CloudWatch namespace of the per stage timings logged by every validation
+METRICS_NAMESPACE = "DeepRacerOnAWS/RewardFunctionValidation"
+
+# Same options the validator used to pass to the flake8 CLI
+FLAKE8_ARGS = [
+    "--select=E,F",
+    "--ignore=E5,E226,E261",  # ignore stylistic errors
+]
+LINT_TIMEOUT_SEC = 2
+
+# Validation result cache. Bump CACHE_VERSION when a change alters results.
+CACHE_VERSION = 2
+CACHE_MAX_ENTRIES = 4096
+CACHE_DISK_MAX_ENTRIES = 100000
+CACHE_PATH_ENV = "VALIDATION_CACHE_PATH"
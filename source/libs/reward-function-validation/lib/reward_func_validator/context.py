@@ -0,0 +1,83 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+import functools
+import threading
+
+from cache import source_digest
+from deadline import Deadline
+from loader import load_reward_function, source_filename, unload_reward_function
+from static_analysis import StaticAnalysis
+from timings import IMPORT_TIMING, Timings
+from tracks import get_track_registry
+
+
+class ValidationContext:
+    """Per-request state shared by every check of one validation.
+
+    The reward function is compiled and executed once, on first access to
+    module, and the resulting function is shared by all runtime checks.
+    All checks share one Deadline and record their duration in timings.
+    Call close() when the validation is done.
+    """
+
+    def __init__(self, reward_function, track_name=None, budget=None):
+        self.source = reward_function
+        self.track_name = track_name
+        self.analysis = StaticAnalysis(reward_function)
+        self.filename = source_filename()
+        self.deadline = Deadline(budget)
+        # Duration of the first reward function call, see scenario_budget()
+        self.first_call_sec = None
+        # Summary of the per call latency, see run_latency_checks()
+        self.latency = None
+        # Checks that ran out of budget before their last call, whose
+        # results are not cached
+        self.cut_short = []
+        # Set once the outcome of the scenario checks is known, so the
+        # checks still running skip their reward function call
+        self.cancelled = threading.Event()
+        self.timings = Timings()
+        # Shared with the contexts returned by for_track()
+        self._loaded = {}
+
+    def for_track(self, track_name):
+        """Return a context for track_name sharing this context's source state.
+
+        The static analysis and the loaded module are shared, so checking
+        one source against many tracks parses and executes it only once.
+        Only the context the views were made from needs to be closed.
+        """
+        context = copy.copy(self)
+        context.track_name = track_name
+        context.latency = None
+        context.cut_short = []
+        context.cancelled = threading.Event()
+        context.timings = Timings()
+        context.__dict__.pop("track", None)
+        return context
+
+    @functools.cached_property
+    def digest(self):
+        return source_digest(self.source)
+
+    @functools.cached_property
+    def track(self):
+        return get_track_registry().get(self.track_name)
+
+    @property
+    def module(self):
+        if "module" not in self._loaded:
+            with self.timings.stage(IMPORT_TIMING):
+                self._loaded["module"] = load_reward_function(
+                    self.source, self.filename
+                )
+        return self._loaded["module"]
+
+    @property
+    def reward_function(self):
+        return self.module.reward_function
+
+    def close(self):
+        unload_reward_function(self.filename)
@@ -0,0 +1,51 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+
+from constants import (
+    REQUEST_BUDGET_SEC,
+    SCENARIO_BUDGET_FACTOR,
+    SCENARIO_MIN_BUDGET_SEC,
+    TIMEOUT_SEC,
+)
+
+LINT_STAGE = "lint"
+STATIC_STAGE = "static"
+RUNTIME_STAGE = "runtime"
+
+
+class Deadline:
+    """End-to-end time budget of one validation, shared by all its stages.
+
+    Each stage gets whatever time the earlier stages left. expires is a
+    time.monotonic() value, which is the same clock in forked workers.
+    """
+
+    def __init__(self, budget=None):
+        if budget is None:
+            budget = REQUEST_BUDGET_SEC
+        self.budget = budget
+        self.expires = time.monotonic() + budget
+
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self):
+        return time.monotonic() >= self.expires
+
+
+def scenario_budget(first_call_sec):
+    """Time allowed per runtime scenario, given the duration of the first
+    reward function call.
+
+    Each scenario test calls the reward function once, with params of the
+    same shape, so a fixed multiple of the first call leaves room for
+    slower branches, while a function that needs far longer than that is
+    treated as runaway. The budget is never below SCENARIO_MIN_BUDGET_SEC,
+    so timer noise cannot fail a fast function, nor above TIMEOUT_SEC.
+    """
+    return min(
+        TIMEOUT_SEC,
+        max(SCENARIO_MIN_BUDGET_SEC, SCENARIO_BUDGET_FACTOR * first_call_sec),
+    )
@@ -0,0 +1,237 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+
+import numpy as np
+from constants import FUZZ_CHUNK_SIZE, FUZZ_SAMPLES, FUZZ_SEED
+
+# Largest number of objects (bots or boxes) on the track in a sample
+MAX_OBJECTS = 6
+# Cars further than this from the center line, beyond the half track
+# width, have all wheels off the track
+CAR_HALF_WIDTH = 0.1
+# Objects closer than this to the car have crashed into it
+CRASH_DISTANCE = 0.3
+# Objects ahead closer than this along the track are in the camera view
+CAMERA_RANGE = 3.0
+# DeepRacer runs at 15 steps per second
+STEPS_PER_SEC = 15
+MIN_SPEED, MAX_SPEED = 0.5, 4.0
+MAX_STEERING = 30.0
+MAX_OBJECT_SPEED = 1.0
+MAX_HEADING_ERROR = 45.0
+# Lateral offsets reach this multiple of the half track width, so some
+# samples are off the track
+MAX_OFFSET = 1.5
+
+
+def _wrap_degrees(angle):
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+def _positions(points, cumulative, segments, fractions):
+    start = points[segments]
+    direction = points[segments + 1] - start
+    xy = start + direction * fractions[:, None]
+    arc = cumulative[segments] + np.hypot(direction[:, 0], direction[:, 1]) * fractions
+    return xy, direction, arc
+
+
+def _trim(array, counts):
+    # Per sample lists of the used object columns
+    return [row[:count] for row, count in zip(array.tolist(), counts)]
+
+
+def _copy(value):
+    return [_copy(item) for item in value] if isinstance(value, list) else value
+
+
+def _inputs(params):
+    # What the check is called with, without the waypoints, copied so that
+    # the check cannot change it. The generated values are all lists and
+    # scalars, so the copy serializes to JSON.
+    return {k: _copy(v) for k, v in params.items() if k != "waypoints"}
+
+
+def generate_params(track, count, rng):
+    """Return count random, physically consistent params dicts for track.
+
+    Cars are placed anywhere on the lap, including off the track, driving
+    either way round with a heading close to that of the track. Each car is
+    then located on the center line with the track index, so
+    distance_from_center, the track flags, progress, steps,
+    closest_waypoints and the object fields agree with its position like
+    they do in training.
+    """
+    geometry = track.geometry
+    points = geometry.center
+    cumulative = geometry.center_cumulative_length
+    length = geometry.center_length
+    segment_count = len(points) - 1
+
+    segments = rng.integers(0, segment_count, count)
+    xy, direction, _ = _positions(points, cumulative, segments, rng.random(count))
+    offsets = rng.uniform(-MAX_OFFSET, MAX_OFFSET, count) * geometry.widths[segments]
+    xy += geometry.normals[segments] * (offsets / 2)[:, None]
+    closest, arc, lateral = track.index.nearest(xy)
+    half_width = geometry.widths[closest[:, 0]] / 2
+    distance = np.abs(lateral)
+    reversed_ = rng.random(count) < 0.5
+    driving = np.where(reversed_[:, None], -direction, direction)
+    # lateral is positive left of the direction of the track
+    left = np.where(reversed_, lateral < 0, lateral > 0)
+    heading = np.degrees(np.arctan2(driving[:, 1], driving[:, 0]))
+    heading = _wrap_degrees(
+        heading + rng.uniform(-MAX_HEADING_ERROR, MAX_HEADING_ERROR, count)
+    )
+    driven = np.where(reversed_, length - arc, arc)
+    progress = np.clip(driven / length * 100, 0, 100)
+    speed = rng.uniform(MIN_SPEED, MAX_SPEED, count)
+    steps = 1 + np.floor(driven / speed * STEPS_PER_SEC)
+    steering = rng.uniform(-MAX_STEERING, MAX_STEERING, count)
+    on_track = distance <= half_width + CAR_HALF_WIDTH
+    all_wheels_on_track = distance <= half_width - CAR_HALF_WIDTH
+    closest_waypoints = np.where(reversed_[:, None], closest[:, ::-1], closest)
+
+    # Objects sit in a lane, (count, MAX_OBJECTS), unused columns masked
+    object_counts = rng.integers(1, MAX_OBJECTS + 1, count)
+    used = np.arange(MAX_OBJECTS) < object_counts[:, None]
+    shape = (count, MAX_OBJECTS)
+    object_segments = rng.integers(0, segment_count, shape)
+    object_xy, object_direction, object_arc = _positions(
+        points, cumulative, object_segments.ravel(), rng.random(count * MAX_OBJECTS)
+    )
+    object_left = rng.random(shape) < 0.5
+    lane = np.where(object_left, 1.0, -1.0) * geometry.widths[object_segments] / 4
+    # Positive lane offsets point left of the direction of the track
+    normal = np.stack([-object_direction[:, 1], object_direction[:, 0]], axis=1)
+    normal /= np.maximum(np.hypot(normal[:, 0], normal[:, 1]), 1e-12)[:, None]
+    object_xy = (object_xy + normal * lane.ravel()[:, None]).reshape(shape + (2,))
+    object_arc = object_arc.reshape(shape)
+    object_direction = object_direction.reshape(shape + (2,))
+    object_heading = np.degrees(
+        np.arctan2(object_direction[..., 1], object_direction[..., 0])
+    )
+    object_speed = rng.uniform(0, MAX_OBJECT_SPEED, shape)
+    gap = np.where(
+        reversed_[:, None], arc[:, None] - object_arc, object_arc - arc[:, None]
+    )
+    gap_ahead = np.where(used, gap % length, np.inf)
+    gap_behind = np.where(used, -gap % length, np.inf)
+    object_in_camera = gap_ahead.min(axis=1) < CAMERA_RANGE
+    closest_objects = np.stack(
+        [gap_behind.argmin(axis=1), gap_ahead.argmin(axis=1)], axis=1
+    )
+    separation = np.hypot(*np.moveaxis(object_xy - xy[:, None, :], -1, 0))
+    crashed = np.any(used & (separation < CRASH_DISTANCE), axis=1) & on_track
+
+    counts = object_counts.tolist()
+    columns = {
+        "all_wheels_on_track": all_wheels_on_track.tolist(),
+        "x": xy[:, 0].tolist(),
+        "y": xy[:, 1].tolist(),
+        "distance_from_center": distance.tolist(),
+        "heading": heading.tolist(),
+        "progress": progress.tolist(),
+        "steps": steps.astype(int).tolist(),
+        "speed": speed.tolist(),
+        "steering_angle": steering.tolist(),
+        "track_width": (half_width * 2).tolist(),
+        "closest_waypoints": closest_waypoints.tolist(),
+        "is_left_of_center": left.tolist(),
+        "is_reversed": reversed_.tolist(),
+        "closest_objects": closest_objects.tolist(),
+        "objects_location": _trim(object_xy, counts),
+        "objects_left_of_center": _trim(object_left, counts),
+        "object_in_camera": object_in_camera.tolist(),
+        "objects_speed": _trim(object_speed, counts),
+        "objects_heading": _trim(object_heading, counts),
+        "objects_distance": _trim(object_arc, counts),
+        "is_crashed": crashed.tolist(),
+        "is_offtrack": (~on_track).tolist(),
+    }
+    # waypoints[:, 2:4] like the baseline params, a writable copy per sample
+    # like track.params() returns
+    waypoints = track.scenarios["valid_params"]["waypoints"]
+    params = []
+    for values in zip(*columns.values()):
+        sample = dict(zip(columns, values))
+        sample.update(waypoints=waypoints.copy(), track_length=geometry.length)
+        params.append(sample)
+    return params
+
+
+class FuzzReport:
+    """Outcome of fuzzing a reward function on one track."""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.samples = 0
+        self.rewards = []
+        # The inputs being checked, without the waypoints; after a failure,
+        # the failing ones
+        self.params = None
+        self.error = None
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    def failing_params(self):
+        """The params of the failure as generated, without the waypoints."""
+        return self.params
+
+    def summary(self):
+        """Sample count and distribution of the rewards returned."""
+        summary = {"seed": self.seed, "samples": self.samples}
+        rewards = np.array(self.rewards, dtype=float)
+        if len(rewards):
+            p5, p50, p95 = np.percentile(rewards, [5, 50, 95])
+            summary.update(
+                min=float(rewards.min()),
+                p5=float(p5),
+                median=float(p50),
+                mean=float(rewards.mean()),
+                p95=float(p95),
+                max=float(rewards.max()),
+            )
+        return summary
+
+
+def fuzz(
+    check,
+    track,
+    budget,
+    seed=FUZZ_SEED,
+    samples=FUZZ_SAMPLES,
+    chunk_size=FUZZ_CHUNK_SIZE,
+    report=None,
+):
+    """Call check(params) on up to samples generated params for track.
+
+    check returns the reward or raises for a failing sample. Params are
+    generated chunk_size at a time from seed, so a run is repeatable, and
+    fuzzing stops at the first failure or once budget seconds have passed.
+    The params of a failure are reported as generated, whatever check did
+    to them.
+    Pass report to watch progress from another thread.
+    """
+    if report is None:
+        report = FuzzReport(seed)
+    rng = np.random.default_rng(seed)
+    until = time.monotonic() + budget
+    while report.samples < samples and time.monotonic() < until:
+        chunk = generate_params(track, min(chunk_size, samples - report.samples), rng)
+        for params in chunk:
+            if time.monotonic() >= until:
+                break
+            report.params = _inputs(params)
+            try:
+                report.rewards.append(check(params))
+            except Exception as e:
+                report.error = e
+                return report
+            report.samples += 1
+    report.params = None
+    return report
@@ -0,0 +1,109 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+
+# Column layout of the routes/*.npy waypoint arrays
+CENTER = slice(0, 2)
+INNER = slice(2, 4)
+OUTER = slice(4, 6)
+
+
+def _columns(array):
+    # Contiguous rows, one per column; strided column views of the (n, 6)
+    # waypoint array are several times slower to operate on.
+    return np.ascontiguousarray(np.asarray(array, dtype=float).T)
+
+
+def _norm(dx, dy):
+    # dx * dx + dy * dy rather than hypot so results match the scalar
+    # math.sqrt loop get_params used to run
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def _accumulate(lengths):
+    # np.cumsum adds sequentially, so the total equals a running-sum loop
+    total = np.empty(len(lengths) + 1)
+    total[0] = 0.0
+    np.cumsum(lengths, out=total[1:])
+    return total
+
+
+def _segment_lengths(x, y):
+    return _norm(np.diff(x), np.diff(y))
+
+
+def _headings(x, y):
+    dx = np.empty_like(x)
+    dy = np.empty_like(y)
+    np.subtract(x[1:], x[:-1], out=dx[:-1])
+    np.subtract(y[1:], y[:-1], out=dy[:-1])
+    dx[-1] = dx[-2]
+    dy[-1] = dy[-2]
+    return np.degrees(np.arctan2(dy, dx))
+
+
+def _outward_normals(center_x, center_y, outer_x, outer_y):
+    dx = outer_x - center_x
+    dy = outer_y - center_y
+    dist = _norm(dx, dy)
+    normals = np.empty((len(dx), 2))
+    np.divide(dx, dist, out=normals[:, 0])
+    np.divide(dy, dist, out=normals[:, 1])
+    return normals
+
+
+def segment_lengths(points):
+    """Length of each segment between consecutive (x, y) points, shape (n - 1,)."""
+    return _segment_lengths(*_columns(points))
+
+
+def cumulative_length(points):
+    """Arc length from the first point to each point, shape (n,)."""
+    return _accumulate(segment_lengths(points))
+
+
+def track_widths(waypoints):
+    """Distance between the inner and outer border at each waypoint."""
+    _, _, inner_x, inner_y, outer_x, outer_y = _columns(waypoints)
+    return _norm(outer_x - inner_x, outer_y - inner_y)
+
+
+def headings(points):
+    """Heading in degrees of the segment leaving each point.
+
+    The last point reuses the heading of the segment arriving at it.
+    """
+    return _headings(*_columns(points))
+
+
+def outward_normals(waypoints):
+    """Unit vectors pointing from the center line towards the outer border."""
+    center_x, center_y, _, _, outer_x, outer_y = _columns(waypoints)
+    return _outward_normals(center_x, center_y, outer_x, outer_y)
+
+
+class TrackGeometry:
+    """Per-waypoint geometry for a whole track, computed with array operations.
+
+    Lengths and headings follow the same column pair get_params has always
+    used for track_length (waypoints[:, 2:4]). center and its arc lengths
+    are those of the center line (waypoints[:, 0:2]), which cars are
+    placed from.
+    """
+
+    def __init__(self, waypoints):
+        center_x, center_y, x, y, outer_x, outer_y = _columns(waypoints)
+        self.waypoints = waypoints
+        self.center = waypoints[:, CENTER]
+        self.center_cumulative_length = _accumulate(
+            _segment_lengths(center_x, center_y)
+        )
+        self.center_length = float(self.center_cumulative_length[-1])
+        self.points = waypoints[:, INNER]
+        self.segment_lengths = _segment_lengths(x, y)
+        self.cumulative_length = _accumulate(self.segment_lengths)
+        self.length = float(self.cumulative_length[-1])
+        self.widths = _norm(outer_x - x, outer_y - y)
+        self.headings = _headings(x, y)
+        self.normals = _outward_normals(center_x, center_y, outer_x, outer_y)
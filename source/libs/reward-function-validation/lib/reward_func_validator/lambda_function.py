@@ -3,19 +3,47 @@
 
 import json
 import logging
+import os
+
+from constants import BULK_RESPONSE_MARGIN_SEC
+from log_format import event_summary
+from validator import get_validation_response, get_validation_responses, initialize
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# The Lambda runtime imports this module in its init phase, ahead of the
+# first request and outside of its timeout, so that is where the validator
+# loads. Elsewhere, such as in the tests, importing it has no side effects.
+if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+    initialize()
 
-def lambda_handler(event, _context):
-    from validator import get_validation_response
 
-    logger.info("Event: " + json.dumps(event))
+def lambda_handler(event, context):
+    logger.info("Event: " + json.dumps(event_summary(event)))
+    # {"items": [{"reward_function": ..., "track_name": ...}, ...]} validates
+    # many reward functions at once and returns a list of results in order.
+    metrics = {}
+    if "items" in event:
+        body = get_validation_responses(event["items"], budget=_bulk_budget(context))
+    else:
+        body = get_validation_response(
+            event["reward_function"], event["track_name"], metrics
+        )
     response = {
         "statusCode": 200,
-        "body": json.dumps(
-            get_validation_response(event["reward_function"], event["track_name"])
-        ),
+        "body": json.dumps(body),
     }
+    # Next to the body, which callers parse as the list of errors
+    if metrics:
+        response["metrics"] = metrics
     return response
+
+
+def _bulk_budget(context):
+    # What the Lambda timeout leaves for the items. Without a Lambda context,
+    # such as in the HTTP service, each item only has its own timeout.
+    if context is None:
+        return None
+    remaining = context.get_remaining_time_in_millis() / 1000
+    return max(0.0, remaining - BULK_RESPONSE_MARGIN_SEC)
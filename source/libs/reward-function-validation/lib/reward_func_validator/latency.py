@@ -0,0 +1,101 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+
+import numpy as np
+from constants import (
+    LATENCY_CALLS,
+    LATENCY_FAIL_MS,
+    LATENCY_WARMUP_CALLS,
+    LATENCY_WARN_MS,
+)
+
+LATENCY_OK = "ok"
+LATENCY_WARN = "warn"
+LATENCY_FAIL = "fail"
+
+
+def _stats_ms(samples_ns):
+    p50, p99 = np.percentile(samples_ns, [50, 99]) / 1e6
+    return {
+        "p50": round(float(p50), 4),
+        "p99": round(float(p99), 4),
+        "max": round(float(np.max(samples_ns)) / 1e6, 4),
+    }
+
+
+class LatencyReport:
+    """Wall and CPU time of the measured reward function calls."""
+
+    def __init__(self):
+        self.wall_ns = []
+        self.cpu_ns = []
+
+    @property
+    def calls(self):
+        return len(self.wall_ns)
+
+    def status(self, warn_ms=LATENCY_WARN_MS, fail_ms=LATENCY_FAIL_MS):
+        """LATENCY_FAIL if the median call is over fail_ms, LATENCY_WARN if
+        the 99th percentile is over warn_ms, LATENCY_OK otherwise.
+
+        The median is what an O(n-waypoints) loop slows down, and unlike
+        the tail it does not fail a fast function for a GC pause or a busy
+        host.
+        """
+        if not self.calls:
+            return LATENCY_OK
+        wall = _stats_ms(self.wall_ns)
+        if wall["p50"] > fail_ms:
+            return LATENCY_FAIL
+        if wall["p99"] > warn_ms:
+            return LATENCY_WARN
+        return LATENCY_OK
+
+    def summary(self, warn_ms=LATENCY_WARN_MS, fail_ms=LATENCY_FAIL_MS):
+        summary = {"calls": self.calls}
+        if self.calls:
+            summary.update(
+                wall_ms=_stats_ms(self.wall_ns), cpu_ms=_stats_ms(self.cpu_ns)
+            )
+        summary.update(
+            warn_ms=warn_ms, fail_ms=fail_ms, status=self.status(warn_ms, fail_ms)
+        )
+        return summary
+
+
+def measure(
+    reward_function,
+    params,
+    budget,
+    calls=LATENCY_CALLS,
+    warmup=LATENCY_WARMUP_CALLS,
+    report=None,
+):
+    """Time calls of reward_function(params(i)) after warmup untimed calls.
+
+    params(i) returns the params of call i and runs outside the timed
+    region. Stops early once budget seconds have passed, and warming up
+    stops once half of them have, so that slow functions are timed too.
+    CPU time is that of the calling thread.
+    """
+    if report is None:
+        report = LatencyReport()
+    start = time.monotonic()
+    for i in range(warmup):
+        if time.monotonic() >= start + budget / 2:
+            break
+        reward_function(params(i))
+    for i in range(warmup, warmup + calls):
+        if time.monotonic() >= start + budget:
+            break
+        args = params(i)
+        wall = time.perf_counter_ns()
+        cpu = time.thread_time_ns()
+        reward_function(args)
+        cpu = time.thread_time_ns() - cpu
+        wall = time.perf_counter_ns() - wall
+        report.wall_ns.append(wall)
+        report.cpu_ns.append(cpu)
+    return report
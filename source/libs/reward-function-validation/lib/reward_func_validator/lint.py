@@ -0,0 +1,117 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import time
+
+from constants import FLAKE8_ARGS, LINT_TIMEOUT_SEC
+from flake8 import checker, processor
+from flake8.formatting.base import BaseFormatter
+from flake8.options.parse_args import parse_args
+from flake8.style_guide import StyleGuideManager
+from parallel import fork_safe_lock
+
+LINT_FILENAME = "reward_function.py"
+LINT_TIMEOUT_MESSAGE = "Linting did not finish"
+
+
+class LintTimeoutError(Exception):
+    pass
+
+
+class _CollectingFormatter(BaseFormatter):
+    """Keep reported violations in memory instead of writing them out."""
+
+    def after_init(self):
+        self.violations = []
+
+    def handle(self, error):
+        self.violations.append(error)
+
+    def format(self, error):
+        return None
+
+
+class _SourceFileChecker(checker.FileChecker):
+    """flake8 FileChecker that lints in-memory lines under a deadline.
+
+    The deadline is best-effort: it is checked before each plugin call,
+    and a call in progress is not interrupted. Lint can therefore run over
+    its timeout by the duration of one plugin pass over the source, which
+    REWARD_FUNCTION_MAX_BYTES bounds.
+    """
+
+    def __init__(self, *, lines, timeout, **kwargs):
+        self._lines = lines
+        self._timeout = timeout
+        self._deadline = time.monotonic() + timeout
+        super().__init__(**kwargs)
+
+    def _make_processor(self):
+        return processor.FileProcessor(self.filename, self.options, lines=self._lines)
+
+    def run_check(self, plugin, **arguments):
+        # Checked outside of the plugin call so flake8 does not wrap it in
+        # PluginExecutionFailed.
+        if time.monotonic() > self._deadline:
+            raise LintTimeoutError(
+                f"{LINT_TIMEOUT_MESSAGE} within {self._timeout:g} seconds"
+            )
+        return super().run_check(plugin, **arguments)
+
+
+class LintEngine:
+    """In-process flake8 run with the same options as the flake8 CLI call.
+
+    Option parsing and plugin discovery happen once, when the engine is
+    built. Each call to lint() only tokenizes and checks the given source.
+    """
+
+    def __init__(self, argv=FLAKE8_ARGS):
+        self.plugins, self.options = parse_args(list(argv))
+
+    def lint(self, source, timeout=LINT_TIMEOUT_SEC):
+        """Return flake8 violations for source as (code, row, text) tuples.
+
+        Raises LintTimeoutError if a plugin call is due once timeout seconds
+        have passed. The plugin call in progress at that time still finishes.
+        """
+        lines = io.StringIO(source, newline=None).readlines()
+        file_checker = _SourceFileChecker(
+            filename=LINT_FILENAME,
+            plugins=self.plugins.checkers,
+            options=self.options,
+            lines=lines,
+            timeout=timeout,
+        )
+        _, results, _ = file_checker.run_checks()
+
+        formatter = _CollectingFormatter(self.options)
+        style_guide = StyleGuideManager(self.options, formatter)
+        # Same ordering as flake8's Manager.report
+        results.sort(key=lambda r: (r[1], r[2]))
+        with style_guide.processing_file(LINT_FILENAME):
+            for code, line_number, column, text, physical_line in results:
+                style_guide.handle_error(
+                    code=code,
+                    filename=LINT_FILENAME,
+                    line_number=line_number,
+                    column_number=column,
+                    text=text,
+                    physical_line=physical_line,
+                )
+        return [(v.code, v.line_number, v.text) for v in formatter.violations]
+
+
+_engine = None
+_engine_lock = fork_safe_lock()
+
+
+def get_lint_engine():
+    """Return the process-wide LintEngine, building it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = LintEngine()
+    return _engine
@@ -0,0 +1,65 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import builtins
+import importlib
+import io
+import itertools
+import linecache
+import logging
+import os
+import types
+
+from constants import ALLOWLIST_IMPORTS, PRELOAD_MODULES_ENV
+
+REWARD_FUNCTION_FILENAME = "reward_function.py"
+
+logger = logging.getLogger()
+
+_load_ids = itertools.count()
+
+
+def source_filename():
+    """Return a unique filename, ending in reward_function.py, for one load."""
+    return f"<validation-{next(_load_ids)}>/{REWARD_FUNCTION_FILENAME}"
+
+
+def load_reward_function(source, filename):
+    """Compile and execute source in a fresh reward_function module.
+
+    The source lines are registered in linecache under filename so
+    tracebacks through the module report the offending line, exactly as
+    they did when the module was imported from disk. Call
+    unload_reward_function(filename) once the module is no longer needed.
+
+    The module gets a copy of the builtins, which checks may patch while
+    other validations run: the functions of the module look builtins up in
+    the copy, the rest of the process does not.
+    """
+    lines = io.StringIO(source, newline=None).readlines()
+    linecache.cache[filename] = (len(source), None, lines, filename)
+
+    module = types.ModuleType("reward_function")
+    module.__file__ = filename
+    module.__builtins__ = dict(builtins.__dict__)
+    code = compile(source, filename, "exec", dont_inherit=True)
+    exec(code, module.__dict__)
+    return module
+
+
+def unload_reward_function(filename):
+    linecache.cache.pop(filename, None)
+
+
+def preload_allowlisted_modules():
+    """Import the modules reward functions may import, ahead of any request.
+
+    Does nothing when PRELOAD_MODULES_ENV is set to 0.
+    """
+    if os.environ.get(PRELOAD_MODULES_ENV) == "0":
+        return
+    for module in ALLOWLIST_IMPORTS:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"Unable to preload {module}: {str(e)}")
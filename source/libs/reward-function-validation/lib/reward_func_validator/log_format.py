@@ -0,0 +1,40 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from constants import LOG_EXCERPT_CHARS, LOG_MAX_ITEMS
+
+
+def excerpt(text, limit=LOG_EXCERPT_CHARS):
+    """Return text, or only its head and tail if it is longer than limit."""
+    if len(text) <= limit:
+        return text
+    half = limit // 2
+    omitted = len(text) - 2 * half
+    return f"{text[:half]}\n[... {omitted} characters ...]\n{text[len(text) - half :]}"
+
+
+def source_summary(source, digest):
+    """Describe a reward function for the logs: its size, its digest, which
+    identifies it exactly, and an excerpt.
+    """
+    return f"({len(source)} characters, sha256 {digest}) {excerpt(source)}"
+
+
+def event_summary(event):
+    """Return a copy of a Lambda event to log, of bounded size.
+
+    Reward functions are replaced by their length, which the validation
+    logs along with an excerpt, and bulk events keep their first
+    LOG_MAX_ITEMS items.
+    """
+    if not isinstance(event, dict):
+        return event
+    summary = dict(event)
+    if isinstance(summary.get("reward_function"), str):
+        summary["reward_function"] = f"<{len(summary['reward_function'])} characters>"
+    items = summary.get("items")
+    if isinstance(items, list):
+        summary["items"] = [event_summary(item) for item in items[:LOG_MAX_ITEMS]]
+        if len(items) > LOG_MAX_ITEMS:
+            summary["items"].append(f"<{len(items) - LOG_MAX_ITEMS} more items>")
+    return summary
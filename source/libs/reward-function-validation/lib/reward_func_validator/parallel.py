@@ -0,0 +1,322 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import multiprocessing
+import os
+import resource
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import wait
+
+# Lambda has no /dev/shm, so multiprocessing.Pool and ProcessPoolExecutor
+# (which need semaphores) fail there. Plain forked processes talking over a
+# Pipe work, and fork shares the already imported modules and loaded
+# tracks with the workers.
+_mp = multiprocessing.get_context("fork")
+
+# Worker processes are forked from one thread, see start_process()
+_forker = None
+_forker_lock = threading.Lock()
+_fork_safe_locks = weakref.WeakSet()
+# The fork safe locks held by the forking thread while it forks
+_held_locks = []
+
+
+class WorkerFailure:
+    """Placeholder result for an item a worker did not return a value for."""
+
+    TIMEOUT = "timeout"
+    ERROR = "error"
+    EXITED = "exited"
+
+    def __init__(self, reason, message=""):
+        self.reason = reason
+        self.message = message
+
+    def __repr__(self):
+        return f"WorkerFailure({self.reason!r}, {self.message!r})"
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def has_stray_threads():
+    """Whether threads other than the main thread are still running.
+
+    Workers run one item at a time on their main thread, so any other live
+    thread after an item is left over from it, typically a reward function
+    that timed out and is still spinning.
+    """
+    return threading.active_count() > 1
+
+
+def fork_safe_lock():
+    """Return a threading.Lock that no other thread holds when a worker
+    process is forked.
+
+    A lock held by another thread at the fork stays locked in the worker,
+    where only that thread could have released it, so state that code in
+    workers locks must use these. Never start a process while holding one.
+    """
+    lock = threading.Lock()
+    _fork_safe_locks.add(lock)
+    return lock
+
+
+def _release_held_locks():
+    while _held_locks:
+        _held_locks.pop().release()
+
+
+def _fork(process):
+    # Runs on the forking thread, which holds no other lock. The fork safe
+    # locks are taken all at once or not at all, so however they are nested
+    # elsewhere this never waits for one while holding another.
+    while True:
+        for lock in list(_fork_safe_locks):
+            if not lock.acquire(blocking=False):
+                break
+            _held_locks.append(lock)
+        else:
+            break
+        _release_held_locks()
+        time.sleep(0.001)
+    try:
+        process.start()
+    finally:
+        _release_held_locks()
+
+
+def _after_fork_in_child():
+    global _forker, _forker_lock
+    _release_held_locks()
+    # The forking thread of the parent does not exist in this process
+    _forker = None
+    _forker_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def start_process(process):
+    """Start process, forking it from the one thread that forks workers.
+
+    Validations run on many threads, such as those of the HTTP service,
+    but only the calling thread is copied into a forked process. The
+    forking thread holds no lock of its own, and takes every fork safe
+    lock (see fork_safe_lock()) before it forks, so a worker never starts
+    with one locked.
+    """
+    global _forker
+    with _forker_lock:
+        if _forker is None:
+            _forker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fork")
+        forker = _forker
+    forker.submit(_fork, process).result()
+
+
+def rss_bytes():
+    """Resident set size of the current process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current RSS, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _serve(handler, conn):
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        try:
+            reply = (True, handler(message[0]))
+        except Exception as e:
+            reply = (False, f"{type(e).__name__}: {e}")
+        conn.send(reply + (rss_bytes(), has_stray_threads()))
+
+
+class Worker:
+    """A forked process serving handler(request) calls, one at a time.
+
+    Daemonic workers are terminated when this process exits, but cannot
+    fork processes of their own.
+    """
+
+    def __init__(self, handler, daemon=False):
+        self.conn, child_conn = _mp.Pipe()
+        self.process = _mp.Process(
+            target=_serve, args=(handler, child_conn), daemon=daemon
+        )
+        start_process(self.process)
+        child_conn.close()
+        self.requests = 0
+        self.rss = 0
+        self.index = None
+        self.deadline = None
+
+    def submit(self, index, request, timeout=None, deadline=None):
+        self.index = index
+        if timeout is not None:
+            timeout = time.monotonic() + timeout
+        self.deadline = min(
+            (t for t in (timeout, deadline) if t is not None), default=None
+        )
+        self.requests += 1
+        self.conn.send((request,))
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join()
+        self.conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def run_requests(requests, workers, timeout=None, deadline=None):
+    """Return the replies of workers to requests, in order.
+
+    workers hands out Worker objects: acquire(timeout) returns an idle
+    one, waiting up to timeout seconds (None waits for one), or None.
+    release(worker) takes back a worker that replied, and replace(worker)
+    kills one that did not, or that still has threads running after its
+    request, and makes another available.
+
+    A worker still busy with a request after timeout seconds is replaced.
+    Requests still running or queued at deadline, a time.monotonic()
+    value, time out as well. Requests without a reply come back as
+    WorkerFailure instead of raising, so one bad request never costs the
+    others their replies.
+    """
+    results = [None] * len(requests)
+    pending = deque(range(len(requests)))
+    busy = {}
+    try:
+        while pending or busy:
+            while pending:
+                if deadline is not None and time.monotonic() >= deadline:
+                    while pending:
+                        results[pending.popleft()] = WorkerFailure(
+                            WorkerFailure.TIMEOUT
+                        )
+                    break
+                wait_for = 0
+                if not busy:
+                    # No reply to wait for instead of an idle worker
+                    wait_for = None
+                    if deadline is not None:
+                        wait_for = max(0.0, deadline - time.monotonic())
+                worker = workers.acquire(wait_for)
+                if worker is None:
+                    break
+                index = pending.popleft()
+                try:
+                    worker.submit(index, requests[index], timeout, deadline)
+                except OSError:
+                    # The worker died while idle
+                    pending.appendleft(index)
+                    workers.replace(worker)
+                    continue
+                busy[worker.conn] = worker
+            if not busy:
+                continue
+            deadlines = [w.deadline for w in busy.values() if w.deadline is not None]
+            wait_for = None
+            if deadlines:
+                wait_for = max(0, min(deadlines) - time.monotonic())
+            for conn in wait(list(busy), timeout=wait_for):
+                worker = busy.pop(conn)
+                try:
+                    ok, value, worker.rss, stray_threads = conn.recv()
+                except EOFError:
+                    results[worker.index] = WorkerFailure(WorkerFailure.EXITED)
+                    workers.replace(worker)
+                    continue
+                results[worker.index] = (
+                    value if ok else WorkerFailure(WorkerFailure.ERROR, value)
+                )
+                if stray_threads:
+                    # A timed out reward function is still running in the
+                    # worker, and would slow down every later request.
+                    # Killing it is the only way to stop it.
+                    workers.replace(worker)
+                else:
+                    workers.release(worker)
+            now = time.monotonic()
+            for conn, worker in list(busy.items()):
+                if worker.deadline is not None and now >= worker.deadline:
+                    del busy[conn]
+                    results[worker.index] = WorkerFailure(WorkerFailure.TIMEOUT)
+                    workers.replace(worker)
+    finally:
+        # Only reached with busy workers if this thread was interrupted
+        for worker in busy.values():
+            workers.replace(worker)
+    return results
+
+
+class _ForkedWorkers:
+    # The workers of one map_in_processes call: up to size of them, forked
+    # as needed and not reused after it
+    def __init__(self, handler, size):
+        self.handler = handler
+        self.size = size
+        self._idle = []
+        self._started = []
+        self._live = 0
+
+    def acquire(self, timeout):
+        if self._idle:
+            return self._idle.pop()
+        if self._live >= self.size:
+            return None
+        self._live += 1
+        worker = Worker(self.handler)
+        self._started.append(worker)
+        return worker
+
+    def release(self, worker):
+        self._idle.append(worker)
+
+    def replace(self, worker):
+        worker.kill()
+        self._live -= 1
+
+    def close(self):
+        for worker in self._idle:
+            worker.stop()
+        for worker in self._started:
+            if worker.process.is_alive():
+                worker.kill()
+
+
+def map_in_processes(fn, items, workers=None, timeout_per_item=None, deadline=None):
+    """Return [fn(item) for item in items], computed in forked processes.
+
+    Up to workers processes take items one at a time, see run_requests()
+    for how timeout_per_item, deadline and failed items are handled.
+    """
+    items = list(items)
+    # Items are inherited through fork, so only indexes and results are sent
+    forked = _ForkedWorkers(
+        lambda index: fn(items[index]),
+        min(workers or default_workers(), len(items)),
+    )
+    try:
+        return run_requests(range(len(items)), forked, timeout_per_item, deadline)
+    finally:
+        forked.close()
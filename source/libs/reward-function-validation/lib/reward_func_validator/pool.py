@@ -0,0 +1,175 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import os
+import queue
+import threading
+
+from constants import POOL_MAX_REQUESTS, POOL_MAX_RSS_MB, POOL_WORKERS_ENV
+from loader import preload_allowlisted_modules
+from parallel import Worker, WorkerFailure, default_workers, run_requests
+from tracks import preload_tracks
+
+logger = logging.getLogger()
+
+
+class PoolError(Exception):
+    """A request raised in the worker; str() is the worker side message."""
+
+
+class WorkerPool:
+    """Pre-forked worker processes that serve handler(request) calls.
+
+    Workers are forked from this process once it has imported the
+    allowlisted modules and loaded every track, so a request only pays for
+    its own work, unless preloading is disabled (see preload_tracks and
+    preload_allowlisted_modules). A worker is replaced after max_requests
+    requests, once its resident memory goes over max_rss_mb, and as
+    run_requests() replaces the workers of map_in_processes(): when it
+    dies, when a request runs past its timeout, and when a request leaves
+    threads running, such as the threads of a reward function that timed
+    out.
+    """
+
+    def __init__(
+        self,
+        handler,
+        size=None,
+        max_requests=POOL_MAX_REQUESTS,
+        max_rss_mb=POOL_MAX_RSS_MB,
+    ):
+        self.handler = handler
+        self.size = size or default_workers()
+        self.max_requests = max_requests
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.recycled = 0
+        self.replaced = 0
+        self._idle = queue.LifoQueue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        preload_tracks()
+        preload_allowlisted_modules()
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        worker = Worker(self.handler, daemon=True)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _retire(self, worker, kill=False):
+        with self._lock:
+            self._workers.discard(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+
+    def acquire(self, timeout=None):
+        """Return an idle worker, waiting up to timeout seconds for one
+        (forever if None), or None.
+        """
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def release(self, worker):
+        """Take back a worker that replied, recycling it if it is due."""
+        if worker.requests >= self.max_requests or worker.rss > self.max_rss:
+            with self._lock:
+                self.recycled += 1
+            self._retire(worker)
+            worker = self._spawn()
+        self._idle.put(worker)
+
+    def replace(self, worker):
+        """Kill a worker that failed or is still busy, and fork another."""
+        with self._lock:
+            self.replaced += 1
+        self._retire(worker, kill=True)
+        self._idle.put(self._spawn())
+
+    def run(self, request, timeout=None):
+        """Return handler(request) as computed by a worker.
+
+        Raises PoolError if the handler raised, and returns a WorkerFailure
+        if the worker died or did not answer within timeout seconds.
+        """
+        result = self.map([request], timeout)[0]
+        if isinstance(result, WorkerFailure) and result.reason == WorkerFailure.ERROR:
+            raise PoolError(result.message)
+        return result
+
+    def map(self, requests, timeout=None):
+        """Return [handler(request) for request in requests], in order.
+
+        Requests are spread over the idle workers as they become free, see
+        run_requests(). Failed requests come back as WorkerFailure.
+        """
+        if self._closed:
+            raise RuntimeError("WorkerPool is closed")
+        return run_requests(requests, self, timeout)
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.kill()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_forked = False
+
+
+def _after_fork_in_child():
+    # A forked child must not talk to its parent's workers. Children run
+    # their requests in-process instead of starting pools of their own.
+    global _pool, _forked
+    if _pool is not None:
+        for worker in _pool._workers:
+            worker.conn.close()
+    _pool = None
+    _forked = True
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def pool_size():
+    """Number of pool workers, from VALIDATION_POOL_WORKERS (0 disables)."""
+    value = os.environ.get(POOL_WORKERS_ENV)
+    if not value:
+        return default_workers()
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logger.error(f"Invalid {POOL_WORKERS_ENV}: {value}")
+        return default_workers()
+
+
+def get_worker_pool(handler):
+    """Return the process-wide WorkerPool, building it on first use.
+
+    Returns None when the pool is disabled or in a forked child, in which
+    case callers run the request in-process. The pool serves handler,
+    which must be the same on every call.
+    """
+    global _pool
+    if _forked:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                size = pool_size()
+                if size == 0:
+                    return None
+                _pool = WorkerPool(handler, size)
+    return _pool
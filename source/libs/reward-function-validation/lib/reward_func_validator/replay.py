@@ -0,0 +1,203 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Replay synthetic laps through a reward function.
+
+Run from the reward-function-validation directory so the routes resolve:
+python lib/reward_func_validator/replay.py <reward_function.py> [track_name ...]
+"""
+
+import os
+import sys
+
+import numpy as np
+from constants import REPLAY_OFFSETS, REPLAY_SPEED
+from fuzz import CAR_HALF_WIDTH, MAX_STEERING, STEPS_PER_SEC
+from loader import load_reward_function, unload_reward_function
+from tracks import get_track_registry
+
+# Distance between the front and rear axles of the car, in meters
+WHEELBASE = 0.165
+
+
+class Trajectory:
+    """Per step state of a car driving one lap at a constant speed.
+
+    The car follows the center line, shifted towards the outer border by
+    offset times the half track width (negative values shift it towards
+    the inner border). distance_from_center, is_left_of_center and the
+    track flags are those of the position driven, located on the center
+    line with the track index. All fields are arrays with one entry per
+    step.
+    """
+
+    def __init__(self, track, offset=0.0, speed=REPLAY_SPEED):
+        geometry = track.geometry
+        points = geometry.center
+        cumulative = geometry.center_cumulative_length
+        self.track = track
+        self.offset = offset
+        self.speed = speed
+
+        step_length = speed / STEPS_PER_SEC
+        distance = np.arange(0.0, geometry.center_length, step_length)
+        segments = np.searchsorted(cumulative, distance, side="right") - 1
+        segments = np.clip(segments, 0, len(points) - 2)
+        lengths = cumulative[segments + 1] - cumulative[segments]
+        fractions = np.divide(
+            distance - cumulative[segments],
+            lengths,
+            out=np.zeros_like(distance),
+            where=lengths > 0,
+        )
+        following = segments + 1
+        center = points[segments] + (points[following] - points[segments]) * (
+            fractions[:, None]
+        )
+        widths = geometry.widths[segments] * (1 - fractions) + (
+            geometry.widths[following] * fractions
+        )
+        normals = geometry.normals[segments] * (1 - fractions[:, None]) + (
+            geometry.normals[following] * fractions[:, None]
+        )
+        normals /= np.hypot(normals[:, 0], normals[:, 1])[:, None]
+        xy = center + normals * (offset * widths / 2)[:, None]
+
+        # The lap is closed, so the last step drives towards the first one
+        motion = np.roll(xy, -1, axis=0) - xy
+        heading = np.arctan2(motion[:, 1], motion[:, 0])
+        # The center line turns at the waypoints only, so the curvature is
+        # measured over about one waypoint spacing either side of each step
+        window = max(1, round(geometry.center_length / (len(points) - 1) / step_length))
+        turn = np.roll(heading, -window) - np.roll(heading, window)
+        turn = (turn + np.pi) % (2 * np.pi) - np.pi
+        steering = np.degrees(np.arctan(WHEELBASE * turn / (2 * window * step_length)))
+        # Inside a hairpin another part of the lap can be nearer than the
+        # segment driven along
+        _, _, lateral = track.index.nearest(xy)
+        half_width = widths / 2
+        from_center = np.abs(lateral)
+
+        self.x = xy[:, 0]
+        self.y = xy[:, 1]
+        self.heading = np.degrees(heading)
+        self.steering_angle = np.clip(steering, -MAX_STEERING, MAX_STEERING)
+        self.progress = distance / geometry.center_length * 100
+        self.steps = np.arange(1, len(distance) + 1)
+        self.closest_waypoints = np.stack([segments, following], axis=1)
+        self.distance_from_center = from_center
+        self.is_left_of_center = lateral > 0
+        self.track_width = widths
+        self.all_wheels_on_track = from_center <= half_width - CAR_HALF_WIDTH
+        self.is_offtrack = from_center > half_width + CAR_HALF_WIDTH
+
+    def __len__(self):
+        return len(self.steps)
+
+    def params(self):
+        """Yield the params of each step, built as they are consumed."""
+        columns = {
+            "x": self.x.tolist(),
+            "y": self.y.tolist(),
+            "heading": self.heading.tolist(),
+            "steering_angle": self.steering_angle.tolist(),
+            "progress": self.progress.tolist(),
+            "steps": self.steps.tolist(),
+            "closest_waypoints": self.closest_waypoints.tolist(),
+            "distance_from_center": self.distance_from_center.tolist(),
+            "is_left_of_center": self.is_left_of_center.tolist(),
+            "track_width": self.track_width.tolist(),
+            "all_wheels_on_track": self.all_wheels_on_track.tolist(),
+            "is_offtrack": self.is_offtrack.tolist(),
+        }
+        for values in zip(*columns.values()):
+            # Objects, waypoints and track_length come from the scenarios
+            params = self.track.params("valid_params")
+            params.update(zip(columns, values))
+            params.update(speed=self.speed, is_reversed=False, is_crashed=False)
+            yield params
+
+
+class ReplayResult:
+    """Rewards of one replayed lap, one float64 per step."""
+
+    def __init__(self, track_name, offset, rewards, error=None):
+        self.track_name = track_name
+        self.offset = offset
+        self.rewards = rewards
+        # Exception of the step that failed; rewards stop before that step
+        self.error = error
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    def summary(self):
+        summary = {
+            "track_name": self.track_name,
+            "offset": self.offset,
+            "steps": len(self.rewards),
+        }
+        if len(self.rewards):
+            summary.update(
+                total=float(self.rewards.sum()),
+                min=float(self.rewards.min()),
+                mean=float(self.rewards.mean()),
+                max=float(self.rewards.max()),
+            )
+        if self.failed:
+            summary["error"] = f"{type(self.error).__name__}: {self.error}"
+        return summary
+
+
+def replay(reward_function, track, offset=0.0, speed=REPLAY_SPEED):
+    """Drive one lap of track through reward_function.
+
+    Stops at the first step that raises or returns something other than a
+    float, which is then reported as the error of the result.
+    """
+    trajectory = Trajectory(track, offset, speed)
+    rewards = np.empty(len(trajectory))
+    for step, params in enumerate(trajectory.params()):
+        try:
+            reward = reward_function(params)
+            if not isinstance(reward, float):
+                raise TypeError(f"Method returned non-floating type value: {reward}")
+        except Exception as e:
+            return ReplayResult(track.name, offset, rewards[:step], e)
+        rewards[step] = reward
+    return ReplayResult(track.name, offset, rewards)
+
+
+def replay_laps(reward_function, tracks, offsets=REPLAY_OFFSETS, speed=REPLAY_SPEED):
+    """Return the ReplayResult of every track and offset."""
+    return [
+        replay(reward_function, track, offset, speed)
+        for track in tracks
+        for offset in offsets
+    ]
+
+
+def main(argv):
+    if not argv:
+        print(__doc__.strip())
+        return 2
+    path, track_names = argv[0], argv[1:]
+    with open(path) as f:
+        source = f.read()
+    registry = get_track_registry()
+    tracks = [registry.get(name) for name in track_names or sorted(registry.names)]
+    filename = os.path.abspath(path)
+    module = load_reward_function(source, filename)
+    try:
+        results = replay_laps(module.reward_function, tracks)
+    finally:
+        unload_reward_function(filename)
+    for result in results:
+        print(result.summary())
+    return 1 if any(result.failed for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
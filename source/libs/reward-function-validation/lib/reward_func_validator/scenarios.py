@@ -0,0 +1,273 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+
+from geometry import TrackGeometry
+
+SCENARIO_NAMES = (
+    "valid_params",
+    "start_car",
+    "progress_car",
+    "off_track_car",
+    "finish_car",
+)
+
+
+def get_params(waypoints, geometry=None):
+    if geometry is None:
+        geometry = TrackGeometry(waypoints)
+    track_width = float(geometry.widths[0])
+    num_waypoints = waypoints.shape[0]
+    track_length = geometry.length
+
+    # set a valid input as a startline
+    valid_params = {
+        "all_wheels_on_track": True,
+        "x": (waypoints[0, 2] + waypoints[0, 0])
+        / 2,  # start line between inner lane and center lane
+        "y": (waypoints[0, 3] + waypoints[0, 1])
+        / 2,  # start line between inner lane and center lane
+        "distance_from_center": 0,
+        "heading": 0,
+        "progress": 0,
+        "steps": 1,
+        "speed": 0.5,
+        "steering_angle": 6,
+        "track_width": track_width,
+        "waypoints": waypoints[:, 2:4],  # only the center line
+        "closest_waypoints": [0, 1],
+        "is_left_of_center": True,
+        "is_reversed": True,
+        "track_length": track_length,
+        "closest_objects": [0, 1],  # random, doesn't matter
+        "objects_location": [
+            [4.511289152034186, 1.3292364463761641],
+            [6.537302737755836, 1.4140104486149618],
+            [4.752976532490525, 3.1350845729056838],
+            [3.103370840828792, 4.133062703357412],
+            [0.7094212601659824, 4.217507179944688],
+            [1.5996645329306798, 1.7124666440529925],
+        ],
+        "objects_left_of_center": [True, True, False, True, False, True],
+        "object_in_camera": True,
+        "objects_speed": [0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
+        "objects_heading": [
+            2.717322296283114,
+            2.368920328229894,
+            -1.9305073380382327,
+            -1.3586571052564007,
+            0.00025041038280975884,
+            0.5573269195381345,
+        ],
+        "objects_distance": [
+            1.9501724549506574,
+            4.139700164331426,
+            7.997164727523002,
+            10.024219705986598,
+            12.56561517097048,
+            15.090712948383509,
+        ],
+        "is_crashed": False,
+        "is_offtrack": False,
+    }
+
+    start_car = {
+        "all_wheels_on_track": True,
+        "x": waypoints[0, 2],  # start line
+        "y": waypoints[0, 3],  # start line
+        "distance_from_center": 0,
+        "heading": 0,
+        "progress": 0,
+        "steps": 1,
+        "speed": 0.1,
+        "steering_angle": 0.2,
+        "track_width": track_width,
+        "waypoints": waypoints[:, 2:4],  # only the center line
+        "closest_waypoints": [0, 1],  # doesn't matter
+        "is_left_of_center": True,
+        "is_reversed": True,
+        "track_length": track_length,
+        "closest_objects": [0, 1],
+        "objects_location": [
+            [4.511289152034186, 1.3292364463761641],
+            [6.537302737755836, 1.4140104486149618],
+            [4.752976532490525, 3.1350845729056838],
+            [3.103370840828792, 4.133062703357412],
+            [0.7094212601659824, 4.217507179944688],
+            [1.5996645329306798, 1.7124666440529925],
+        ],
+        "objects_left_of_center": [True, True, False, True, False, True],
+        "object_in_camera": True,
+        "objects_speed": [0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
+        "objects_heading": [
+            2.717322296283114,
+            2.368920328229894,
+            -1.9305073380382327,
+            -1.3586571052564007,
+            0.00025041038280975884,
+            0.5573269195381345,
+        ],
+        "objects_distance": [
+            1.9501724549506574,
+            4.139700164331426,
+            7.997164727523002,
+            10.024219705986598,
+            12.56561517097048,
+            15.090712948383509,
+        ],
+        "is_crashed": False,
+        "is_offtrack": False,
+    }
+
+    progress_car = {
+        "all_wheels_on_track": True,
+        "x": waypoints[math.floor(num_waypoints / 2), 2],  # middle waypoint
+        "y": waypoints[math.floor(num_waypoints / 2), 3],  # middle waypoint
+        "distance_from_center": 0,
+        "heading": 359.9,
+        "progress": 50,
+        "steps": 100,
+        "speed": 1.0,
+        "steering_angle": 6,
+        "track_width": track_width,
+        "waypoints": waypoints[:, 2:4],  # only the center line
+        "closest_waypoints": [3, 4],
+        "is_left_of_center": True,
+        "is_reversed": True,
+        "track_length": track_length,
+        "closest_objects": [0, 1],
+        "objects_location": [
+            [4.511289152034186, 1.3292364463761641],
+            [6.537302737755836, 1.4140104486149618],
+            [4.752976532490525, 3.1350845729056838],
+            [3.103370840828792, 4.133062703357412],
+            [0.7094212601659824, 4.217507179944688],
+            [1.5996645329306798, 1.7124666440529925],
+        ],
+        "objects_left_of_center": [True, True, False, True, False, True],
+        "object_in_camera": True,
+        "objects_speed": [0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
+        "objects_heading": [
+            2.717322296283114,
+            2.368920328229894,
+            -1.9305073380382327,
+            -1.3586571052564007,
+            0.00025041038280975884,
+            0.5573269195381345,
+        ],
+        "objects_distance": [
+            1.9501724549506574,
+            4.139700164331426,
+            7.997164727523002,
+            10.024219705986598,
+            12.56561517097048,
+            15.090712948383509,
+        ],
+        "is_crashed": False,
+        "is_offtrack": False,
+    }
+    # get offtrack coordinates by moving from the center line towards the outer lane by the track width.
+    slope_x, slope_y = geometry.normals[0]
+    offtrack_x = (
+        waypoints[0, 0] + slope_x * track_width
+    )  # distance from center is equal to track width
+    offtrack_y = (
+        waypoints[0, 1] + slope_y * track_width
+    )  # distance from center is equal to track width
+    off_track_car = {
+        "all_wheels_on_track": False,
+        "x": offtrack_x,
+        "y": offtrack_y,
+        "distance_from_center": track_width,
+        "heading": 359.9,
+        "progress": 0,
+        "steps": 1,
+        "speed": 1,
+        "steering_angle": 15,
+        "track_width": track_width,
+        "waypoints": waypoints[:, 2:4],  # only the center line
+        "closest_waypoints": [0, 1],
+        "is_left_of_center": True,
+        "is_reversed": True,
+        "track_length": track_length,
+        "closest_objects": [0, 1],
+        "objects_location": [
+            [4.511289152034186, 1.3292364463761641],
+            [6.537302737755836, 1.4140104486149618],
+            [4.752976532490525, 3.1350845729056838],
+            [3.103370840828792, 4.133062703357412],
+            [0.7094212601659824, 4.217507179944688],
+            [1.5996645329306798, 1.7124666440529925],
+        ],
+        "objects_left_of_center": [True, True, False, True, False, True],
+        "object_in_camera": True,
+        "objects_speed": [0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
+        "objects_heading": [
+            2.717322296283114,
+            2.368920328229894,
+            -1.9305073380382327,
+            -1.3586571052564007,
+            0.00025041038280975884,
+            0.5573269195381345,
+        ],
+        "objects_distance": [
+            1.9501724549506574,
+            4.139700164331426,
+            7.997164727523002,
+            10.024219705986598,
+            12.56561517097048,
+            15.090712948383509,
+        ],
+        "is_crashed": False,
+        "is_offtrack": True,
+    }
+
+    finish_car = {
+        "all_wheels_on_track": True,
+        "x": waypoints[num_waypoints - 1, 2],  # finish line
+        "y": waypoints[num_waypoints - 1, 3],  # finish line
+        "distance_from_center": 0,
+        "heading": 359.9,
+        "progress": 100,
+        "steps": 10000,
+        "speed": 5.0,
+        "steering_angle": 0,
+        "track_width": track_width,
+        "waypoints": waypoints[:, 2:4],  # only the center line
+        "closest_waypoints": [len(waypoints) - 2, len(waypoints) - 1],
+        "is_left_of_center": True,
+        "is_reversed": True,
+        "track_length": track_length,
+        "closest_objects": [0, 1],
+        "objects_location": [
+            [4.511289152034186, 1.3292364463761641],
+            [6.537302737755836, 1.4140104486149618],
+            [4.752976532490525, 3.1350845729056838],
+            [3.103370840828792, 4.133062703357412],
+            [0.7094212601659824, 4.217507179944688],
+            [1.5996645329306798, 1.7124666440529925],
+        ],
+        "objects_left_of_center": [True, True, False, True, False, True],
+        "object_in_camera": True,
+        "objects_speed": [0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
+        "objects_heading": [
+            2.717322296283114,
+            2.368920328229894,
+            -1.9305073380382327,
+            -1.3586571052564007,
+            0.00025041038280975884,
+            0.5573269195381345,
+        ],
+        "objects_distance": [
+            1.9501724549506574,
+            4.139700164331426,
+            7.997164727523002,
+            10.024219705986598,
+            12.56561517097048,
+            15.090712948383509,
+        ],
+        "is_crashed": False,
+        "is_offtrack": False,
+    }
+    return valid_params, start_car, progress_car, off_track_car, finish_car
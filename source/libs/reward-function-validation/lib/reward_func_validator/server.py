@@ -0,0 +1,355 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Serve the validator over HTTP, for deployments outside of Lambda.
+
+POST /validate takes the event lambda_handler takes and answers with its
+statusCode and body. GET /health answers 200 while the service accepts
+requests and 503 once it is draining.
+
+Run from the reward-function-validation directory so the routes resolve,
+or in the Lambda image:
+python lib/reward_func_validator/server.py [port]
+docker run -p 8080:8080 --entrypoint python <image> server.py
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from constants import (
+    SERVER_DRAIN_TIMEOUT_SEC,
+    SERVER_IDLE_TIMEOUT_SEC,
+    SERVER_MAX_BODY_BYTES,
+    SERVER_PORT,
+    SERVER_QUEUE_ENV,
+    SERVER_QUEUE_SIZE,
+    SERVER_WORKERS_ENV,
+)
+from lambda_function import lambda_handler
+from parallel import default_workers
+from validator import _invalid_item, build_error_response, initialize
+
+logger = logging.getLogger()
+
+VALIDATE_PATH = "/validate"
+HEALTH_PATH = "/health"
+_MAX_HEADERS = 100
+_STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+class _HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logger.error(f"Invalid {name}: {value}")
+        return default
+
+
+def server_workers():
+    """Number of concurrent validations, from VALIDATION_SERVER_WORKERS."""
+    return _env_int(SERVER_WORKERS_ENV, 0) or default_workers()
+
+
+def server_queue_size():
+    """Number of requests that may wait for a worker, from
+    VALIDATION_SERVER_QUEUE.
+    """
+    return _env_int(SERVER_QUEUE_ENV, SERVER_QUEUE_SIZE)
+
+
+def _invalid_event(event):
+    if not isinstance(event, dict):
+        return "expected an object"
+    if "items" in event:
+        if not isinstance(event["items"], list):
+            return "items must be a list"
+        # Invalid items are reported in their own results
+        return None
+    return _invalid_item(event)
+
+
+def _error_body(message):
+    return json.dumps(build_error_response(message))
+
+
+async def _read_request(reader):
+    """Read one request from reader.
+
+    Returns (method, path, body, keep_alive), or None at the end of the
+    connection. Raises _HttpError for a request the service cannot read.
+    """
+    try:
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise _HttpError(400, "Malformed request line")
+        method, target, version = parts
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= _MAX_HEADERS:
+                raise _HttpError(431, "Too many headers")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "transfer-encoding" in headers:
+            raise _HttpError(411, "Content-Length is required")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _HttpError(400, "Invalid Content-Length")
+        if length > SERVER_MAX_BODY_BYTES:
+            raise _HttpError(413, f"Request body over {SERVER_MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length > 0 else b""
+    except asyncio.IncompleteReadError:
+        return None
+    except ValueError:
+        # A line over the stream limit
+        raise _HttpError(431, "Request line or header too long")
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.1":
+        keep_alive = connection != "close"
+    else:
+        keep_alive = connection == "keep-alive"
+    return method, target.split("?", 1)[0], body, keep_alive
+
+
+async def _write_response(writer, status, body, headers, keep_alive):
+    body = body.encode("utf-8")
+    lines = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+class ValidationServer:
+    """Serves lambda_handler over HTTP/1.1 from an asyncio event loop.
+
+    Requests are validated on up to workers threads, which send their
+    runtime checks to the WorkerPool processes. The processes they start,
+    such as batch workers and replacement pool workers, fork from a single
+    thread (see parallel.start_process()). Up to queue_size more
+    accepted requests wait for a thread, and the service answers 503 past
+    that rather than queueing without bound. A request identical to one
+    being validated waits for that validation and shares its response.
+    """
+
+    def __init__(self, handler=lambda_handler, workers=None, queue_size=None):
+        self.handler = handler
+        self.workers = workers or server_workers()
+        self.queue_size = server_queue_size() if queue_size is None else queue_size
+        self.admitted = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="validation"
+        )
+        self._in_flight = {}
+        # Connections waiting for a request, and the number of requests
+        # read but not yet answered
+        self._idle = set()
+        self._active = 0
+        self._done = asyncio.Event()
+        self._draining = False
+        self._server = None
+        self.port = None
+
+    async def start(self, host="0.0.0.0", port=SERVER_PORT):
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        # The port bound, when port is 0
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def drain(self, timeout=SERVER_DRAIN_TIMEOUT_SEC):
+        """Stop accepting connections and requests, and wait up to timeout
+        seconds for the accepted requests to be answered.
+
+        Returns whether every accepted request was answered in time.
+        """
+        self._draining = True
+        self._server.close()
+        for writer in list(self._idle):
+            writer.close()
+        drained = True
+        if self._active:
+            self._done.clear()
+            try:
+                await asyncio.wait_for(self._done.wait(), timeout)
+            except asyncio.TimeoutError:
+                drained = False
+        for writer in list(self._idle):
+            writer.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        return drained
+
+    def health(self):
+        return {
+            "status": "draining" if self._draining else "ok",
+            "workers": self.workers,
+            "running": min(self.admitted, self.workers),
+            "queued": max(0, self.admitted - self.workers),
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+        }
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            while not self._draining:
+                self._idle.add(writer)
+                try:
+                    request = await asyncio.wait_for(
+                        _read_request(reader), SERVER_IDLE_TIMEOUT_SEC
+                    )
+                except asyncio.TimeoutError:
+                    break
+                except _HttpError as e:
+                    self._idle.discard(writer)
+                    await _write_response(
+                        writer, e.status, _error_body(str(e)), {}, False
+                    )
+                    break
+                finally:
+                    self._idle.discard(writer)
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                self._active += 1
+                try:
+                    status, response, headers = await self._dispatch(method, path, body)
+                    keep_alive = keep_alive and not self._draining
+                    await _write_response(writer, status, response, headers, keep_alive)
+                finally:
+                    self._active -= 1
+                    if not self._active:
+                        self._done.set()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        if path == HEALTH_PATH:
+            if method != "GET":
+                return 405, _error_body("Method not allowed"), {}
+            return (503 if self._draining else 200), json.dumps(self.health()), {}
+        if path != VALIDATE_PATH:
+            return 404, _error_body(f"Not found: {path}"), {}
+        if method != "POST":
+            return 405, _error_body("Method not allowed"), {}
+        if self._draining:
+            return 503, _error_body("Service is shutting down"), {}
+        try:
+            event = json.loads(body)
+        except ValueError:
+            return 400, _error_body("Invalid request: body is not JSON"), {}
+        error = _invalid_event(event)
+        if error:
+            return 400, _error_body(f"Invalid request: {error}"), {}
+
+        job = self._submit(event)
+        if job is None:
+            return 503, _error_body("Validation queue is full"), {"Retry-After": "1"}
+        try:
+            # Shielded: a client going away does not cancel a shared job
+            response = await asyncio.shield(job)
+        except Exception as e:
+            logger.exception("Validation failed")
+            return 500, _error_body(f"Exception occured during validation: {e}"), {}
+        headers = {}
+        if "metrics" in response:
+            headers["X-Validation-Metrics"] = json.dumps(response["metrics"])
+        return response["statusCode"], response["body"], headers
+
+    def _submit(self, event):
+        """Return the future of the validation of event: the one in flight
+        for an identical event, or a new one. None if the queue is full.
+        """
+        key = json.dumps(event, sort_keys=True)
+        job = self._in_flight.get(key)
+        if job is not None:
+            self.coalesced += 1
+            return job
+        if self.admitted >= self.workers + self.queue_size:
+            self.rejected += 1
+            return None
+        self.admitted += 1
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(self._executor, self.handler, event, None)
+        self._in_flight[key] = job
+        job.add_done_callback(lambda _: self._finish(key))
+        return job
+
+    def _finish(self, key):
+        del self._in_flight[key]
+        self.admitted -= 1
+
+
+async def serve(host, port):
+    """Serve until SIGTERM or SIGINT, then drain. Returns the exit status."""
+    server = ValidationServer()
+    await server.start(host, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    handlers = {sig: signal.getsignal(sig) for sig in _STOP_SIGNALS}
+    for sig in _STOP_SIGNALS:
+        loop.add_signal_handler(sig, stop.set)
+
+    def restore_signals():
+        # Processes forked from now on, such as replacement pool workers,
+        # would otherwise only wake up the event loop of this process when
+        # terminated
+        signal.set_wakeup_fd(-1)
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+
+    os.register_at_fork(after_in_child=restore_signals)
+    logger.info(
+        f"Listening on {host}:{server.port} with {server.workers} workers "
+        f"and a queue of {server.queue_size}"
+    )
+    await stop.wait()
+    logger.info("Draining")
+    drained = await server.drain()
+    logger.info("Drained" if drained else "Drain timed out")
+    return 0 if drained else 1
+
+
+def main(argv):
+    if len(argv) > 1 or (argv and not argv[0].isdigit()):
+        print(__doc__.strip())
+        return 2
+    port = int(argv[0]) if argv else SERVER_PORT
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(message)s")
+    # Forks the worker pool, so before the event loop starts any thread
+    initialize()
+    return asyncio.run(serve("0.0.0.0", port))
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,167 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+
+# Queries compared with every segment at once by the full scan
+_SCAN_CHUNK = 2048
+
+
+def _project(x, y, start_x, start_y, direction_x, direction_y, lengths_sq):
+    """Project points (x, y), shape (q,), onto segments, shape (q, m).
+
+    Returns the parameter along each segment, clipped to the segment, and
+    the squared distance to it. Coordinates are kept in separate arrays,
+    which is several times faster than operating on (q, m, 2) arrays.
+    """
+    relative_x = x[:, None] - start_x
+    relative_y = y[:, None] - start_y
+    dot = relative_x * direction_x + relative_y * direction_y
+    t = np.divide(dot, lengths_sq, out=np.zeros_like(dot), where=lengths_sq > 0)
+    np.clip(t, 0.0, 1.0, out=t)
+    relative_x -= direction_x * t
+    relative_y -= direction_y * t
+    return t, relative_x * relative_x + relative_y * relative_y
+
+
+def _group_starts(counts):
+    # Offset of each element within its group, for consecutive groups
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+class SegmentGrid:
+    """Uniform grid over the segments of a polyline, for nearest segment
+    queries.
+
+    Each cell lists every segment whose bounding box, grown by radius,
+    overlaps the cell. The nearest segment of a point within radius of the
+    polyline is therefore among the segments of its cell, and only points
+    further away than that are compared with every segment. Polylines with
+    few segments for their size (dense) are always compared in full.
+    """
+
+    def __init__(self, points, cumulative_length, radius):
+        points = np.asarray(points, dtype=float)
+        starts = points[:-1]
+        directions = np.diff(points, axis=0)
+        self.start_x, self.start_y = np.ascontiguousarray(starts.T)
+        self.direction_x, self.direction_y = np.ascontiguousarray(directions.T)
+        self.lengths_sq = self.direction_x**2 + self.direction_y**2
+        self.cumulative_length = cumulative_length
+        self.radius = radius
+        # Cells smaller than the radius keep the candidate lists short
+        self.cell_size = radius / 2
+        self.origin = points.min(axis=0) - radius
+        extent = points.max(axis=0) + radius - self.origin
+        self.shape = np.floor(extent / self.cell_size).astype(int) + 1
+
+        # One (cell, segment) pair per cell a grown bounding box overlaps
+        first = self._cells(np.minimum(starts, points[1:]) - radius)
+        last = self._cells(np.maximum(starts, points[1:]) + radius)
+        rows = last[:, 1] - first[:, 1] + 1
+        counts = (last[:, 0] - first[:, 0] + 1) * rows
+        segments = np.repeat(np.arange(len(starts)), counts)
+        within = _group_starts(counts)
+        cell_x = first[segments, 0] + within // rows[segments]
+        cell_y = first[segments, 1] + within % rows[segments]
+        cells = cell_x * self.shape[1] + cell_y
+        order = np.argsort(cells, kind="stable")
+        cells, segments = cells[order], segments[order]
+
+        # Padded with the last segment of each cell, so every row can be
+        # evaluated at once without changing its nearest segment. Segment
+        # indexes fit in 32 bits, which halves the memory of the index.
+        per_cell = np.bincount(cells, minlength=self.shape[0] * self.shape[1])
+        width = max(1, per_cell.max())
+        candidates = np.zeros((len(per_cell), width), dtype=np.int32)
+        candidates[cells, _group_starts(per_cell)] = segments
+        columns = np.minimum(np.arange(width), np.maximum(per_cell, 1)[:, None] - 1)
+        self.candidates = np.take_along_axis(candidates, columns, axis=1)
+        self.empty = per_cell == 0
+        # Gathering rows this long costs more than comparing every segment
+        self.dense = width * 3 >= len(starts)
+
+    def _cells(self, xy):
+        index = np.floor((xy - self.origin) / self.cell_size).astype(int)
+        return np.clip(index, 0, self.shape - 1)
+
+    def nearest(self, xy):
+        """Locate points xy, shape (q, 2), on the nearest segment.
+
+        Returns closest_waypoints (q, 2), the pair of point indexes of the
+        segment, the arc length of the projection from the first point,
+        and the signed lateral offset, positive left of the direction of
+        the polyline.
+        """
+        xy = np.atleast_2d(np.asarray(xy, dtype=float))
+        x = np.ascontiguousarray(xy[:, 0])
+        y = np.ascontiguousarray(xy[:, 1])
+        if self.dense:
+            segments = np.empty(len(x), dtype=np.intp)
+            t = np.empty(len(x))
+            far = np.arange(len(x))
+        else:
+            segments, t, far = self._nearest_in_cells(xy, x, y)
+        for start in range(0, len(far), _SCAN_CHUNK):
+            chunk = far[start : start + _SCAN_CHUNK]
+            segments[chunk], t[chunk] = self._scan(x[chunk], y[chunk])
+
+        direction_x = self.direction_x[segments]
+        direction_y = self.direction_y[segments]
+        relative_x = x - self.start_x[segments]
+        relative_y = y - self.start_y[segments]
+        cross = direction_x * relative_y - direction_y * relative_x
+        offset = np.copysign(
+            np.hypot(relative_x - direction_x * t, relative_y - direction_y * t), cross
+        )
+        arc_length = self.cumulative_length[segments] + t * np.sqrt(
+            self.lengths_sq[segments]
+        )
+        return np.stack([segments, segments + 1], axis=1), arc_length, offset
+
+    def _nearest_in_cells(self, xy, x, y):
+        cells = self._cells(xy)
+        cells = cells[:, 0] * self.shape[1] + cells[:, 1]
+        # Gathered per query rather than kept per cell, which would hold
+        # several copies of the segments of every track in memory
+        candidates = self.candidates[cells]
+        t, distance_sq = _project(
+            x,
+            y,
+            self.start_x[candidates],
+            self.start_y[candidates],
+            self.direction_x[candidates],
+            self.direction_y[candidates],
+            self.lengths_sq[candidates],
+        )
+        distance_sq[self.empty[cells]] = np.inf
+        # Lowest segment index among equally near ones, as the scan picks
+        best = np.argmin(distance_sq, axis=1)
+        queries = np.arange(len(x))
+        # Without a candidate within radius the nearest segment is further
+        # away, and not necessarily listed in the cell
+        far = np.flatnonzero(~(distance_sq[queries, best] <= self.radius**2))
+        return candidates[queries, best], t[queries, best], far
+
+    def _scan(self, x, y):
+        """Nearest segment of each point, comparing it with every segment."""
+        t, distance_sq = _project(
+            x,
+            y,
+            self.start_x,
+            self.start_y,
+            self.direction_x,
+            self.direction_y,
+            self.lengths_sq,
+        )
+        best = np.argmin(distance_sq, axis=1)
+        return best, t[np.arange(len(x)), best]
+
+    def scan(self, xy):
+        """Like nearest(), comparing every point with every segment."""
+        xy = np.atleast_2d(np.asarray(xy, dtype=float))
+        segments = np.empty(len(xy), dtype=np.intp)
+        for start in range(0, len(xy), _SCAN_CHUNK):
+            chunk = slice(start, start + _SCAN_CHUNK)
+            segments[chunk], _ = self._scan(xy[chunk, 0], xy[chunk, 1])
+        return segments
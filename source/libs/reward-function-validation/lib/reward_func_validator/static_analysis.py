@@ -0,0 +1,134 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import ast
+import functools
+import hashlib
+
+from constants import FORBID_STRINGS
+
+# Raised for call chains that do not start at a name, e.g. "{}".format(x).
+# This is the error the former recursive parser hit on ".".join(None).
+CHAIN_ERROR_MESSAGE = "can only join an iterable"
+
+_VISIT = 0
+_EMIT = 1
+
+
+def _walk_chain(node):
+    """Follow a Call/Attribute chain down to its root name.
+
+    Returns the dotted name parts (None if the chain does not start at a
+    name) and the positional call arguments met on the way, outermost first.
+    """
+    parts = []
+    args = []
+    while True:
+        if isinstance(node, ast.Name):
+            parts.append(node.id)
+            parts.reverse()
+            return parts, args
+        if isinstance(node, ast.Call):
+            args.extend(node.args)
+            node = node.func
+        elif isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        else:
+            return None, args
+
+
+class TreeWalk:
+    """Single iterative traversal collecting imports and dotted call chains.
+
+    Call chains come out in the same order as the former recursive
+    parse()/_parse_chain(): positional arguments of a call are walked before
+    the chain they belong to is recorded, keyword arguments are not walked.
+    """
+
+    def __init__(self, tree):
+        self.imports = set()
+        self.calls = []
+        self.chain_error = False
+        self._walk(tree)
+
+    def _walk(self, tree):
+        stack = [(_VISIT, tree)]
+        while stack:
+            action, item = stack.pop()
+            if action == _EMIT:
+                if item is None:
+                    self.chain_error = True
+                elif not self.chain_error:
+                    self.calls.append(item)
+                continue
+
+            if isinstance(item, (ast.Call, ast.Attribute)):
+                parts, args = _walk_chain(item)
+                stack.append((_EMIT, None if parts is None else ".".join(parts)))
+                stack.extend((_VISIT, arg) for arg in reversed(args))
+                continue
+
+            if isinstance(item, ast.Import):
+                self.imports.update(alias.name for alias in item.names)
+            elif isinstance(item, ast.ImportFrom):
+                self.imports.add(item.module)
+
+            children = []
+            for field in item._fields:
+                value = getattr(item, field, None)
+                if isinstance(value, list):
+                    children.extend(v for v in value if isinstance(v, ast.AST))
+                elif isinstance(value, ast.AST):
+                    children.append(value)
+            stack.extend((_VISIT, child) for child in reversed(children))
+
+
+class StaticAnalysis:
+    """Static checks input for one reward function source.
+
+    The source is parsed and walked once, on first access, and the result is
+    shared by the import, builtin and forbidden string checks.
+    """
+
+    def __init__(self, source):
+        self.source = source
+
+    @functools.cached_property
+    def tree(self):
+        return ast.parse(self.source)
+
+    @functools.cached_property
+    def _walk(self):
+        return TreeWalk(self.tree)
+
+    @functools.cached_property
+    def normalized_digest(self):
+        """Digest of the syntax tree, unaffected by comments and formatting.
+
+        None if the source does not parse.
+        """
+        try:
+            dump = ast.dump(self.tree)
+        except SyntaxError:
+            return None
+        return hashlib.sha256(dump.encode()).hexdigest()
+
+    @property
+    def imports(self):
+        """Imported module names, as reported by the former Analyzer."""
+        return self._walk.imports
+
+    @property
+    def calls(self):
+        """Dotted call and attribute chains in traversal order."""
+        return self._walk.calls
+
+    @property
+    def chain_error(self):
+        return self._walk.chain_error
+
+    @functools.cached_property
+    def forbidden_strings(self):
+        """Restricted strings present in the raw source, in FORBID_STRINGS order."""
+        return [s for s in FORBID_STRINGS if s in self.source]
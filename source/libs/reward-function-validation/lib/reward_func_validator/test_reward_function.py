@@ -7,46 +7,65 @@ import sys
 sys.path.append(
     os.path.dirname(__file__)
 )  # append current directory so relative imports can work
-sys.path.append("/tmp/") # NOSONAR
-import ast
-import difflib
-import importlib
+import copy
+import functools
 import inspect
+import io
 import json
 import logging
-import math
-import re
-import subprocess
+import time
 import traceback
-import unittest
 from threading import Thread
 
-import numpy as np
+from checks import (
+    CheckCancelled,
+    DeepRacerError,
+    calls_reward_function,
+    plan_checks,
+    run_check,
+    run_checks,
+)
 from constants import (
+    ALL_TRACKS,
     ALLOWLIST_IMPORTS,
+    DEADLINE_GRACE_SEC,
     FORBID_ACCESS,
-    FORBID_STRINGS,
-    REWARD_FUNCTION_PATH,
+    FUZZ_BUDGET_SEC,
+    FUZZ_SAMPLES,
+    FUZZ_SEED,
+    LATENCY_BUDGET_SEC,
+    LATENCY_CALLS,
+    LATENCY_FAIL_MS,
+    LATENCY_WARN_MS,
+    LINT_TIMEOUT_SEC,
+    REWARD_FUNCTION_MAX_BYTES,
     TIMEOUT_SEC,
-    TRACK_NAME_PATH,
 )
+from context import ValidationContext
+from deadline import LINT_STAGE, RUNTIME_STAGE, STATIC_STAGE, scenario_budget
+from fuzz import FuzzReport, fuzz
+from latency import LATENCY_FAIL, LATENCY_WARN, LatencyReport, measure
+from lint import LINT_TIMEOUT_MESSAGE, LintTimeoutError, get_lint_engine
+from log_format import source_summary
+from parallel import WorkerFailure, map_in_processes
+from pool import get_worker_pool
+from scenarios import SCENARIO_NAMES
+from static_analysis import CHAIN_ERROR_MESSAGE, TreeWalk
+from timings import FUZZ_TIMING, LATENCY_TIMING, TOTAL_TIMING, emit_timings
+from tracks import TrackNotFoundError, get_track_registry
 
-REWARD_FUNCTION_FILE = "/tmp/reward_function.py" # NOSONAR
 TRACK_PARSE_ERROR = "InternalServerError: Unable to parse track information"
+TIMED_OUT_MESSAGE = "Timed Out"
+FUZZ_FAILURE_MESSAGE = "Failed on generated params"
+LATENCY_FAILURE_MESSAGE = "Reward function is too slow"
+SOURCE_TOO_LARGE_MESSAGE = "Reward function is too large"
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
-class DeepRacerError(Exception):
-    def __init__(self, **kwargs):
-        self._dict = kwargs
-
-    def __str__(self):
-        return json.dumps(self._dict)
-
-
 def wrap(fn):
+    @functools.wraps(fn)
     def f(*args, **kwargs):
         try:
             return fn(*args, **kwargs)
@@ -82,22 +101,19 @@ def wrap(fn):
     return f
 
 
-def _parse_flake8_line(line, reward_content):
-    """Parse a single flake8 output line into a structured result."""
-    parts = line.split(":")
-
-    if len(parts) > 3:
-        error_type = parts[2].strip()
-        line_num = parts[1].strip()
-        message = " : ".join(parts[3:])  # Join remaining parts as message
-    elif len(parts) == 3:
+def _build_lint_result(code, row, text, reward_content):
+    """Build the structured result for a single flake8 violation."""
+    # Mirrors how the former "%(code)s:%(row)d:%(text)s" CLI output was split:
+    # texts such as "SyntaxError: invalid syntax" report the exception name
+    # as the type, everything else reports the flake8 code.
+    parts = text.split(":")
+    if len(parts) > 1:
         error_type = parts[0].strip()
-        line_num = parts[1].strip()
-        message = parts[2]
+        message = " : ".join(parts[1:])
     else:
-        error_type = "Unexpected Error"
-        line_num = "1"
-        message = line.strip()
+        error_type = code
+        message = text
+    line_num = str(row)
 
     return {
         "type": error_type,
@@ -111,41 +127,28 @@ def _parse_flake8_line(line, reward_content):
     }
 
 
-def run_flake8():
+def run_flake8(reward_function, timeout=LINT_TIMEOUT_SEC):
     try:
-        result = subprocess.run(
-            [
-                "flake8",
-                REWARD_FUNCTION_PATH,
-                "--format=%(code)s:%(row)d:%(text)s",
-                "--select=E,F",
-                "--ignore=E5,E226,E261",  # ignore stylistic errors
-            ],
-            capture_output=True,
-            text=True,
-        )
-        if result.stdout:
-            lines = result.stdout.strip().split("\n")
-
-            parsed_results = []
-            try:
-                with open(REWARD_FUNCTION_PATH) as reward_file:
-                    reward_content = reward_file.readlines()
-
-                for line in lines:
-                    if line.strip():
-                        parsed_results.append(_parse_flake8_line(line, reward_content))
+        violations = get_lint_engine().lint(reward_function, timeout)
+        if not violations:
+            return []
+        reward_content = io.StringIO(reward_function, newline=None).readlines()
+        return [
+            _build_lint_result(code, row, text, reward_content)
+            for code, row, text in violations
+        ]
+    except LintTimeoutError as e:
+        raise DeepRacerError(message=str(e), type="TEST_FAILURE", stage=LINT_STAGE)
+    except Exception as e:
+        raise DeepRacerError(message=f"Flake8 linting error: {e}", type="TEST_FAILURE")
 
-            except (ValueError, IndexError, FileNotFoundError) as e:
-                # If parsing fails, return generic error
-                return [
-                    {"type": "Unexpected Error", "message": str(e), "lineNumber": "1"}
-                ]
 
-            return parsed_results
-        return []
-    except Exception as e:
-        raise DeepRacerError(f"Flake8 linting error: {e}")
+def load_track(context):
+    """Return the registry Track for the track name of the request."""
+    try:
+        return context.track
+    except TrackNotFoundError:
+        raise DeepRacerError(message=TRACK_PARSE_ERROR, type="TEST_FAILURE")
 
 
 def _fail_import(*args, **kwargs):
@@ -153,659 +156,644 @@ def _fail_import(*args, **kwargs):
     raise DeepRacerError(message=msg, type="IMPORT_ERROR")
 
 
-class TestSyntax(unittest.TestCase):
-    def test_syntax(self):
-        lint_output = run_flake8()
-        for result in lint_output:
-            raise DeepRacerError(**result)
-
-
-# The recursive pattern below traverses the main AST (parse) and
-# utilizes a helper function (_parse_chain) to walk any attributes or calls for names present
-# ref: https://stackoverflow.com/questions/72064609/how-can-i-retrieve-function-names-and-attributes-from-python-code-with-ast
-def _parse_chain(d, c, p=[]):
-    """Walk attributes or calls to extract the full dotted name."""
-    if isinstance(d, ast.Name):
-        return [d.id] + p
-    if isinstance(d, ast.Call):
-        for i in d.args:
-            parse(i, c)
-        return _parse_chain(d.func, c, p)
-    if isinstance(d, ast.Attribute):
-        return _parse_chain(d.value, c, [d.attr] + p)
+def check_syntax(context):
+    timeout = min(LINT_TIMEOUT_SEC, context.deadline.remaining())
+    with context.timings.stage(LINT_STAGE):
+        lint_output = run_flake8(context.source, timeout)
+    for result in lint_output:
+        raise DeepRacerError(**result)
 
 
 def parse(d, c):
     """Traverse AST and collect function/attribute names into list c."""
-    if isinstance(d, (ast.Call, ast.Attribute)):
-        c.append(".".join(_parse_chain(d, c)))
-    else:
-        for i in getattr(d, "_fields", []):
-            t = getattr(d, i)
-            if isinstance(t, list):
-                for i in t:
-                    parse(i, c)
-            else:
-                parse(t, c)
+    walk = TreeWalk(d)
+    c.extend(walk.calls)
+    if walk.chain_error:
+        raise TypeError(CHAIN_ERROR_MESSAGE)
+
+
+@wrap
+def check_imports(context):
+    all_imports = context.analysis.imports
+    # only care about the upper most module
+    all_imports = [x.split(".")[0] for x in all_imports]
+    if any(x not in ALLOWLIST_IMPORTS for x in all_imports):
+        fail(
+            "The reward function contains illegal import(s): {}".format(
+                [x for x in all_imports if x not in ALLOWLIST_IMPORTS]
+            )
+        )
 
 
-class TestIllegalImportsAndBuiltins(unittest.TestCase):
-    @wrap
-    def test_imports(self):
-        with open(REWARD_FUNCTION_FILE) as source:
-            tree = ast.parse(source.read())
-        analyzer = Analyzer()
-        analyzer.visit(tree)
-        all_imports = analyzer.report()
-        # only care about the upper most module
-        all_imports = [x.split(".")[0] for x in all_imports]
-        if any(x not in ALLOWLIST_IMPORTS for x in all_imports):
+@wrap
+def check_builtins(context):
+    if context.analysis.chain_error:
+        raise TypeError(CHAIN_ERROR_MESSAGE)
+    results = context.analysis.calls
+    for method in results:
+        if method in FORBID_ACCESS:
             fail(
-                "The reward function contains illegal import(s): {}".format(
-                    [x for x in all_imports if x not in ALLOWLIST_IMPORTS]
+                "The reward function contains forbidden builtins: {}".format(
+                    [x for x in results if x in FORBID_ACCESS]
                 )
             )
 
-    @wrap
-    def test_builtins(self):
-        with open(REWARD_FUNCTION_FILE) as source:
-            tree = ast.parse(source.read())
-        results = []
-        parse(tree, results)
-        for method in results:
-            if method in FORBID_ACCESS:
-                fail(
-                    "The reward function contains forbidden builtins: {}".format(
-                        [x for x in results if x in FORBID_ACCESS]
-                    )
-                )
-
-    @wrap
-    def test_forbidden_strings(self):
-        with open(REWARD_FUNCTION_FILE) as source:
-            tree = source.read()
-            for forbiddenString in FORBID_STRINGS:
-                if forbiddenString in tree:
-                    fail(
-                        'Your code snippet contains a restricted string "{}" that is not allowed. Please remove or replace the string and try again.'.format(
-                            forbiddenString
-                        )
-                    )
 
-
-_fa = {}
-_fa_counter = {}
+@wrap
+def check_forbidden_strings(context):
+    for forbiddenString in context.analysis.forbidden_strings:
+        fail(
+            'Your code snippet contains a restricted string "{}" that is not allowed. Please remove or replace the string and try again.'.format(
+                forbiddenString
+            )
+        )
 
 
-def get_function_name(forbidden):
-    def temp_func(*args, **kwargs):
-        global _fa_counter
-        global _fa
-        _fa_counter[forbidden] += 1
-        return _fa[forbidden](*args, **kwargs)
+@calls_reward_function
+@wrap
+def check_imports_within_module(context):
+    # Compiles and executes the reward function module for the request
+    rf = context.reward_function
+    valid_params = load_track(context).params("valid_params")
+    # Only the module's own builtins, see load_reward_function
+    builtins = context.module.__builtins__
+    _imp = builtins["__import__"]
+    builtins["__import__"] = _fail_import
+    try:
+        start = time.perf_counter()
+        rf(valid_params)
+        context.first_call_sec = time.perf_counter() - start
+    except Exception as e:
+        fail(f'Unsafe builtin function detected: "{e}".')
+    finally:
+        builtins["__import__"] = _imp
 
-    return temp_func
 
+def _scenario_reward(context, scenario):
+    # Each check passes a fresh copy of the params, so a reward function
+    # changing its params does not affect the other checks
+    params = load_track(context).params(scenario)
+    if context.cancelled.is_set():
+        raise CheckCancelled()
+    return context.reward_function(params)
 
-class TestUnsafeBuiltins(unittest.TestCase):
-    @wrap
-    def test_unsafe_builtins(self):
-        # read track name
-        with open(TRACK_NAME_PATH) as f:
-            track_name = f.readlines()
-        # get waypoints
-        waypoints_path = os.path.join(f"routes/{track_name[0]}.npy")
-        waypoints = list([])
-        try:
-            waypoints = np.load(waypoints_path)
-        except Exception:
-            raise DeepRacerError(TRACK_PARSE_ERROR)
-        valid_params, _, _, _, _ = get_params(waypoints)
-
-        global _fa_counter
-        global _fa
-        for forbidden, _ in FORBID_ACCESS.items():
-            _fa[forbidden] = __builtins__[forbidden]
-            _fa_counter[forbidden] = 0
-            __builtins__[forbidden] = get_function_name(forbidden)
-        import reward_function
-
-        # need to reload the reward_function for new requests
-        importlib.reload(reward_function)
-        rf = reward_function.reward_function
-        rf(valid_params)
-        for unforbidden, val in _fa.items():
-            __builtins__[unforbidden] = val
-        unsafe_builtins = []
-        for forbidden, count in FORBID_ACCESS.items():
-            if _fa_counter[forbidden] > count:
-                unsafe_builtins.append(f"{forbidden}, times: {_fa_counter[forbidden]}")
-        if len(unsafe_builtins) > 0:
-            fail(f'Unsafe builtin function detected: "{unsafe_builtins}".')
 
+def _reward_in_range(reward):
+    return isinstance(reward, float) and -1e5 <= reward <= 1e5
 
-class TestImportsWithinModule(unittest.TestCase):
-    @wrap
-    def test_imports_within_module(self):
-        # Import reward function
-        import reward_function
-
-        # need to reload the reward_function for new requests
-        importlib.reload(reward_function)
-
-        # read track name
-        with open(TRACK_NAME_PATH) as f:
-            track_name = f.readlines()
-        # get waypoints
-        waypoints_path = os.path.join(f"routes/{track_name[0]}.npy")
-        waypoints = list([])
-        try:
-            waypoints = np.load(waypoints_path)
-        except Exception:
-            raise DeepRacerError(TRACK_PARSE_ERROR)
-        rf = reward_function.reward_function
-        valid_params, _, _, _, _ = get_params(waypoints)
-        _imp = __builtins__["__import__"]
-        __builtins__["__import__"] = _fail_import
-        try:
-            rf(valid_params)
-        except Exception as e:
-            fail(f'Unsafe builtin function detected: "{e}".')
-        finally:
-            __builtins__["__import__"] = _imp
-
-
-def get_params(waypoints):
-    # get track width
-    track_width = math.sqrt(
-        (waypoints[0, 4] - waypoints[0, 2]) ** 2
-        + (waypoints[0, 5] - waypoints[0, 3]) ** 2
-    )
-    num_waypoints = waypoints.shape[0]
-
-    # calculate track length
-    track_length = 0
-    for i in range(1, waypoints.shape[0]):
-        track_length += math.sqrt(
-            (waypoints[i, 2] - waypoints[i - 1, 2]) ** 2
-            + (waypoints[i, 3] - waypoints[i - 1, 3]) ** 2
-        )
 
-    # set a valid input as a startline
-    valid_params = {
-        "all_wheels_on_track": True,
-        "x": (waypoints[0, 2] + waypoints[0, 0])
-        / 2,  # start line between inner lane and center lane
-        "y": (waypoints[0, 3] + waypoints[0, 1])
-        / 2,  # start line between inner lane and center lane
-        "distance_from_center": 0,
-        "heading": 0,
-        "progress": 0,
-        "steps": 1,
-        "speed": 0.5,
-        "steering_angle": 6,
-        "track_width": track_width,
-        "waypoints": waypoints[:, 2:4],  # only the center line
-        "closest_waypoints": [0, 1],
-        "is_left_of_center": True,
-        "is_reversed": True,
-        "track_length": track_length,
-        "closest_objects": [0, 1],  # random, doesn't matter
-        "objects_location": [
-            [4.511289152034186, 1.3292364463761641],
-            [6.537302737755836, 1.4140104486149618],
-            [4.752976532490525, 3.1350845729056838],
-            [3.103370840828792, 4.133062703357412],
-            [0.7094212601659824, 4.217507179944688],
-            [1.5996645329306798, 1.7124666440529925],
-        ],
-        "objects_left_of_center": [True, True, False, True, False, True],
-        "object_in_camera": True,
-        "objects_speed": [0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
-        "objects_heading": [
-            2.717322296283114,
-            2.368920328229894,
-            -1.9305073380382327,
-            -1.3586571052564007,
-            0.00025041038280975884,
-            0.5573269195381345,
-        ],
-        "objects_distance": [
-            1.9501724549506574,
-            4.139700164331426,
-            7.997164727523002,
-            10.024219705986598,
-            12.56561517097048,
-            15.090712948383509,
-        ],
-        "is_crashed": False,
-        "is_offtrack": False,
-    }
+@wrap
+def check_reward_function_signature(context):
+    load_track(context)
+    parameters = inspect.signature(context.reward_function).parameters
+    if len(parameters.keys()) != 1:
+        fail("Invalid reward function signature. Should be def reward_function(params)")
 
-    start_car = {
-        "all_wheels_on_track": True,
-        "x": waypoints[0, 2],  # start line
-        "y": waypoints[0, 3],  # start line
-        "distance_from_center": 0,
-        "heading": 0,
-        "progress": 0,
-        "steps": 1,
-        "speed": 0.1,
-        "steering_angle": 0.2,
-        "track_width": track_width,
-        "waypoints": waypoints[:, 2:4],  # only the center line
-        "closest_waypoints": [0, 1],  # doesn't matter
-        "is_left_of_center": True,
-        "is_reversed": True,
-        "track_length": track_length,
-        "closest_objects": [0, 1],
-        "objects_location": [
-            [4.511289152034186, 1.3292364463761641],
-            [6.537302737755836, 1.4140104486149618],
-            [4.752976532490525, 3.1350845729056838],
-            [3.103370840828792, 4.133062703357412],
-            [0.7094212601659824, 4.217507179944688],
-            [1.5996645329306798, 1.7124666440529925],
-        ],
-        "objects_left_of_center": [True, True, False, True, False, True],
-        "object_in_camera": True,
-        "objects_speed": [0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
-        "objects_heading": [
-            2.717322296283114,
-            2.368920328229894,
-            -1.9305073380382327,
-            -1.3586571052564007,
-            0.00025041038280975884,
-            0.5573269195381345,
-        ],
-        "objects_distance": [
-            1.9501724549506574,
-            4.139700164331426,
-            7.997164727523002,
-            10.024219705986598,
-            12.56561517097048,
-            15.090712948383509,
-        ],
-        "is_crashed": False,
-        "is_offtrack": False,
-    }
 
-    progress_car = {
-        "all_wheels_on_track": True,
-        "x": waypoints[math.floor(num_waypoints / 2), 2],  # middle waypoint
-        "y": waypoints[math.floor(num_waypoints / 2), 3],  # middle waypoint
-        "distance_from_center": 0,
-        "heading": 359.9,
-        "progress": 50,
-        "steps": 100,
-        "speed": 1.0,
-        "steering_angle": 6,
-        "track_width": track_width,
-        "waypoints": waypoints[:, 2:4],  # only the center line
-        "closest_waypoints": [3, 4],
-        "is_left_of_center": True,
-        "is_reversed": True,
-        "track_length": track_length,
-        "closest_objects": [0, 1],
-        "objects_location": [
-            [4.511289152034186, 1.3292364463761641],
-            [6.537302737755836, 1.4140104486149618],
-            [4.752976532490525, 3.1350845729056838],
-            [3.103370840828792, 4.133062703357412],
-            [0.7094212601659824, 4.217507179944688],
-            [1.5996645329306798, 1.7124666440529925],
-        ],
-        "objects_left_of_center": [True, True, False, True, False, True],
-        "object_in_camera": True,
-        "objects_speed": [0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
-        "objects_heading": [
-            2.717322296283114,
-            2.368920328229894,
-            -1.9305073380382327,
-            -1.3586571052564007,
-            0.00025041038280975884,
-            0.5573269195381345,
-        ],
-        "objects_distance": [
-            1.9501724549506574,
-            4.139700164331426,
-            7.997164727523002,
-            10.024219705986598,
-            12.56561517097048,
-            15.090712948383509,
-        ],
-        "is_crashed": False,
-        "is_offtrack": False,
-    }
-    # get offtrack coordinates by drawing the line from center to outer lane and making it double the track width.
-    dist = math.sqrt(
-        (waypoints[0, 4] - waypoints[0, 0]) ** 2
-        + (waypoints[0, 5] - waypoints[0, 1]) ** 2
-    )
-    slope_x = (waypoints[0, 4] - waypoints[0, 0]) / dist
-    slope_y = (waypoints[0, 5] - waypoints[0, 1]) / dist
-    offtrack_x = (
-        waypoints[0, 0] + slope_x * track_width
-    )  # distance from center is equal to track width
-    offtrack_y = (
-        waypoints[0, 1] + slope_y * track_width
-    )  # distance from center is equal to track width
-    off_track_car = {
-        "all_wheels_on_track": False,
-        "x": offtrack_x,
-        "y": offtrack_y,
-        "distance_from_center": track_width,
-        "heading": 359.9,
-        "progress": 0,
-        "steps": 1,
-        "speed": 1,
-        "steering_angle": 15,
-        "track_width": track_width,
-        "waypoints": waypoints[:, 2:4],  # only the center line
-        "closest_waypoints": [0, 1],
-        "is_left_of_center": True,
-        "is_reversed": True,
-        "track_length": track_length,
-        "closest_objects": [0, 1],
-        "objects_location": [
-            [4.511289152034186, 1.3292364463761641],
-            [6.537302737755836, 1.4140104486149618],
-            [4.752976532490525, 3.1350845729056838],
-            [3.103370840828792, 4.133062703357412],
-            [0.7094212601659824, 4.217507179944688],
-            [1.5996645329306798, 1.7124666440529925],
-        ],
-        "objects_left_of_center": [True, True, False, True, False, True],
-        "object_in_camera": True,
-        "objects_speed": [0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
-        "objects_heading": [
-            2.717322296283114,
-            2.368920328229894,
-            -1.9305073380382327,
-            -1.3586571052564007,
-            0.00025041038280975884,
-            0.5573269195381345,
-        ],
-        "objects_distance": [
-            1.9501724549506574,
-            4.139700164331426,
-            7.997164727523002,
-            10.024219705986598,
-            12.56561517097048,
-            15.090712948383509,
-        ],
-        "is_crashed": False,
-        "is_offtrack": True,
-    }
+@calls_reward_function
+@wrap
+def check_all_imported_modules(context):
+    _scenario_reward(context, "valid_params")
 
-    finish_car = {
-        "all_wheels_on_track": True,
-        "x": waypoints[num_waypoints - 1, 2],  # finish line
-        "y": waypoints[num_waypoints - 1, 3],  # finish line
-        "distance_from_center": 0,
-        "heading": 359.9,
-        "progress": 100,
-        "steps": 10000,
-        "speed": 5.0,
-        "steering_angle": 0,
-        "track_width": track_width,
-        "waypoints": waypoints[:, 2:4],  # only the center line
-        "closest_waypoints": [len(waypoints) - 2, len(waypoints) - 1],
-        "is_left_of_center": True,
-        "is_reversed": True,
-        "track_length": track_length,
-        "closest_objects": [0, 1],
-        "objects_location": [
-            [4.511289152034186, 1.3292364463761641],
-            [6.537302737755836, 1.4140104486149618],
-            [4.752976532490525, 3.1350845729056838],
-            [3.103370840828792, 4.133062703357412],
-            [0.7094212601659824, 4.217507179944688],
-            [1.5996645329306798, 1.7124666440529925],
-        ],
-        "objects_left_of_center": [True, True, False, True, False, True],
-        "object_in_camera": True,
-        "objects_speed": [0.2, 0.2, 0.2, 0.2, 0.2, 0.2],
-        "objects_heading": [
-            2.717322296283114,
-            2.368920328229894,
-            -1.9305073380382327,
-            -1.3586571052564007,
-            0.00025041038280975884,
-            0.5573269195381345,
-        ],
-        "objects_distance": [
-            1.9501724549506574,
-            4.139700164331426,
-            7.997164727523002,
-            10.024219705986598,
-            12.56561517097048,
-            15.090712948383509,
-        ],
-        "is_crashed": False,
-        "is_offtrack": False,
-    }
-    return valid_params, start_car, progress_car, off_track_car, finish_car
 
+@calls_reward_function
+@wrap
+def check_return_type(context):
+    reward = _scenario_reward(context, "valid_params")
+    if not isinstance(reward, float):
+        fail(f"Method returned non-floating type value: {reward}")
 
-class TestRewardFunction(unittest.TestCase):
-    @wrap
-    def setUp(self):
-        import reward_function
-
-        # need to reload the reward_function for new requests
-        importlib.reload(reward_function)
-
-        # read track name
-        with open(TRACK_NAME_PATH) as f:
-            self.track_name = f.readlines()
-        # get waypoints
-        waypoints_path = os.path.join(f"routes/{self.track_name[0]}.npy")
-        self.waypoints = list([])
-        try:
-            self.waypoints = np.load(waypoints_path)
-        except Exception:
-            raise DeepRacerError("InternalServerError: Unable to parse track information")
-        self.rf = reward_function.reward_function
-        (
-            self.valid_params,
-            self.start_car,
-            self.progress_car,
-            self.off_track_car,
-            self.finish_car,
-        ) = get_params(self.waypoints)
 
-    @wrap
-    def test_reward_function_signature(self):
-        parameters = inspect.signature(self.rf).parameters
-        if len(parameters.keys()) != 1:
-            fail(
-                "Invalid reward function signature. Should be def reward_function(params)"
+@calls_reward_function
+@wrap
+def check_reward_range(context):
+    reward = _scenario_reward(context, "valid_params")
+    if not _reward_in_range(reward):
+        fail(
+            "Reward score out of range. Reward: {}, range: {}".format(
+                reward, "[-1e5, 1e5]"
             )
+        )
 
-    @wrap
-    def test_all_imported_modules(self):
-        self.rf(self.valid_params)
 
-    @wrap
-    def test_return_type(self):
-        reward = self.rf(self.valid_params)
-        if not isinstance(reward, float):
-            fail(f"Method returned non-floating type value: {reward}")
+@calls_reward_function
+@wrap
+def check_start_car(context):
+    reward = _scenario_reward(context, "start_car")
+    if not _reward_in_range(reward):
+        fail(f"Vehicle failed at start position. Reward: {reward}")
 
-    @wrap
-    def test_reward_range(self):
-        reward = self.rf(self.valid_params)
-        if not self._reward_in_range(reward):
-            fail(
-                "Reward score out of range. Reward: {}, range: {}".format(
-                    reward, "[-1e5, 1e5]"
-                )
-            )
 
-    @staticmethod
-    def _reward_in_range(reward):
-        return isinstance(reward, float) and -1e5 <= reward <= 1e5
+@calls_reward_function
+@wrap
+def check_progress_car(context):
+    reward = _scenario_reward(context, "progress_car")
+    if not _reward_in_range(reward):
+        fail(f"Vehicle failed to make progress. Reward: {reward}")
 
-    @wrap
-    def test_start_car(self):
-        reward = self.rf(self.start_car)
-        if not self._reward_in_range(reward):
-            fail(f"Vehicle failed at start position. Reward: {reward}")
 
-    @wrap
-    def test_progress_car(self):
-        reward = self.rf(self.progress_car)
-        if not self._reward_in_range(reward):
-            fail(f"Vehicle failed to make progress. Reward: {reward}")
+@calls_reward_function
+@wrap
+def check_off_track_car(context):
+    reward = _scenario_reward(context, "off_track_car")
+    if not _reward_in_range(reward):
+        fail(f"Off-track vehicle failed to make progress. Reward: {reward}")
 
-    @wrap
-    def test_off_track_car(self):
-        reward = self.rf(self.off_track_car)
-        if not self._reward_in_range(reward):
-            fail(f"Off-track vehicle failed to make progress. Reward: {reward}")
 
-    @wrap
-    def test_finish_car(self):
-        reward = self.rf(self.finish_car)
-        if not self._reward_in_range(reward):
-            fail(f"Vehicle failed to make it to end of track. Reward: {reward}")
+@calls_reward_function
+@wrap
+def check_finish_car(context):
+    reward = _scenario_reward(context, "finish_car")
+    if not _reward_in_range(reward):
+        fail(f"Vehicle failed to make it to end of track. Reward: {reward}")
 
 
 def fail(msg=None):
     raise DeepRacerError(message=msg, type="TEST_FAILURE")
 
 
-class Analyzer(ast.NodeVisitor):
-    def __init__(self):
-        self.stats = set()
-
-    def visit_Import(self, node):
-        for alias in node.names:
-            # self.stats["import"].append(alias.name)
-            self.stats.add(alias.name)
-        self.generic_visit(node)
-
-    def visit_ImportFrom(self, node):
-        for alias in node.names:
-            self.stats.add(node.module)
-        self.generic_visit(node)
-
-    def report(self):
-        return self.stats
-
-
-def build_syntax_and_import_suite():
-    suite = unittest.TestSuite()
-    suite.addTest(TestSyntax("test_syntax"))
-    suite.addTest(TestIllegalImportsAndBuiltins("test_imports"))
-    suite.addTest(TestIllegalImportsAndBuiltins("test_builtins"))
-    suite.addTest(TestIllegalImportsAndBuiltins("test_forbidden_strings"))
-    return suite
-
-
-def build_unsafe_builtins_suite():
-    suite = unittest.TestSuite()
-    # This dynamic test raises false flags for builtins, is additional to the static tests
-    # which cover all scenarios. TODO: Investigate more of any better test cases to be added.
-    # suite.addTest(TestUnsafeBuiltins('test_unsafe_builtins'))
-    suite.addTest(TestImportsWithinModule("test_imports_within_module"))
-    return suite
-
-
-def build_runtime_suite():
-    suite = []
-    suite.append("test_reward_function_signature")
-    suite.append("test_all_imported_modules")
-    suite.append("test_return_type")
-    suite.append("test_reward_range")
-    suite.append("test_start_car")
-    suite.append("test_progress_car")
-    suite.append("test_off_track_car")
-    suite.append("test_finish_car")
-    return suite
-
-
-multiThreadTestResults = {}
-
-
-def run_suites(reward_function, track_name):
-    with open(REWARD_FUNCTION_PATH, "w") as f:
-        f.write(reward_function)
-    # save track name for reference by validator
-    with open(TRACK_NAME_PATH, "w") as f:
-        f.write(track_name)
-
-    logger.info("Reward function passed in arg: " + reward_function)
-    # Verify saved rf is same as rf passed in arg
-    with open(REWARD_FUNCTION_PATH) as f:
-        saved_rf = f.read()
-        output_list = [
-            li for li in difflib.ndiff(reward_function, saved_rf) if li[0] != " "
-        ]
-        logger.info("Reward function diff: " + ",".join(output_list))
-
-    suites = [build_syntax_and_import_suite(), build_unsafe_builtins_suite()]
-    for suite in suites:
-        test_results = unittest.TextTestRunner(failfast=True).run(suite)
-        if test_results.errors or test_results.failures:
-            return process_results(test_results)
-    # Run the following tests in parallel
+# Run in order by run_static_checks, up to the first failure. The three
+# analysis checks share a single parse of the source.
+STATIC_CHECKS = (
+    check_syntax,
+    check_imports,
+    check_builtins,
+    check_forbidden_strings,
+)
+# Execute the reward function module, before the scenario checks. Builtins
+# are checked statically by check_builtins, which covers every scenario.
+MODULE_CHECKS = (check_imports_within_module,)
+# Run in parallel threads, but for the cheap ones ahead of them (see
+# plan_checks). The first failure in this order is reported.
+RUNTIME_CHECKS = (
+    check_reward_function_signature,
+    check_all_imported_modules,
+    check_return_type,
+    check_reward_range,
+    check_start_car,
+    check_progress_car,
+    check_off_track_car,
+    check_finish_car,
+)
+
+
+def run_suites(reward_function, track_name, cache=None, metrics=None):
+    """Validate reward_function on track_name and return the list of errors.
+
+    If metrics is a dict, the latency measured by the runtime checks is
+    stored in it under "latency", which results served from the cache do
+    not have, and the duration of each stage and check under "timings".
+    The timings are also logged as CloudWatch metrics.
+    """
+    # Unknown tracks and oversized sources are rejected before any lint or
+    # runtime work is done
+    if track_name not in get_track_registry():
+        return _track_parse_error()
+    too_large = _source_too_large(reward_function)
+    if too_large:
+        return too_large
+
+    context = ValidationContext(reward_function, track_name)
+    _log_source(context)
     try:
-        threads = []
-        for suite in build_runtime_suite():
-            threads.append(Thread(target=threaded_test, args=(suite,)))
-        # Run the threads
-        for t in threads:
-            # Does not block main thread from exiting
-            t.setDaemon(True)
-            t.start()
-        # Wait for threads to finish
-        for t in threads:
-            # Only observe till timeout threshold
-            t.join(TIMEOUT_SEC)
-            # If thread is still alive throw timeout exception
-            if t.is_alive():
-                test_results = ThreadedTestException(errMsg=[["", "Timed Out"]])
-                break
-        global multiThreadTestResults
-        # Evaluate threaded tests results
-        for _, v in multiThreadTestResults.items():
-            if v.errors or v.failures:
-                test_results = v
-                break
-    except Exception as e:
-        raise DeepRacerError(f"InternalServerError: {str(e)}")
-    return process_results(test_results)
+        with context.timings.stage(TOTAL_TIMING):
+            results = _static_stage(context, cache) or _runtime_stage(context, cache)
+        if metrics is not None:
+            if context.latency is not None:
+                metrics["latency"] = context.latency
+            metrics["timings"] = context.timings.ms
+        emit_timings(context.timings.ms, {"track_name": track_name})
+        return results
+    finally:
+        context.close()
+
+
+def run_suites_on_tracks(
+    reward_function, track_names, cache=None, workers=None, metrics=None
+):
+    """Validate one reward function against several tracks.
+
+    track_names is a list of track names or "*" for every known track. The
+    track independent lint and static checks run once, and the runtime
+    checks for each track run in parallel worker processes. Returns a dict
+    mapping each requested track name to the result run_suites would give.
+    If metrics is given, metrics["latency"] maps track names to latency and
+    metrics["timings"] holds the timings of the shared stages, with those
+    of each track's runtime checks under "tracks".
+    """
+    registry = get_track_registry()
+    if track_names == ALL_TRACKS:
+        track_names = sorted(registry.names)
+    track_names = list(dict.fromkeys(track_names))
+    known = [name for name in track_names if name in registry]
+    results = {name: _track_parse_error() for name in track_names}
+    if not known:
+        return results
+    too_large = _source_too_large(reward_function)
+    if too_large:
+        for name in known:
+            results[name] = copy.deepcopy(too_large)
+        return results
+
+    context = ValidationContext(reward_function)
+    _log_source(context)
+    try:
+        start = time.perf_counter()
+        results = _batch_stages(context, known, results, cache, workers, metrics)
+        context.timings.record(TOTAL_TIMING, time.perf_counter() - start)
+        if metrics is not None:
+            metrics.setdefault("timings", {}).update(context.timings.ms)
+        emit_timings(context.timings.ms, {"track_names": known})
+        return results
+    finally:
+        context.close()
+
+
+def _batch_stages(context, known, results, cache, workers, metrics):
+    # The stages of run_suites_on_tracks, filling in results of known tracks
+    registry = get_track_registry()
+    static_results = _static_stage(context, cache)
+    if static_results:
+        for name in known:
+            results[name] = copy.deepcopy(static_results)
+        return results
+
+    with context.timings.stage(RUNTIME_STAGE):
+        pending = []
+        for name in known:
+            # Loaded before forking so the workers share the tracks
+            registry.get(name)
+            cached = _cached_runtime(context.for_track(name), cache)
+            if cached is None:
+                pending.append(name)
+            else:
+                results[name] = cached
+
+        runtime_results = map_in_processes(
+            lambda name: _runtime_checks_with_metrics(context.for_track(name)),
+            pending,
+            workers=workers,
+            timeout_per_item=TIMEOUT_SEC,
+            deadline=context.deadline.expires,
+        )
+    latency = {}
+    timings = {}
+    for name, result in zip(pending, runtime_results):
+        if isinstance(result, WorkerFailure):
+            result = worker_failure_results(result)
+        else:
+            result, track_metrics = result
+            latency[name] = track_metrics["latency"]
+            timings[name] = track_metrics["timings"]
+            track_context = context.for_track(name)
+            track_context.cut_short = track_metrics["cut_short"]
+            _store_runtime(track_context, cache, result)
+        results[name] = result
+    if metrics is not None:
+        if latency:
+            metrics["latency"] = latency
+        metrics["timings"] = {"tracks": timings}
+    return results
+
+
+def _runtime_checks_with_metrics(context):
+    # Runs in a worker process, so the metrics travel with the results
+    results = run_runtime_checks(context)
+    return results, _runtime_metrics(context)
+
+
+def _runtime_metrics(context):
+    # The latency summary, the timings of the checks, and the checks that
+    # ran out of budget, for the process that stores the results
+    return {
+        "latency": context.latency,
+        "timings": context.timings.ms,
+        "cut_short": context.cut_short,
+    }
 
 
-class ThreadedTestException:
-    def __init__(self, errMsg=""):
-        self.errors = errMsg
-        self.failures = []
+def _source_too_large(reward_function):
+    # Characters take at most 4 bytes, so most sources need no encoding
+    if len(reward_function) * 4 <= REWARD_FUNCTION_MAX_BYTES:
+        return []
+    size = len(reward_function.encode("utf-8", "surrogatepass"))
+    if size <= REWARD_FUNCTION_MAX_BYTES:
+        return []
+    message = (
+        f"{SOURCE_TOO_LARGE_MESSAGE}: {size} bytes,"
+        f" the limit is {REWARD_FUNCTION_MAX_BYTES} bytes"
+    )
+    return [DeepRacerError(message=message, type="TEST_FAILURE").error]
 
 
-def threaded_test(testName):
-    global multiThreadTestResults
-    test_results = unittest.TextTestRunner(failfast=True).run(
-        TestRewardFunction(testName)
+def _log_source(context):
+    # Bounded, with the digest identifying the exact source
+    logger.info(
+        "Reward function passed in arg: "
+        + source_summary(context.source, context.digest)
     )
-    multiThreadTestResults[testName] = test_results
 
 
-def process_results(test_results):
-    return list(
-        map(
-            lambda e: extract_failure_message(e[1]),
-            test_results.errors + test_results.failures,
+def _track_parse_error():
+    return [DeepRacerError(message=TRACK_PARSE_ERROR, type="TEST_FAILURE").error]
+
+
+def timed_out_results(stage=None):
+    """Result of a validation that ran out of time, naming the stage if known."""
+    extra = {"stage": stage} if stage else {}
+    error = DeepRacerError(message=TIMED_OUT_MESSAGE, type="TEST_FAILURE", **extra)
+    return [error.error]
+
+
+def worker_failure_results(failure, stage=RUNTIME_STAGE):
+    if failure.reason == WorkerFailure.TIMEOUT:
+        return timed_out_results(stage)
+    message = f"InternalServerError: {failure.message or 'Validation worker exited'}"
+    return [DeepRacerError(message=message, type="TEST_FAILURE").error]
+
+
+def _static_stage(context, cache):
+    # Lint and static checks do not depend on the track. Their output
+    # depends on formatting, comments (noqa) and line numbers, so they are
+    # keyed by the exact source.
+    if cache is None:
+        results = run_static_checks(context)
+    else:
+        static_key = f"static:{context.digest}"
+        results = cache.get(static_key)
+        if results is None:
+            results = run_static_checks(context)
+            if _is_cacheable(results):
+                cache.put(static_key, results)
+    if not results and context.deadline.expired():
+        return timed_out_results(STATIC_STAGE)
+    return results
+
+
+def _runtime_stage(context, cache):
+    results = _cached_runtime(context, cache)
+    if results is None:
+        results = run_runtime_checks(context)
+        _store_runtime(context, cache, results)
+    return results
+
+
+def _runtime_keys(context):
+    # Runtime results without line information are shared by all sources
+    # with the same syntax tree, e.g. after whitespace or comment edits.
+    keys = [f"runtime:{context.digest}:{context.track_name}"]
+    if context.analysis.normalized_digest:
+        keys.append(
+            f"runtime-ast:{context.analysis.normalized_digest}:{context.track_name}"
+        )
+    return keys
+
+
+def _cached_runtime(context, cache):
+    if cache is None:
+        return None
+    for key in _runtime_keys(context):
+        results = cache.get(key)
+        if results is not None:
+            return results
+    return None
+
+
+def _store_runtime(context, cache, results):
+    # A pass from checks that ran out of budget before their last call may
+    # not hold for the calls they skipped
+    if cache is None or context.cut_short or not _is_cacheable(results):
+        return
+    keys = _runtime_keys(context)
+    cache.put(keys[0] if _has_line_info(results) else keys[-1], results)
+
+
+def _is_cacheable(results):
+    # Timeouts and latency depend on load at the time of the request, not
+    # only on the source
+    return not any(
+        str(r.get("message", "")).startswith(
+            (TIMED_OUT_MESSAGE, LINT_TIMEOUT_MESSAGE, LATENCY_FAILURE_MESSAGE)
         )
+        for r in results
     )
 
 
-def extract_failure_message(txt):
-    line = txt.splitlines()[-1]
+def _has_line_info(results):
+    return any("line" in r or "lineNumber" in r for r in results)
+
+
+def run_static_checks(context):
+    """Run the lint and static analysis checks, which do not need the track."""
+    with context.timings.stage(STATIC_STAGE):
+        return run_checks(STATIC_CHECKS, context)
+
+
+def run_runtime_checks(context):
+    """Run the checks that execute the reward function on the track.
+
+    They run in a warm worker process from the pool when it is enabled,
+    which also keeps the reward function out of the validator process.
+    """
+    with context.timings.stage(RUNTIME_STAGE):
+        return _run_runtime_checks(context)
+
+
+def _run_runtime_checks(context):
+    pool = start_worker_pool()
+    if pool is None:
+        return run_runtime_checks_in_process(context)
+    budget = context.deadline.remaining()
+    if budget <= 0:
+        return timed_out_results(RUNTIME_STAGE)
+    # The worker keeps to the budget on its own. The pool kills it if it
+    # cannot, e.g. when module level code of the reward function never ends.
+    reply = pool.run(
+        (context.source, context.track_name, budget),
+        timeout=budget + DEADLINE_GRACE_SEC,
+    )
+    if isinstance(reply, WorkerFailure):
+        return worker_failure_results(reply)
+    results, metrics = reply
+    context.latency = metrics["latency"]
+    context.cut_short = metrics["cut_short"]
+    context.timings.update(metrics["timings"])
+    return results
+
+
+def start_worker_pool():
+    """Return the worker pool of the runtime checks, starting it if needed.
+
+    Returns None when the pool is disabled.
+    """
+    return get_worker_pool(_run_runtime_request)
+
+
+def _run_runtime_request(request):
+    # Runs in a pool worker, returns the results and their metrics
+    reward_function, track_name, budget = request
+    context = ValidationContext(reward_function, track_name, budget)
     try:
-        return json.loads(re.search("DeepRacerError: (.+)", line).group(1))
-    except Exception:
-        pass
-    return json.loads(str(DeepRacerError(message=line, type="TEST_FAILURE")))
+        results = run_runtime_checks_in_process(context)
+        return results, _runtime_metrics(context)
+    finally:
+        context.close()
+
+
+def run_runtime_checks_in_process(context):
+    """Run the runtime checks in this process, each check in its own thread."""
+    if context.deadline.expired():
+        return timed_out_results(RUNTIME_STAGE)
+    return (
+        run_checks(MODULE_CHECKS, context)
+        or _run_scenario_checks(context)
+        or run_latency_checks(context)
+        or run_fuzz_checks(context)
+    )
+
+
+def _run_scenario_checks(context):
+    inline, concurrent = plan_checks(RUNTIME_CHECKS)
+    errors = run_checks(inline, context)
+    if errors:
+        return errors
+    results = [None] * len(concurrent)
+
+    def run(i):
+        results[i] = run_check(concurrent[i], context)
+
+    threads = [Thread(target=run, args=(i,)) for i in range(len(concurrent))]
+    for t in threads:
+        # Does not block main thread from exiting
+        t.daemon = True
+        t.start()
+    # Wait for threads to finish, all against one deadline: the scenario
+    # budget calibrated from the first call, within the request budget
+    budget = scenario_budget(context.first_call_sec or 0.0) * len(RUNTIME_CHECKS)
+    wait_until = time.monotonic() + min(budget, context.deadline.remaining())
+    # The first failure in suite order is reported, so the result does not
+    # depend on which process ran the checks. Once it is known, the later
+    # checks are cancelled.
+    for i, t in enumerate(threads):
+        t.join(max(0.0, wait_until - time.monotonic()))
+        if t.is_alive():
+            # A later check that already failed is reported over the timeout
+            for result in results[i + 1 :]:
+                if result is not None and result.failed:
+                    return [result.error]
+            return timed_out_results(RUNTIME_STAGE)
+        if results[i].failed:
+            _cancel_checks(context, threads[i + 1 :], wait_until)
+            return [results[i].error]
+    return []
+
+
+def _cancel_checks(context, threads, wait_until):
+    # Checks that have not called the reward function yet skip the call.
+    # The calls in progress get a scenario budget to return, so a pool
+    # worker only counts threads that outlive it as runaway.
+    context.cancelled.set()
+    grace_until = min(
+        wait_until, time.monotonic() + scenario_budget(context.first_call_sec or 0.0)
+    )
+    for t in threads:
+        t.join(max(0.0, grace_until - time.monotonic()))
+
+
+def _runaway_after(context, budget):
+    # Checks that stop themselves after budget seconds may finish the call
+    # in progress, which may take as long as a scenario, plus some slack
+    # for threads left running by earlier requests
+    return budget + scenario_budget(context.first_call_sec or 0.0) + DEADLINE_GRACE_SEC
+
+
+def run_latency_checks(context):
+    """Time the reward function on the scenarios of the track.
+
+    Stores the summary in context.latency. Fails the validation when the
+    median call takes longer than LATENCY_FAIL_MS.
+    """
+    with context.timings.stage(LATENCY_TIMING):
+        return _run_latency_checks(context)
+
+
+def _run_latency_checks(context):
+    budget = min(LATENCY_BUDGET_SEC, context.deadline.remaining())
+    track = load_track(context)
+    report = LatencyReport()
+    thread = Thread(
+        target=measure,
+        args=(
+            context.reward_function,
+            lambda i: track.params(SCENARIO_NAMES[i % len(SCENARIO_NAMES)]),
+            budget,
+        ),
+        kwargs={"report": report},
+    )
+    thread.daemon = True
+    thread.start()
+    thread.join(_runaway_after(context, budget))
+    if thread.is_alive():
+        return timed_out_results(RUNTIME_STAGE)
+    if report.calls < LATENCY_CALLS:
+        context.cut_short.append(LATENCY_TIMING)
+    context.latency = report.summary(LATENCY_WARN_MS, LATENCY_FAIL_MS)
+    status = context.latency["status"]
+    if status == LATENCY_WARN:
+        logger.warning(
+            f"Slow reward function on {context.track_name}: {context.latency}"
+        )
+    if status != LATENCY_FAIL:
+        return []
+    message = (
+        f"{LATENCY_FAILURE_MESSAGE}: a call takes {context.latency['wall_ms']['p50']} ms"
+        f" (median), the limit is {context.latency['fail_ms']} ms"
+    )
+    error = DeepRacerError(
+        message=message, type="TEST_FAILURE", latency=context.latency
+    )
+    return [json.loads(str(error))]
+
+
+def run_fuzz_checks(context):
+    """Call the reward function with randomized params from the whole lap.
+
+    Runs once the fixed scenarios pass, until FUZZ_SAMPLES samples pass,
+    one fails, or the fuzz budget runs out. The error of a failing sample
+    carries its params and the distribution of the rewards seen before.
+    """
+    with context.timings.stage(FUZZ_TIMING):
+        return _run_fuzz_checks(context)
+
+
+def _run_fuzz_checks(context):
+    budget = min(FUZZ_BUDGET_SEC, context.deadline.remaining())
+    track = load_track(context)
+    rf = context.reward_function
+
+    @wrap
+    def check(params):
+        reward = rf(params)
+        if not _reward_in_range(reward):
+            fail(f"Reward score out of range. Reward: {reward}, range: [-1e5, 1e5]")
+        return reward
+
+    report = FuzzReport(FUZZ_SEED)
+    thread = Thread(target=fuzz, args=(check, track, budget), kwargs={"report": report})
+    thread.daemon = True
+    thread.start()
+    thread.join(_runaway_after(context, budget))
+    summary = report.summary()
+    logger.info(f"Fuzzed reward function on {context.track_name}: {summary}")
+    if thread.is_alive():
+        error = timed_out_results(RUNTIME_STAGE)[0]
+    elif report.failed:
+        error = report.error.error
+        error["message"] = f"{FUZZ_FAILURE_MESSAGE}: {error['message']}"
+    else:
+        if report.samples < FUZZ_SAMPLES:
+            context.cut_short.append(FUZZ_TIMING)
+        return []
+    error["params"] = report.failing_params()
+    error["fuzz"] = summary
+    return [error]
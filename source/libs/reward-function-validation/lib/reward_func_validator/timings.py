@@ -0,0 +1,76 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import json
+import sys
+import time
+
+from constants import METRICS_NAMESPACE
+
+# Names of the timings that are not a stage of deadline.py or a check
+IMPORT_TIMING = "import"
+LATENCY_TIMING = "latency"
+FUZZ_TIMING = "fuzz"
+TOTAL_TIMING = "total"
+
+
+class Timings:
+    """Durations of the stages and checks of one validation.
+
+    ms maps stage or check names to milliseconds. Checks running in other
+    processes record into their own Timings, merged back with update().
+    Timing uses time.perf_counter, so it is cheap enough to leave on.
+    """
+
+    def __init__(self):
+        self.ms = {}
+
+    def record(self, name, seconds):
+        self.ms[name] = round(seconds * 1000, 3)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Record the duration of the with block under name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def update(self, ms):
+        self.ms.update(ms)
+
+
+def metric_record(ms, properties=None, namespace=METRICS_NAMESPACE):
+    """Return ms as a CloudWatch embedded metric format record.
+
+    Each entry becomes a metric in milliseconds, without dimensions.
+    properties are logged alongside but not published as metrics.
+    """
+    record = dict(properties or {})
+    record["_aws"] = {
+        "Timestamp": int(time.time() * 1000),
+        "CloudWatchMetrics": [
+            {
+                "Namespace": namespace,
+                "Dimensions": [[]],
+                "Metrics": [{"Name": name, "Unit": "Milliseconds"} for name in ms],
+            }
+        ],
+    }
+    record.update(ms)
+    return record
+
+
+def emit_timings(ms, properties=None):
+    """Print ms as one embedded metric format log line.
+
+    CloudWatch extracts the metrics from log lines that are a JSON
+    document, so this writes to stdout rather than through logging, which
+    prefixes the level and request id. The line goes out in a single write,
+    so the lines of concurrent validations do not interleave.
+    """
+    if ms:
+        sys.stdout.write(json.dumps(metric_record(ms, properties)) + "\n")
+        sys.stdout.flush()
@@ -0,0 +1,167 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import functools
+import hashlib
+import os
+from types import MappingProxyType
+
+import numpy as np
+from bundle import TrackBundle
+from constants import PRELOAD_TRACKS_ENV, ROUTES_DIR, TRACK_BUNDLE
+from geometry import TrackGeometry
+from parallel import fork_safe_lock
+from scenarios import SCENARIO_NAMES, get_params
+from spatial import SegmentGrid
+
+
+class TrackNotFoundError(Exception):
+    pass
+
+
+def _copy_param(value):
+    # Nested lists (closest_waypoints, objects_location, ...) and the
+    # waypoints array are copied so a reward function mutating its params
+    # cannot change the shared scenario. The copied waypoints are writable,
+    # as they were before tracks were shared.
+    if isinstance(value, list):
+        return [_copy_param(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return np.array(value, copy=True)
+    return value
+
+
+class Track:
+    """Waypoints and memoized scenario parameters for a single track.
+
+    Everything held here is shared by all requests in the process, so the
+    waypoints are marked read-only and the scenarios are exposed through
+    read-only mappings. Use params() to get a copy that can be passed to a
+    reward function.
+    """
+
+    def __init__(self, name, waypoints):
+        waypoints.flags.writeable = False
+        self.name = name
+        self.waypoints = waypoints
+        self.geometry = TrackGeometry(waypoints)
+        # Cars placed up to a track width off the center line are located
+        # from their grid cell, for the fuzzed and replayed params
+        self.index = SegmentGrid(
+            self.geometry.center,
+            self.geometry.center_cumulative_length,
+            float(self.geometry.widths.max()),
+        )
+        scenarios = get_params(waypoints, self.geometry)
+        self.track_width = scenarios[0]["track_width"]
+        self.track_length = self.geometry.length
+        self.scenarios = MappingProxyType(
+            {
+                scenario_name: MappingProxyType(params)
+                for scenario_name, params in zip(SCENARIO_NAMES, scenarios)
+            }
+        )
+
+    def params(self, scenario_name):
+        """Return a mutable copy of the named scenario's params."""
+        return {
+            key: _copy_param(value)
+            for key, value in self.scenarios[scenario_name].items()
+        }
+
+
+class TrackRegistry:
+    """Index of the tracks in bundle, a TrackBundle, or else in routes_dir,
+    loading each track once on demand.
+    """
+
+    def __init__(self, routes_dir=ROUTES_DIR, bundle=None):
+        self.routes_dir = routes_dir
+        self.bundle = bundle
+        if bundle is not None:
+            self.names = bundle.names
+        else:
+            try:
+                files = os.listdir(routes_dir)
+            except OSError:
+                files = []
+            self.names = frozenset(
+                f[: -len(".npy")] for f in files if f.endswith(".npy")
+            )
+        self._tracks = {}
+        self._lock = fork_safe_lock()
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def get(self, name):
+        """Return the Track for name, raising TrackNotFoundError if unknown."""
+        track = self._tracks.get(name)
+        if track is not None:
+            return track
+        if name not in self.names:
+            raise TrackNotFoundError(name)
+        with self._lock:
+            track = self._tracks.get(name)
+            if track is None:
+                try:
+                    track = Track(name, self._load_waypoints(name))
+                except Exception as e:
+                    raise TrackNotFoundError(name) from e
+                self._tracks[name] = track
+        return track
+
+    @functools.cached_property
+    def digest(self):
+        """sha256 hex digest of the tracks in the index: the checksum of the
+        bundle, or else of the routes_dir files.
+        """
+        if self.bundle is not None:
+            return self.bundle.checksum
+        digest = hashlib.sha256()
+        for name in sorted(self.names):
+            with open(os.path.join(self.routes_dir, f"{name}.npy"), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+        return digest.hexdigest()
+
+    def _load_waypoints(self, name):
+        if self.bundle is not None:
+            return self.bundle.waypoints(name)
+        return np.load(os.path.join(self.routes_dir, f"{name}.npy"))
+
+    def preload(self):
+        """Load every track in the index."""
+        for name in sorted(self.names):
+            self.get(name)
+
+
+_registry = None
+_registry_lock = fork_safe_lock()
+
+
+def get_track_registry():
+    """Return the process-wide TrackRegistry, building it on first use.
+
+    Tracks come from the bundle at TRACK_BUNDLE when the image has one, and
+    from ROUTES_DIR otherwise. A bundle that fails its checksum raises.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                bundle = None
+                if os.path.exists(TRACK_BUNDLE):
+                    bundle = TrackBundle(TRACK_BUNDLE)
+                _registry = TrackRegistry(bundle=bundle)
+    return _registry
+
+
+def preload_tracks():
+    """Load every track of the process-wide registry, ahead of any request.
+
+    Does nothing when PRELOAD_TRACKS_ENV is set to 0, in which case each
+    track loads on the first request for it.
+    """
+    if os.environ.get(PRELOAD_TRACKS_ENV) == "0":
+        return
+    get_track_registry().preload()
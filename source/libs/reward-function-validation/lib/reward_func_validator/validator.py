@@ -8,30 +8,166 @@ sys.path.append(
     os.path.dirname(__file__)
 )  # append current directory so relative imports can work
 
+import copy
 import datetime
+import json
 import logging
-import os
+import time
 
-from constants import REWARD_FUNCTION_PATH, TRACK_NAME_PATH
-from test_reward_function import run_suites
+from cache import get_validation_cache
+from constants import ALL_TRACKS, BULK_ITEM_TIMEOUT_SEC, BULK_MAX_WORKERS
+from context import ValidationContext
+from lint import get_lint_engine
+from loader import preload_allowlisted_modules
+from parallel import WorkerFailure, map_in_processes
+from test_reward_function import (
+    run_runtime_checks_in_process,
+    run_static_checks,
+    run_suites,
+    run_suites_on_tracks,
+    start_worker_pool,
+    worker_failure_results,
+)
+from tracks import get_track_registry, preload_tracks
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Validated by initialize() to run every check once before the first request
+PRIMING_REWARD_FUNCTION = """def reward_function(params):
+    if params["all_wheels_on_track"] and params["speed"] > 1:
+        return 1.0
+    return 1e-3
+"""
+
+
+def get_validation_response(reward_function, track_name, metrics=None):
+    """Validate against one track, or a list of tracks / "*" in batch mode.
 
-def get_validation_response(reward_function, track_name):
+    A single track name returns the list of errors. Batch mode returns a
+    dict of such lists keyed by track name. Measurements such as latency
+    are added to metrics, if given.
+    """
     try:
         # set the Content-Type header so that the browser is aware that the response
         # is formatted as JSON and our frontend JavaScript code is able to
         # appropriately parse the response.
-        response = run_suites(reward_function, track_name)
+        if is_batch(track_name):
+            return run_suites_on_tracks(
+                reward_function, track_name, get_validation_cache(), metrics=metrics
+            )
+        response = run_suites(
+            reward_function, track_name, get_validation_cache(), metrics
+        )
         return response
     except Exception as e:
         return build_error_response(f"Exception occured during validation: {str(e)}")
-    finally:
-        # Making sure the temporary reward function and track name is deleted for next reqeust
-        silentremove(REWARD_FUNCTION_PATH)
-        silentremove(TRACK_NAME_PATH)
+
+
+def get_validation_responses(items, workers=BULK_MAX_WORKERS, budget=None):
+    """Validate a list of {"reward_function", "track_name"} items.
+
+    Returns one get_validation_response result per item, in input order.
+    Items run in up to workers forked processes that inherit the warm
+    state of this one, and identical items are validated only once. An
+    invalid, failing or runaway item only affects its own result. Given a
+    budget in seconds, items still running or not started once it is spent
+    time out.
+    """
+    deadline = None if budget is None else time.monotonic() + budget
+    results = [None] * len(items)
+    unique = {}
+    for index, item in enumerate(items):
+        error = _invalid_item(item)
+        if error:
+            results[index] = build_error_response(f"Invalid item: {error}")
+            continue
+        key = json.dumps([item["reward_function"], item["track_name"]])
+        unique.setdefault(key, (item, []))[1].append(index)
+
+    jobs = list(unique.values())
+    warm_up(name for item, _ in jobs for name in _as_list(item["track_name"]))
+    responses = map_in_processes(
+        lambda item: get_validation_response(
+            item["reward_function"], item["track_name"]
+        ),
+        [item for item, _ in jobs],
+        workers=workers,
+        timeout_per_item=BULK_ITEM_TIMEOUT_SEC,
+        deadline=deadline,
+    )
+    for (_, indexes), response in zip(jobs, responses):
+        if isinstance(response, WorkerFailure):
+            if response.reason == WorkerFailure.TIMEOUT:
+                # The whole item ran out of time, not any one stage of it
+                response = worker_failure_results(response, stage=None)
+            else:
+                response = build_error_response(
+                    f"Exception occured during validation: {response.message}"
+                )
+        for index in indexes:
+            results[index] = copy.deepcopy(response)
+    return results
+
+
+def warm_up(track_names=()):
+    """Load the state validations share, so forked workers inherit it."""
+    get_lint_engine()
+    registry = get_track_registry()
+    for name in track_names:
+        if name == ALL_TRACKS:
+            registry.preload()
+        elif name in registry:
+            registry.get(name)
+    preload_allowlisted_modules()
+
+
+def initialize():
+    """Prepare this process for requests, in the Lambda init phase.
+
+    Loads everything warm_up() does and every track (see preload_tracks),
+    then validates PRIMING_REWARD_FUNCTION in this process, so the parts of
+    the checks set up on first use (flake8 plugins, lazily imported numpy
+    modules) are ready as well. The worker pool starts last, so its workers
+    inherit all of it.
+    """
+    start = time.monotonic()
+    warm_up()
+    preload_tracks()
+    registry = get_track_registry()
+    if registry.names:
+        context = ValidationContext(PRIMING_REWARD_FUNCTION, min(registry.names))
+        try:
+            errors = run_static_checks(context) or run_runtime_checks_in_process(
+                context
+            )
+        finally:
+            context.close()
+        if errors:
+            logger.warning(f"Priming validation failed: {errors}")
+    start_worker_pool()
+    logger.info(f"Initialized in {(time.monotonic() - start) * 1000:.0f} ms")
+
+
+def _invalid_item(item):
+    if not isinstance(item, dict):
+        return "expected an object"
+    if not isinstance(item.get("reward_function"), str):
+        return "reward_function must be a string"
+    track_name = item.get("track_name")
+    if not isinstance(track_name, str) and not (
+        isinstance(track_name, list) and all(isinstance(n, str) for n in track_name)
+    ):
+        return "track_name must be a string or a list of strings"
+    return None
+
+
+def _as_list(track_name):
+    return track_name if isinstance(track_name, list) else [track_name]
+
+
+def is_batch(track_name):
+    return track_name == ALL_TRACKS or isinstance(track_name, list)
 
 
 def build_error_response(msg):
@@ -39,10 +175,3 @@ def build_error_response(msg):
     error["date"] = str(datetime.datetime.now(datetime.timezone.utc))
     error["message"] = msg
     return [error]
-
-
-def silentremove(filename):
-    try:
-        os.remove(filename)
-    except Exception as e:
-        logger.error(f"Exception occured during deletion: {str(e)}")
@@ -0,0 +1,202 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import test_reward_function
+from cache import ValidationCache
+from parallel import WorkerFailure, fork_safe_lock, map_in_processes
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from test_reward_function import (
+    TIMED_OUT_MESSAGE,
+    TRACK_PARSE_ERROR,
+    run_suites,
+    run_suites_on_tracks,
+)
+from tracks import get_track_registry
+from validator import get_validation_response
+
+TRACK_NAMES = ["reInvent2019_track_ccw", "Oval_track", "Bowtie_track"]
+LONG_TRACK_REWARD_FUNCTION = """def reward_function(params):
+    if params['track_length'] > 17:
+        return 1e6
+    return 1.0
+"""
+RUNAWAY_REWARD_FUNCTION = """def reward_function(params):
+    while True:
+        pass
+"""
+
+
+def _exit_on_two(item):
+    if item == 2:
+        os._exit(1)
+    return item
+
+
+def _raise_on_two(item):
+    if item == 2:
+        raise ValueError("bad item")
+    return item * 10
+
+
+class TestMapInProcesses(unittest.TestCase):
+    """Test cases for the forked worker fan out."""
+
+    def test_results_keep_input_order(self):
+        """Test that results line up with the items whatever worker ran them."""
+        self.assertEqual(
+            map_in_processes(lambda x: x * x, range(7), workers=3),
+            [x * x for x in range(7)],
+        )
+
+    def test_errors_are_isolated(self):
+        """Test that an exception only affects the item that raised it."""
+        results = map_in_processes(_raise_on_two, [1, 2, 3], workers=1)
+        self.assertEqual(results[0], 10)
+        self.assertEqual(results[2], 30)
+        self.assertIsInstance(results[1], WorkerFailure)
+        self.assertEqual(results[1].reason, WorkerFailure.ERROR)
+        self.assertIn("bad item", results[1].message)
+
+    def test_worker_exit(self):
+        """Test that a dead worker is reported and replaced."""
+        results = map_in_processes(_exit_on_two, [1, 2, 3], workers=1)
+        self.assertEqual(results[0], 1)
+        self.assertEqual(results[1].reason, WorkerFailure.EXITED)
+        self.assertEqual(results[2], 3)
+
+    def test_timeout_kills_worker(self):
+        """Test that a worker past an item deadline is killed and replaced."""
+        results = map_in_processes(
+            lambda x: x if x else __import__("time").sleep(60),
+            [1, 0, 2],
+            workers=1,
+            timeout_per_item=0.5,
+        )
+        self.assertEqual(results[0], 1)
+        self.assertEqual(results[1].reason, WorkerFailure.TIMEOUT)
+        self.assertEqual(results[2], 2)
+
+    def test_forked_from_one_thread(self):
+        """Test that workers fork from the forking thread, whatever thread
+        maps the items.
+        """
+        names = []
+
+        def fan_out():
+            names.extend(
+                map_in_processes(
+                    lambda _: threading.current_thread().name, range(2), workers=2
+                )
+            )
+
+        threads = [threading.Thread(target=fan_out) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(names), 6)
+        self.assertEqual({name.split("_")[0] for name in names}, {"fork"})
+
+    def test_fork_safe_locks_are_released(self):
+        """Test that a worker does not start with a fork safe lock held by
+        another thread.
+        """
+        lock = fork_safe_lock()
+        held = threading.Event()
+
+        def hold():
+            with lock:
+                held.set()
+                time.sleep(0.3)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        held.wait()
+        results = map_in_processes(lambda _: lock.acquire(timeout=1), [None])
+        holder.join()
+        self.assertEqual(results, [True])
+
+
+class TestRunSuitesOnTracks(unittest.TestCase):
+    """Test cases for validating one reward function against many tracks."""
+
+    def test_matches_run_suites(self):
+        """Test that each track gets the same result as a single validation."""
+        for reward_function in (BASIC_REWARD_FUNCTION, LONG_TRACK_REWARD_FUNCTION):
+            results = run_suites_on_tracks(reward_function, TRACK_NAMES, workers=2)
+            self.assertEqual(list(results), TRACK_NAMES)
+            for name in TRACK_NAMES:
+                self.assertEqual(results[name], run_suites(reward_function, name))
+        # Only the two longer tracks fail the reward range check
+        self.assertEqual([bool(r) for r in results.values()], [True, True, False])
+
+    def test_static_checks_run_once(self):
+        """Test that lint failures are reported per track from a single run."""
+        with mock.patch.object(
+            test_reward_function,
+            "run_static_checks",
+            wraps=test_reward_function.run_static_checks,
+        ) as static:
+            results = run_suites_on_tracks("import os\n", TRACK_NAMES)
+        self.assertEqual(static.call_count, 1)
+        expected = run_suites("import os\n", TRACK_NAMES[0])
+        self.assertEqual(expected[0]["type"], "F401")
+        for name in TRACK_NAMES:
+            self.assertEqual(results[name], expected)
+
+    def test_all_tracks(self):
+        """Test that "*" validates every known track."""
+        results = run_suites_on_tracks(BASIC_REWARD_FUNCTION, "*")
+        self.assertEqual(set(results), get_track_registry().names)
+        self.assertEqual(list(results.values()), [[]] * len(results))
+
+    def test_unknown_and_duplicate_tracks(self):
+        """Test that unknown tracks fail alone and duplicates are collapsed."""
+        names = [TRACK_NAMES[0], "not_a_track", TRACK_NAMES[0]]
+        results = run_suites_on_tracks(BASIC_REWARD_FUNCTION, names)
+        self.assertEqual(list(results), [TRACK_NAMES[0], "not_a_track"])
+        self.assertEqual(results[TRACK_NAMES[0]], [])
+        self.assertEqual(results["not_a_track"][0]["message"], TRACK_PARSE_ERROR)
+
+    def test_runaway_reward_function(self):
+        """Test that a reward function that never returns times out per track."""
+        with mock.patch.object(test_reward_function, "TIMEOUT_SEC", 0.2):
+            results = run_suites_on_tracks(RUNAWAY_REWARD_FUNCTION, TRACK_NAMES)
+        for name in TRACK_NAMES:
+            self.assertEqual(results[name][0]["message"], TIMED_OUT_MESSAGE)
+
+    def test_runtime_results_are_cached_per_track(self):
+        """Test that a second batch is served from the cache without workers."""
+        cache = ValidationCache()
+        first = run_suites_on_tracks(LONG_TRACK_REWARD_FUNCTION, TRACK_NAMES, cache)
+        with mock.patch.object(test_reward_function, "map_in_processes") as fan_out:
+            fan_out.return_value = []
+            second = run_suites_on_tracks(
+                LONG_TRACK_REWARD_FUNCTION, TRACK_NAMES, cache
+            )
+        fan_out.assert_called_once_with(
+            mock.ANY, [], workers=None, timeout_per_item=mock.ANY, deadline=mock.ANY
+        )
+        self.assertEqual(first, second)
+
+    def test_validation_response_batch_mode(self):
+        """Test that a list of tracks returns results keyed by track name."""
+        response = get_validation_response(BASIC_REWARD_FUNCTION, TRACK_NAMES[:2])
+        self.assertEqual(response, {TRACK_NAMES[0]: [], TRACK_NAMES[1]: []})
+        self.assertEqual(
+            get_validation_response(BASIC_REWARD_FUNCTION, TRACK_NAMES[0]), []
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import lambda_function
+import validator
+from constants import BULK_RESPONSE_MARGIN_SEC
+from lambda_function import lambda_handler
+from reward_function_fixtures import (
+    BASIC_REWARD_FUNCTION,
+    OBJECT_AVOIDANCE_REWARD_FUNCTION,
+)
+from test_reward_function import TIMED_OUT_MESSAGE
+from validator import get_validation_response, get_validation_responses
+
+TRACK_NAME = "reInvent2019_track_ccw"
+RUNAWAY_REWARD_FUNCTION = """def reward_function(params):
+    while True:
+        pass
+"""
+
+
+def item(reward_function, track_name=TRACK_NAME):
+    return {"reward_function": reward_function, "track_name": track_name}
+
+
+class TestGetValidationResponses(unittest.TestCase):
+    """Test cases for validating many reward functions in one call."""
+
+    def test_matches_single_item_calls_in_order(self):
+        """Test that each result is the single-item result, in input order."""
+        items = [
+            item(BASIC_REWARD_FUNCTION),
+            item("import os\n"),
+            item(OBJECT_AVOIDANCE_REWARD_FUNCTION, "Oval_track"),
+            item(BASIC_REWARD_FUNCTION, "not_a_track"),
+            item(BASIC_REWARD_FUNCTION, ["Oval_track", TRACK_NAME]),
+        ]
+        results = get_validation_responses(items, workers=2)
+        self.assertEqual(len(results), len(items))
+        for result, i in zip(results, items):
+            self.assertEqual(
+                result, get_validation_response(i["reward_function"], i["track_name"])
+            )
+
+    def test_invalid_items_are_isolated(self):
+        """Test that malformed items fail alone."""
+        results = get_validation_responses(
+            ["not an item", item(None), item(BASIC_REWARD_FUNCTION, 3), item("x = 1")]
+        )
+        for result in results[:3]:
+            self.assertTrue(result[0]["message"].startswith("Invalid item: "))
+        self.assertEqual(results[3], get_validation_response("x = 1", TRACK_NAME))
+
+    def test_identical_items_are_validated_once(self):
+        """Test that duplicates share one validation but not result objects."""
+        with mock.patch.object(
+            validator, "map_in_processes", wraps=validator.map_in_processes
+        ) as fan_out:
+            results = get_validation_responses([item("import os\n")] * 3)
+        self.assertEqual(len(fan_out.call_args.args[1]), 1)
+        self.assertEqual(results[0], results[2])
+        self.assertIsNot(results[0], results[2])
+
+    def test_runaway_and_crashing_items_are_isolated(self):
+        """Test that a hung or dying item does not affect the others."""
+
+        def exit_on_crash(reward_function, track_name):
+            if reward_function == "crash":
+                os._exit(1)
+            return get_validation_response(reward_function, track_name)
+
+        items = [
+            item(RUNAWAY_REWARD_FUNCTION),
+            item("crash"),
+            item(BASIC_REWARD_FUNCTION),
+        ]
+        with mock.patch.object(
+            validator, "BULK_ITEM_TIMEOUT_SEC", 1
+        ), mock.patch.object(validator, "get_validation_response", exit_on_crash):
+            results = get_validation_responses(items, workers=1)
+        self.assertEqual(results[0][0]["message"], TIMED_OUT_MESSAGE)
+        self.assertIn("Exception occured during validation", results[1][0]["message"])
+        self.assertEqual(results[2], [])
+
+    def test_budget(self):
+        """Test that items still running or queued when the budget is spent
+        time out.
+        """
+        items = [
+            item(BASIC_REWARD_FUNCTION),
+            item(RUNAWAY_REWARD_FUNCTION),
+            item(OBJECT_AVOIDANCE_REWARD_FUNCTION),
+        ]
+        start = time.monotonic()
+        results = get_validation_responses(items, workers=1, budget=2)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(results[0], [])
+        self.assertEqual(results[1][0]["message"], TIMED_OUT_MESSAGE)
+        self.assertEqual(results[2][0]["message"], TIMED_OUT_MESSAGE)
+
+    def test_lambda_handler_budget(self):
+        """Test that the handler keeps items within the Lambda timeout."""
+        context = mock.Mock()
+        context.get_remaining_time_in_millis.return_value = 60000
+        with mock.patch.object(
+            lambda_function, "get_validation_responses", return_value=[]
+        ) as get_responses:
+            lambda_handler({"items": []}, context)
+        self.assertEqual(
+            get_responses.call_args.kwargs["budget"], 60 - BULK_RESPONSE_MARGIN_SEC
+        )
+
+    def test_lambda_handler_items(self):
+        """Test that the handler returns a list of results for an items event."""
+        response = lambda_handler(
+            {"items": [item(BASIC_REWARD_FUNCTION), item("import os\n")]}, None
+        )
+        body = json.loads(response["body"])
+        self.assertEqual(body[0], [])
+        self.assertEqual(body[1][0]["type"], "F401")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import tracks
+from bundle import TrackBundle, TrackBundleError, main, write_bundle
+from tracks import TrackRegistry
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "..", "routes")
+TRACK_NAME = "reInvent2019_track_ccw"
+
+
+class TestTrackBundle(unittest.TestCase):
+    """Test cases for the memory-mapped track bundle."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, "tracks.bundle")
+        write_bundle(ROUTES_DIR, cls.path)
+        cls.bundle = TrackBundle(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def _corrupt(self, offset, value=b"\xff"):
+        path = os.path.join(self.directory, "corrupt.bundle")
+        shutil.copyfile(self.path, path)
+        with open(path, "r+b") as f:
+            f.seek(offset)
+            f.write(value)
+        return path
+
+    def test_round_trip(self):
+        """Test that every route is in the bundle with the same waypoints."""
+        names = {f[: -len(".npy")] for f in os.listdir(ROUTES_DIR)}
+        self.assertEqual(self.bundle.names, names)
+        for name in names:
+            np.testing.assert_array_equal(
+                self.bundle.waypoints(name),
+                np.load(os.path.join(ROUTES_DIR, f"{name}.npy")),
+            )
+
+    def test_views_are_read_only(self):
+        """Test that waypoints are aligned read-only views of the map."""
+        waypoints = self.bundle.waypoints(TRACK_NAME)
+        self.assertFalse(waypoints.flags.writeable)
+        self.assertTrue(waypoints.flags.aligned)
+        self.assertFalse(waypoints.flags.owndata)
+        with self.assertRaises(ValueError):
+            waypoints[0, 0] = 0
+
+    def test_registry_from_bundle(self):
+        """Test that tracks load from the bundle like from the routes."""
+        from_bundle = TrackRegistry("not_a_directory", self.bundle)
+        from_routes = TrackRegistry(ROUTES_DIR)
+        self.assertEqual(from_bundle.names, from_routes.names)
+        track = from_bundle.get(TRACK_NAME)
+        expected = from_routes.get(TRACK_NAME)
+        params = track.params("valid_params")
+        expected_params = expected.params("valid_params")
+        np.testing.assert_array_equal(
+            params.pop("waypoints"), expected_params.pop("waypoints")
+        )
+        self.assertEqual(params, expected_params)
+
+    def test_process_registry_prefers_bundle(self):
+        """Test that the process-wide registry maps the bundle if present."""
+        with mock.patch.object(tracks, "TRACK_BUNDLE", self.path), mock.patch.object(
+            tracks, "_registry", None
+        ):
+            registry = tracks.get_track_registry()
+        self.assertEqual(registry.bundle.path, self.path)
+        self.assertIn(TRACK_NAME, registry)
+
+    def test_checksum_mismatch(self):
+        """Test that a changed byte in the waypoints fails the checksum."""
+        path = self._corrupt(os.path.getsize(self.path) - 8)
+        with self.assertRaisesRegex(TrackBundleError, "checksum"):
+            TrackBundle(path)
+
+    def test_not_a_bundle(self):
+        """Test that other files are rejected before being read."""
+        with self.assertRaisesRegex(TrackBundleError, "not a version"):
+            TrackBundle(self._corrupt(0, b"NOTABUND"))
+        path = os.path.join(self.directory, "empty.bundle")
+        open(path, "wb").close()
+        with self.assertRaises(TrackBundleError):
+            TrackBundle(path)
+
+    def test_converter(self):
+        """Test that the converter writes the bundle and prints a summary."""
+        path = os.path.join(self.directory, "converted.bundle")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main([ROUTES_DIR, path]), 0)
+        self.assertIn(f"{len(self.bundle.names)} tracks", output.getvalue())
+        self.assertEqual(TrackBundle(path).metadata, self.bundle.metadata)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main([]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import cache
+import test_reward_function
+from cache import LRUCache, SQLiteCache, ValidationCache
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from test_reward_function import run_suites
+from tracks import TrackRegistry
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "..", "routes")
+TRACK_NAME = "reInvent2019_track_ccw"
+RAISING_REWARD_FUNCTION = """SCALE = 1 / 0
+
+
+def reward_function(params):
+    return float(params['speed'] * SCALE)
+"""
+
+
+class TestCacheTiers(unittest.TestCase):
+    """Test cases for the in-memory and on-disk cache tiers."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = LRUCache(max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_values_are_copies(self):
+        """Test that callers cannot modify cached results."""
+        cache = ValidationCache()
+        cache.put("k", [{"message": "m"}])
+        cache.get("k")[0]["message"] = "changed"
+        self.assertEqual(cache.get("k"), [{"message": "m"}])
+
+    def test_disk_tier_survives_new_cache(self):
+        """Test that the disk tier serves results to a new process-level cache."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            ValidationCache(disk=SQLiteCache(path)).put("k", [])
+            cache = ValidationCache(disk=SQLiteCache(path))
+            self.assertEqual(cache.get("k"), [])
+            self.assertEqual(len(cache.memory), 1)
+
+    def test_disk_tier_pruning(self):
+        """Test that the disk tier keeps at most max_entries rows."""
+        with tempfile.TemporaryDirectory() as tmp:
+            disk = SQLiteCache(os.path.join(tmp, "cache.sqlite"), max_entries=10)
+            disk.PRUNE_INTERVAL = 5
+            for i in range(20):
+                disk.put(str(i), "[]")
+            (count,) = disk._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+            self.assertEqual(count, 10)
+
+
+class TestCacheNamespace(unittest.TestCase):
+    """Test cases for the settings and tracks every cache key depends on."""
+
+    def test_budgets_change_the_namespace(self):
+        """Test that fuzz and latency settings are part of the namespace."""
+        namespace = ValidationCache().namespace
+        for name in ("FUZZ_SAMPLES", "FUZZ_BUDGET_SEC", "LATENCY_FAIL_MS"):
+            with mock.patch.object(cache, name, getattr(cache, name) * 2):
+                self.assertNotEqual(ValidationCache().namespace, namespace, name)
+
+    def test_tracks_change_the_namespace(self):
+        """Test that editing a track changes the digest of the tracks."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"{TRACK_NAME}.npy")
+            shutil.copy(os.path.join(ROUTES_DIR, f"{TRACK_NAME}.npy"), path)
+            digest = TrackRegistry(tmp).digest
+            self.assertEqual(TrackRegistry(tmp).digest, digest)
+            waypoints = np.load(path)
+            waypoints[0, 0] += 0.01
+            np.save(path, waypoints)
+            self.assertNotEqual(TrackRegistry(tmp).digest, digest)
+        self.assertNotEqual(cache._namespace("a"), cache._namespace("b"))
+
+
+class TestCachedSuites(unittest.TestCase):
+    """Test cases for stage caching in run_suites."""
+
+    def setUp(self):
+        self.cache = ValidationCache()
+
+    def _run(self, source):
+        return run_suites(source, TRACK_NAME, self.cache)
+
+    def test_repeat_submission_is_served_from_cache(self):
+        """Test that no check runs again for an identical submission."""
+        self.assertEqual(self._run(BASIC_REWARD_FUNCTION), [])
+        with mock.patch.object(
+            test_reward_function, "run_static_checks"
+        ) as static, mock.patch.object(
+            test_reward_function, "run_runtime_checks"
+        ) as runtime:
+            self.assertEqual(self._run(BASIC_REWARD_FUNCTION), [])
+        static.assert_not_called()
+        runtime.assert_not_called()
+
+    def test_comment_edit_shares_runtime_results(self):
+        """Test that a comment-only edit re-lints but reuses runtime results."""
+        self._run(BASIC_REWARD_FUNCTION)
+        edited = BASIC_REWARD_FUNCTION.replace("# Read input", "# Read the input")
+        with mock.patch.object(
+            test_reward_function,
+            "run_static_checks",
+            wraps=test_reward_function.run_static_checks,
+        ) as static, mock.patch.object(
+            test_reward_function, "run_runtime_checks"
+        ) as runtime:
+            self.assertEqual(self._run(edited), [])
+        static.assert_called_once()
+        runtime.assert_not_called()
+
+    def test_track_independent_results_are_shared(self):
+        """Test that static results are reused on another track."""
+        self._run(BASIC_REWARD_FUNCTION)
+        with mock.patch.object(test_reward_function, "run_static_checks") as static:
+            self.assertEqual(
+                run_suites(BASIC_REWARD_FUNCTION, "Austin", self.cache), []
+            )
+        static.assert_not_called()
+
+    def test_line_specific_failures_are_not_shared(self):
+        """Test that results with line numbers are only reused for the same source."""
+        first = self._run(RAISING_REWARD_FUNCTION)
+        self.assertEqual(first[0]["lineNumber"], 1)
+        shifted = "# leading comment\n" + RAISING_REWARD_FUNCTION
+        second = self._run(shifted)
+        self.assertEqual(second[0]["lineNumber"], 2)
+
+    def test_timeouts_are_not_cached(self):
+        """Test that timed out results are run again on the next request."""
+        timed_out = [{"message": "Timed Out", "type": "TEST_FAILURE"}]
+        with mock.patch.object(
+            test_reward_function, "run_runtime_checks", return_value=timed_out
+        ):
+            self.assertEqual(self._run(BASIC_REWARD_FUNCTION), timed_out)
+        self.assertEqual(self._run(BASIC_REWARD_FUNCTION), [])
+
+    def test_cut_short_passes_are_not_cached(self):
+        """Test that a pass from fuzzing that ran out of budget is run again."""
+        # In-process, so the patched budget applies
+        with mock.patch.object(
+            test_reward_function, "FUZZ_BUDGET_SEC", 0
+        ), mock.patch.object(
+            test_reward_function, "get_worker_pool", return_value=None
+        ):
+            self.assertEqual(self._run(BASIC_REWARD_FUNCTION), [])
+        with mock.patch.object(
+            test_reward_function, "run_runtime_checks", return_value=[]
+        ) as runtime:
+            self.assertEqual(self._run(BASIC_REWARD_FUNCTION), [])
+        runtime.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import deadline
+from checks import (
+    CheckCosts,
+    CheckResult,
+    DeepRacerError,
+    calls_reward_function,
+    plan_checks,
+    run_checks,
+)
+from context import ValidationContext
+from test_reward_function import (
+    MODULE_CHECKS,
+    RUNTIME_CHECKS,
+    STATIC_CHECKS,
+    TIMED_OUT_MESSAGE,
+    run_runtime_checks_in_process,
+)
+from timings import Timings
+
+TRACK_NAME = "reInvent2019_track_ccw"
+# Outlasts its budget in the off track scenario, fails in the finish
+# scenario which comes after it in suite order
+OFF_TRACK_SLOW_FINISH_FAILURE = """import time
+
+
+def reward_function(params):
+    if params['is_offtrack']:
+        end = time.perf_counter() + 1.0
+        while time.perf_counter() < end:
+            pass
+    if params['progress'] > 99:
+        return 1e9
+    return 1.0
+"""
+# Passes the import check, which calls it with one argument, but not the
+# signature check. Counts its calls.
+TWO_PARAMETER_REWARD_FUNCTION = """CALLS = []
+
+
+def reward_function(params, scale=1.0):
+    CALLS.append(params)
+    return scale
+"""
+
+
+class _Context:
+    def __init__(self):
+        self.timings = Timings()
+
+
+def _passing(context):
+    pass
+
+
+def _failing(context):
+    raise DeepRacerError(message="failed", type="TEST_FAILURE", lineNumber=3)
+
+
+def _exiting(context):
+    raise SystemExit(3)
+
+
+def _not_reached(context):
+    raise AssertionError("ran after a failure")
+
+
+class TestCheckRunner(unittest.TestCase):
+    """Test cases for running checks."""
+
+    def test_result_slots(self):
+        """Test that results have no instance dict."""
+        result = CheckResult("check", None, 0.1)
+        self.assertFalse(result.failed)
+        with self.assertRaises(AttributeError):
+            result.other = 1
+
+    def test_check_names(self):
+        """Test that every check is timed under a name of its own."""
+        names = [c.__name__ for c in STATIC_CHECKS + MODULE_CHECKS + RUNTIME_CHECKS]
+        self.assertEqual(len(set(names)), len(names))
+        self.assertTrue(all(name.startswith("check_") for name in names))
+
+    def test_stops_at_first_failure(self):
+        """Test that checks after a failure do not run, and the error is
+        the dict the check raised with.
+        """
+        context = _Context()
+        errors = run_checks((_passing, _failing, _not_reached), context)
+        self.assertEqual(
+            errors, [{"message": "failed", "type": "TEST_FAILURE", "lineNumber": 3}]
+        )
+        self.assertEqual(set(context.timings.ms), {"_passing", "_failing"})
+
+    def test_all_pass(self):
+        """Test that passing checks report no errors."""
+        self.assertEqual(run_checks((_passing, _passing), _Context()), [])
+
+    def test_unexpected_exception(self):
+        """Test that other exceptions report their last formatted line."""
+        errors = run_checks((_exiting,), _Context())
+        self.assertEqual(errors, [{"message": "SystemExit: 3", "type": "TEST_FAILURE"}])
+
+
+@calls_reward_function
+def _calling(context):
+    pass
+
+
+def _slow(context):
+    pass
+
+
+class TestCheckPlanner(unittest.TestCase):
+    """Test cases for planning checks by their typical cost."""
+
+    def test_moving_average(self):
+        """Test that typical costs follow the measured durations."""
+        costs = CheckCosts(smoothing=0.5)
+        self.assertEqual(costs.get("check"), 0.0)
+        costs.observe("check", 4.0)
+        self.assertEqual(costs.get("check"), 4.0)
+        costs.observe("check", 2.0)
+        self.assertEqual(costs.get("check"), 3.0)
+
+    def test_inline_prefix(self):
+        """Test that only leading cheap checks without calls run inline."""
+        costs = CheckCosts()
+        costs.observe("_slow", 50.0)
+        checks = (_passing, _failing, _calling, _passing)
+        self.assertEqual(
+            plan_checks(checks, costs), ((_passing, _failing), (_calling, _passing))
+        )
+        checks = (_passing, _slow, _passing)
+        self.assertEqual(plan_checks(checks, costs), ((_passing,), (_slow, _passing)))
+
+    def test_inline_failure_skips_scenarios(self):
+        """Test that a failing signature check stops the scenario calls."""
+        context = ValidationContext(TWO_PARAMETER_REWARD_FUNCTION, TRACK_NAME, 5)
+        try:
+            errors = run_runtime_checks_in_process(context)
+            calls = len(context.module.CALLS)
+        finally:
+            context.close()
+        self.assertEqual(
+            errors[0]["message"],
+            "Invalid reward function signature. Should be def reward_function(params)",
+        )
+        # Only the import check called it
+        self.assertEqual(calls, 1)
+
+
+class TestScenarioChecks(unittest.TestCase):
+    """Test cases for the scenario checks running in threads."""
+
+    def setUp(self):
+        patcher = mock.patch.object(deadline, "SCENARIO_MIN_BUDGET_SEC", 0.05)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_timeout(self):
+        """Test that a check still running at the deadline times out."""
+        context = ValidationContext(
+            OFF_TRACK_SLOW_FINISH_FAILURE.replace("1e9", "1.0"), TRACK_NAME, 5
+        )
+        try:
+            errors = run_runtime_checks_in_process(context)
+        finally:
+            context.close()
+        self.assertEqual(
+            errors,
+            [
+                {
+                    "message": TIMED_OUT_MESSAGE,
+                    "type": "TEST_FAILURE",
+                    "stage": "runtime",
+                }
+            ],
+        )
+
+    def test_failure_reported_over_timeout(self):
+        """Test that a later check that failed is reported over a timeout."""
+        context = ValidationContext(OFF_TRACK_SLOW_FINISH_FAILURE, TRACK_NAME, 5)
+        try:
+            errors = run_runtime_checks_in_process(context)
+        finally:
+            context.close()
+        self.assertEqual(len(errors), 1)
+        self.assertNotEqual(errors[0]["message"], TIMED_OUT_MESSAGE)
+        self.assertTrue(
+            errors[0]["message"].startswith("Vehicle failed to make it to end of track")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import builtins
+import contextlib
+import io
+import json
+import os
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import deadline
+import test_reward_function
+from context import ValidationContext
+from reward_function_fixtures import (
+    ADVANCED_REWARD_FUNCTION_PENALIZING_SPEED,
+    ADVANCED_REWARD_FUNCTION_PENALIZING_STEERING,
+    BASIC_REWARD_FUNCTION,
+    OBJECT_AVOIDANCE_REWARD_FUNCTION,
+)
+from test_reward_function import run_runtime_checks_in_process, run_suites
+
+TRACK_NAMES = ["reInvent2019_track_ccw", "Oval_track", "Bowtie_track"]
+REQUESTS = 64
+
+# Imports at module level, which a patched process-wide __import__ breaks
+MODULE_IMPORT_REWARD_FUNCTION = """import math
+
+
+def reward_function(params):
+    return float(math.floor(params['progress']) % 2 + 0.5)
+"""
+# Imports in a later scenario than the first call, which is allowed
+LATE_IMPORT_REWARD_FUNCTION = """def reward_function(params):
+    if params['is_offtrack']:
+        import math
+        return float(math.floor(1.5))
+    return 1.0
+"""
+# Keeps the import restriction of its first call on for a while
+SLOW_FIRST_CALL_REWARD_FUNCTION = """import math
+
+CALLS = []
+
+
+def reward_function(params):
+    if not CALLS:
+        total = 0.0
+        for i in range(200000):
+            total += math.sqrt(i)
+    CALLS.append(1)
+    return 1.0
+"""
+FIRST_CALL_IMPORT_REWARD_FUNCTION = """def reward_function(params):
+    import math
+    return float(math.floor(1.5))
+"""
+ILLEGAL_IMPORT_REWARD_FUNCTION = """import os
+
+
+def reward_function(params):
+    return float(len(os.sep))
+"""
+INT_REWARD_FUNCTION = """def reward_function(params):
+    return 1
+"""
+KEY_ERROR_REWARD_FUNCTION = """def reward_function(params):
+    return float(params['no_such_param'])
+"""
+OUT_OF_RANGE_REWARD_FUNCTION = """def reward_function(params):
+    if params['progress'] > 99:
+        return 1e9
+    return 1.0
+"""
+LINT_ERROR_REWARD_FUNCTION = """def reward_function(params):
+    return  1.0 ;
+"""
+SOURCES = [
+    BASIC_REWARD_FUNCTION,
+    ADVANCED_REWARD_FUNCTION_PENALIZING_SPEED,
+    ADVANCED_REWARD_FUNCTION_PENALIZING_STEERING,
+    OBJECT_AVOIDANCE_REWARD_FUNCTION,
+    MODULE_IMPORT_REWARD_FUNCTION,
+    LATE_IMPORT_REWARD_FUNCTION,
+    SLOW_FIRST_CALL_REWARD_FUNCTION,
+    FIRST_CALL_IMPORT_REWARD_FUNCTION,
+    ILLEGAL_IMPORT_REWARD_FUNCTION,
+    INT_REWARD_FUNCTION,
+    KEY_ERROR_REWARD_FUNCTION,
+    OUT_OF_RANGE_REWARD_FUNCTION,
+    LINT_ERROR_REWARD_FUNCTION,
+]
+# Sees which __import__ the rest of the process gets during its first call
+OBSERVING_REWARD_FUNCTION = """import builtins
+
+SEEN = []
+
+
+def reward_function(params):
+    SEEN.append(builtins.__import__)
+    return 1.0
+"""
+
+
+class TestImportRestriction(unittest.TestCase):
+    """Test cases for restricting imports to the reward function module."""
+
+    def test_process_builtins_untouched(self):
+        """Test that the first call leaves the process-wide __import__ alone."""
+        context = ValidationContext(OBSERVING_REWARD_FUNCTION, TRACK_NAMES[0])
+        try:
+            self.assertEqual(run_runtime_checks_in_process(context), [])
+            seen = context.module.SEEN
+        finally:
+            context.close()
+        self.assertTrue(all(f is builtins.__import__ for f in seen))
+
+    def test_module_import_restricted(self):
+        """Test that an import in the first call still fails."""
+        context = ValidationContext(FIRST_CALL_IMPORT_REWARD_FUNCTION, TRACK_NAMES[0])
+        try:
+            errors = run_runtime_checks_in_process(context)
+        finally:
+            context.close()
+        self.assertIn("Import should be put at the top of file", errors[0]["message"])
+
+
+class TestConcurrentValidations(unittest.TestCase):
+    """Stress test: concurrent validations in one process do not interfere."""
+
+    def setUp(self):
+        # Every validation runs its checks in this process, on one CPU in
+        # the worst case. Budgets are raised so that only interference, not
+        # contention for the CPU, could change a result.
+        for target, name, value in (
+            (test_reward_function, "get_worker_pool", mock.Mock(return_value=None)),
+            (deadline, "SCENARIO_MIN_BUDGET_SEC", 60),
+            (test_reward_function, "LATENCY_FAIL_MS", 10**6),
+        ):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _requests(self):
+        return [
+            (SOURCES[i % len(SOURCES)], TRACK_NAMES[i % len(TRACK_NAMES)])
+            for i in range(REQUESTS)
+        ]
+
+    def test_concurrent_mixed_requests(self):
+        """Test that 64 concurrent pass and fail validations each give the
+        result they give on their own.
+        """
+        requests = self._requests()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            expected = {r: run_suites(*r) for r in set(requests)}
+            with ThreadPoolExecutor(max_workers=REQUESTS) as executor:
+                results = list(executor.map(lambda r: run_suites(*r), requests))
+
+        for request, result in zip(requests, results):
+            self.assertEqual(result, expected[request], request)
+        passed = sum(result == [] for result in results)
+        self.assertGreater(passed, 0)
+        self.assertLess(passed, REQUESTS)
+        # One whole metric line per validation
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), len(expected) + REQUESTS)
+        for line in lines:
+            self.assertIn("_aws", json.loads(line))
+
+
+if __name__ == "__main__":
+    unittest.main()
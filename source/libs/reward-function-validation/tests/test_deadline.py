@@ -0,0 +1,123 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import deadline
+import test_reward_function
+from deadline import Deadline, scenario_budget
+from pool import WorkerPool
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from test_reward_function import TIMED_OUT_MESSAGE, run_suites
+
+TRACK_NAME = "reInvent2019_track_ccw"
+OFF_TRACK_RUNAWAY_REWARD_FUNCTION = """def reward_function(params):
+    while params['is_offtrack']:
+        pass
+    return 1.0
+"""
+SLOW_REWARD_FUNCTION = """import math
+
+
+def reward_function(params):
+    total = 0.0
+    for i in range(40000):
+        total += math.sqrt(i)
+    return 1.0
+"""
+
+
+class TestDeadline(unittest.TestCase):
+    """Test cases for the request deadline and scenario budgets."""
+
+    def test_remaining_and_expired(self):
+        """Test that the remaining time counts down to zero."""
+        self.assertFalse(Deadline(60).expired())
+        self.assertLessEqual(Deadline(60).remaining(), 60)
+        self.assertTrue(Deadline(0).expired())
+        self.assertEqual(Deadline(-1).remaining(), 0)
+
+    def test_default_budget(self):
+        """Test that the budget defaults to REQUEST_BUDGET_SEC."""
+        with mock.patch.object(deadline, "REQUEST_BUDGET_SEC", 7):
+            self.assertEqual(Deadline().budget, 7)
+
+    def test_scenario_budget_is_clamped(self):
+        """Test that scenario budgets scale with the first call within limits."""
+        self.assertEqual(scenario_budget(0.0), deadline.SCENARIO_MIN_BUDGET_SEC)
+        self.assertEqual(scenario_budget(0.1), 0.1 * deadline.SCENARIO_BUDGET_FACTOR)
+        self.assertEqual(scenario_budget(60), deadline.TIMEOUT_SEC)
+
+
+class TestStageTimeouts(unittest.TestCase):
+    """Test cases for the stage reported when a validation runs out of time."""
+
+    def _run(self, source, budget):
+        # A pool of its own, forked once the budgets are patched so that its
+        # worker uses them, and closed so that runaway threads end with it
+        with mock.patch.object(deadline, "REQUEST_BUDGET_SEC", budget):
+            pool = WorkerPool(test_reward_function._run_runtime_request, size=1)
+            try:
+                with mock.patch.object(
+                    test_reward_function, "get_worker_pool", return_value=pool
+                ):
+                    return run_suites(source, TRACK_NAME)
+            finally:
+                pool.close()
+
+    def test_lint_stage(self):
+        """Test that lint gets no more than the remaining budget."""
+        result = self._run(BASIC_REWARD_FUNCTION, 0)
+        self.assertTrue(result[0]["message"].startswith("Linting did not finish"))
+        self.assertEqual(result[0]["stage"], "lint")
+
+    def test_static_stage(self):
+        """Test that static checks finishing past the deadline are reported."""
+        original = test_reward_function.run_static_checks
+
+        def slow_static_checks(context):
+            results = original(context)
+            time.sleep(1.5)
+            return results
+
+        with mock.patch.object(
+            test_reward_function, "run_static_checks", slow_static_checks
+        ):
+            result = self._run(BASIC_REWARD_FUNCTION, 1)
+        self.assertEqual(
+            result,
+            [{"message": TIMED_OUT_MESSAGE, "type": "TEST_FAILURE", "stage": "static"}],
+        )
+
+    def test_runtime_stage_uses_remaining_budget(self):
+        """Test that a runaway scenario stops at the request deadline."""
+        with mock.patch.object(deadline, "SCENARIO_MIN_BUDGET_SEC", 5):
+            start = time.monotonic()
+            result = self._run(OFF_TRACK_RUNAWAY_REWARD_FUNCTION, 1)
+        self.assertLess(time.monotonic() - start, 2.5)
+        self.assertEqual(result[0]["message"], TIMED_OUT_MESSAGE)
+        self.assertEqual(result[0]["stage"], "runtime")
+
+    def test_runaway_scenario_uses_scenario_budget(self):
+        """Test that a runaway scenario of a fast function stops early."""
+        with mock.patch.object(deadline, "SCENARIO_MIN_BUDGET_SEC", 0.1):
+            start = time.monotonic()
+            result = self._run(OFF_TRACK_RUNAWAY_REWARD_FUNCTION, 20)
+        self.assertLess(time.monotonic() - start, 2.5)
+        self.assertEqual(result[0]["stage"], "runtime")
+
+    def test_slow_function_gets_a_larger_budget(self):
+        """Test that budgets are calibrated from the first reward call."""
+        with mock.patch.object(deadline, "SCENARIO_MIN_BUDGET_SEC", 0.001):
+            self.assertEqual(self._run(SLOW_REWARD_FUNCTION, 20), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,264 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import deadline
+import test_reward_function
+from constants import FUZZ_SEED
+from fuzz import MAX_OBJECTS, fuzz, generate_params
+from pool import WorkerPool
+from reward_function_fixtures import OBJECT_AVOIDANCE_REWARD_FUNCTION
+from test_reward_function import FUZZ_FAILURE_MESSAGE, TIMED_OUT_MESSAGE, run_suites
+from tracks import TrackRegistry
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "..", "routes")
+TRACK_NAME = "reInvent2019_track_ccw"
+# Passes the fixed scenarios, which all have the car left of center
+RIGHT_OF_CENTER_REWARD_FUNCTION = """def reward_function(params):
+    if not params['is_left_of_center'] and params['heading'] < -170:
+        return 1.0 / 0
+    return 1.0
+"""
+# Changes its params, and adds an array to them, before failing
+CHANGING_REWARD_FUNCTION = """import numpy as np
+
+
+def reward_function(params):
+    left = params['is_left_of_center']
+    params['is_left_of_center'] = True
+    params['heading'] = 0.0
+    params['position'] = np.array([params['x'], params['y']])
+    params['objects_location'][0][0] = None
+    if not left and params['steering_angle'] < -29:
+        return 1.0 / 0
+    return 1.0
+"""
+RIGHT_OF_CENTER_RUNAWAY_REWARD_FUNCTION = """def reward_function(params):
+    while not params['is_left_of_center'] and params['steering_angle'] < -29:
+        pass
+    return 1.0
+"""
+
+
+class TestGenerateParams(unittest.TestCase):
+    """Test cases for the randomized params of a track."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.track = TrackRegistry(ROUTES_DIR).get(TRACK_NAME)
+        cls.params = generate_params(cls.track, 2000, np.random.default_rng(0))
+
+    def _column(self, key):
+        return np.array([p[key] for p in self.params])
+
+    def test_same_keys_as_scenarios(self):
+        """Test that samples have the keys of the fixed scenarios."""
+        expected = self.track.scenarios["valid_params"].keys()
+        for params in self.params:
+            self.assertEqual(params.keys(), expected)
+
+    def test_seed_is_deterministic(self):
+        """Test that the same seed generates the same params."""
+        again = generate_params(self.track, 2000, np.random.default_rng(0))
+        self.assertEqual([p["x"] for p in again], [p["x"] for p in self.params])
+        self.assertEqual(
+            again[-1]["objects_location"], self.params[-1]["objects_location"]
+        )
+
+    def test_whole_lap_is_covered(self):
+        """Test that samples reach both ends of the waypoint list."""
+        last = len(self.track.waypoints) - 1
+        closest = np.array([p["closest_waypoints"] for p in self.params])
+        self.assertEqual(closest.min(), 0)
+        self.assertEqual(closest.max(), last)
+        self.assertTrue(np.all(np.abs(closest[:, 0] - closest[:, 1]) == 1))
+        progress = self._column("progress")
+        self.assertTrue(np.all((progress >= 0) & (progress <= 100)))
+        self.assertGreater(progress.max(), 95)
+        self.assertLess(progress.min(), 5)
+
+    def test_position_flags_are_consistent(self):
+        """Test that the on-track flags follow the distance from center."""
+        distance = self._column("distance_from_center")
+        half_width = self._column("track_width") / 2
+        offtrack = self._column("is_offtrack")
+        all_wheels = self._column("all_wheels_on_track")
+        self.assertTrue(np.all(offtrack == (distance > half_width + 0.1)))
+        self.assertFalse(np.any(all_wheels & offtrack))
+        self.assertFalse(np.any(self._column("is_crashed") & offtrack))
+        for key in ("is_offtrack", "is_reversed", "is_left_of_center"):
+            self.assertEqual(set(self._column(key).tolist()), {False, True}, key)
+
+    def test_distance_from_center_line(self):
+        """Test that distance_from_center is the distance of (x, y) to the
+        center line.
+        """
+        center = self.track.geometry.center
+        start, direction = center[:-1], np.diff(center, axis=0)
+        xy = np.stack([self._column("x"), self._column("y")], axis=1)
+        relative = xy[:, None, :] - start
+        t = np.clip(
+            np.sum(relative * direction, axis=2) / np.sum(direction**2, axis=1),
+            0,
+            1,
+        )
+        nearest = np.linalg.norm(relative - direction * t[..., None], axis=2).min(1)
+        np.testing.assert_allclose(
+            self._column("distance_from_center"), nearest, atol=1e-9
+        )
+
+    def test_reversed_cars_drive_the_other_way(self):
+        """Test that closest_waypoints are ordered in the driving direction."""
+        for params in self.params:
+            previous, following = params["closest_waypoints"]
+            self.assertEqual(following - previous, -1 if params["is_reversed"] else 1)
+
+    def test_objects_are_consistent(self):
+        """Test that object fields have one entry per object."""
+        counts = set()
+        for params in self.params:
+            count = len(params["objects_location"])
+            counts.add(count)
+            for key in (
+                "objects_left_of_center",
+                "objects_speed",
+                "objects_heading",
+                "objects_distance",
+            ):
+                self.assertEqual(len(params[key]), count)
+            self.assertTrue(all(0 <= i < count for i in params["closest_objects"]))
+        self.assertEqual(counts, set(range(1, MAX_OBJECTS + 1)))
+
+
+class TestFuzz(unittest.TestCase):
+    """Test cases for running a check over generated params."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.track = TrackRegistry(ROUTES_DIR).get(TRACK_NAME)
+
+    def test_summary(self):
+        """Test that all samples run and their rewards are summarized."""
+        report = fuzz(lambda params: params["speed"], self.track, 60, samples=500)
+        summary = report.summary()
+        self.assertFalse(report.failed)
+        self.assertEqual(summary["samples"], 500)
+        self.assertLessEqual(summary["min"], summary["median"])
+        self.assertLessEqual(summary["median"], summary["max"])
+        self.assertIsNone(report.failing_params())
+
+    def test_stops_at_first_failure(self):
+        """Test that the failing params are kept, without the waypoints."""
+
+        def check(params):
+            if params["is_offtrack"]:
+                raise ValueError("off track")
+            return 1.0
+
+        report = fuzz(check, self.track, 60, samples=500)
+        self.assertTrue(report.failed)
+        self.assertTrue(report.failing_params()["is_offtrack"])
+        self.assertNotIn("waypoints", report.failing_params())
+        self.assertEqual(report.summary()["samples"], len(report.rewards))
+
+    def test_failing_params_as_generated(self):
+        """Test that the failing params are those the check was called with,
+        not those it changed them to.
+        """
+        generated = []
+
+        def check(params):
+            generated.append(copy.deepcopy(params))
+            params["x"] = None
+            params["objects_location"].clear()
+            if params["is_offtrack"]:
+                raise ValueError("off track")
+            return 1.0
+
+        report = fuzz(check, self.track, 60, samples=500)
+        expected = {k: v for k, v in generated[-1].items() if k != "waypoints"}
+        self.assertEqual(report.failing_params(), expected)
+
+    def test_budget(self):
+        """Test that no samples run without a budget."""
+        report = fuzz(lambda params: 1.0, self.track, 0)
+        self.assertEqual(report.samples, 0)
+
+
+class TestFuzzChecks(unittest.TestCase):
+    """Test cases for fuzzing in the runtime checks."""
+
+    def test_passing_function(self):
+        """Test that a valid reward function passes fuzzing."""
+        self.assertEqual(run_suites(OBJECT_AVOIDANCE_REWARD_FUNCTION, TRACK_NAME), [])
+
+    def test_failure_reports_params(self):
+        """Test that a failure found by fuzzing reports the params."""
+        result = run_suites(RIGHT_OF_CENTER_REWARD_FUNCTION, TRACK_NAME)
+        self.assertEqual(len(result), 1)
+        error = result[0]
+        self.assertEqual(
+            error["message"], f"{FUZZ_FAILURE_MESSAGE}: float division by zero"
+        )
+        self.assertEqual(error["lineNumber"], 3)
+        self.assertFalse(error["params"]["is_left_of_center"])
+        self.assertLess(error["params"]["heading"], -170)
+        self.assertEqual(error["fuzz"]["seed"], FUZZ_SEED)
+        self.assertIn("median", error["fuzz"])
+        # Same seed, same failing sample
+        self.assertEqual(
+            run_suites(RIGHT_OF_CENTER_REWARD_FUNCTION, TRACK_NAME), result
+        )
+
+    def test_failure_reports_params_as_generated(self):
+        """Test that a failure reports the generated params, even if the
+        reward function changed them or added an array to them.
+        """
+        pool = WorkerPool(test_reward_function._run_runtime_request, size=1)
+        self.addCleanup(pool.close)
+        for worker_pool in (None, pool):
+            with mock.patch.object(
+                test_reward_function, "get_worker_pool", return_value=worker_pool
+            ):
+                result = run_suites(CHANGING_REWARD_FUNCTION, TRACK_NAME)
+            params = result[0]["params"]
+            self.assertFalse(params["is_left_of_center"])
+            self.assertNotEqual(params["heading"], 0.0)
+            self.assertNotIn("position", params)
+            self.assertIsNotNone(params["objects_location"][0][0])
+            json.dumps(result)
+
+    def test_runaway_on_generated_params(self):
+        """Test that a call that never returns times out with its params."""
+        with mock.patch.object(
+            deadline, "SCENARIO_MIN_BUDGET_SEC", 0.1
+        ), mock.patch.object(test_reward_function, "FUZZ_BUDGET_SEC", 0.5):
+            # Forked once the budgets are patched, and closed so that the
+            # runaway call ends with the worker
+            pool = WorkerPool(test_reward_function._run_runtime_request, size=1)
+            try:
+                with mock.patch.object(
+                    test_reward_function, "get_worker_pool", return_value=pool
+                ):
+                    result = run_suites(
+                        RIGHT_OF_CENTER_RUNAWAY_REWARD_FUNCTION, TRACK_NAME
+                    )
+            finally:
+                pool.close()
+        self.assertEqual(result[0]["message"], TIMED_OUT_MESSAGE)
+        self.assertLess(result[0]["params"]["steering_angle"], -29)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+from geometry import (
+    TrackGeometry,
+    cumulative_length,
+    headings,
+    outward_normals,
+    segment_lengths,
+    track_widths,
+)
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "..", "routes")
+
+
+def _square_track():
+    """Unit square center line with borders 0.5 either side."""
+    center = np.array([[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]], dtype=float)
+    inner = center * 0.5 + 0.25
+    outer = center * 2.0 - 0.5
+    return np.hstack((center, inner, outer))
+
+
+class TestGeometry(unittest.TestCase):
+    """Test cases for the vectorized track geometry helpers."""
+
+    def test_segment_and_cumulative_length(self):
+        """Test lengths along a unit square."""
+        points = _square_track()[:, 0:2]
+        np.testing.assert_array_equal(segment_lengths(points), [1, 1, 1, 1])
+        np.testing.assert_array_equal(cumulative_length(points), [0, 1, 2, 3, 4])
+
+    def test_headings(self):
+        """Test headings in degrees, with the last point reusing the last segment."""
+        points = _square_track()[:, 0:2]
+        np.testing.assert_allclose(headings(points), [0, 90, 180, -90, -90])
+
+    def test_widths_and_normals(self):
+        """Test per-waypoint widths and unit outward normals."""
+        waypoints = _square_track()
+        np.testing.assert_allclose(track_widths(waypoints), [math.sqrt(0.5) * 1.5] * 5)
+        normals = outward_normals(waypoints)
+        np.testing.assert_allclose(np.hypot(normals[:, 0], normals[:, 1]), 1.0)
+        np.testing.assert_allclose(normals[0], [-math.sqrt(0.5), -math.sqrt(0.5)])
+
+    def test_matches_scalar_loop_on_routes(self):
+        """Test that the track length equals the former scalar loop on every route."""
+        for name in sorted(os.listdir(ROUTES_DIR)):
+            waypoints = np.load(os.path.join(ROUTES_DIR, name))
+            expected = 0
+            for i in range(1, waypoints.shape[0]):
+                expected += math.sqrt(
+                    (waypoints[i, 2] - waypoints[i - 1, 2]) ** 2
+                    + (waypoints[i, 3] - waypoints[i - 1, 3]) ** 2
+                )
+            geometry = TrackGeometry(waypoints)
+            self.assertEqual(geometry.length, expected, name)
+            self.assertEqual(geometry.cumulative_length.shape, (waypoints.shape[0],))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import loader
+import test_reward_function
+import tracks
+import validator
+from constants import PRELOAD_MODULES_ENV, PRELOAD_TRACKS_ENV
+from tracks import TrackRegistry
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "..", "routes")
+TRACK_NAME = "reInvent2019_track_ccw"
+
+
+class TestInitialize(unittest.TestCase):
+    """Test cases for preparing the process in the Lambda init phase."""
+
+    def test_loads_shared_state(self):
+        """Test that every track loads and the priming validation passes."""
+        registry = TrackRegistry(ROUTES_DIR)
+        with mock.patch.object(tracks, "_registry", registry), mock.patch.object(
+            test_reward_function, "get_worker_pool", return_value=None
+        ) as get_worker_pool, self.assertNoLogs(level=logging.WARNING):
+            validator.initialize()
+        self.assertEqual(len(registry._tracks), len(registry.names))
+        get_worker_pool.assert_called_once()
+
+    def test_track_preload_can_be_disabled(self):
+        """Test that only the priming track loads when disabled."""
+        registry = TrackRegistry(ROUTES_DIR)
+        with mock.patch.dict(os.environ, {PRELOAD_TRACKS_ENV: "0"}), mock.patch.object(
+            tracks, "_registry", registry
+        ), mock.patch.object(
+            test_reward_function, "get_worker_pool", return_value=None
+        ):
+            validator.initialize()
+        self.assertEqual(list(registry._tracks), [min(registry.names)])
+
+    def test_priming_function_is_valid(self):
+        """Test that the priming reward function passes every check."""
+        self.assertEqual(
+            validator.run_suites(validator.PRIMING_REWARD_FUNCTION, TRACK_NAME), []
+        )
+
+    def test_preload_can_be_disabled(self):
+        """Test that allowlisted modules are not imported when disabled."""
+        with mock.patch.dict(os.environ, {PRELOAD_MODULES_ENV: "0"}), mock.patch.object(
+            loader.importlib, "import_module"
+        ) as import_module:
+            loader.preload_allowlisted_modules()
+        import_module.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
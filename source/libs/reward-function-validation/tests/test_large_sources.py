@@ -0,0 +1,117 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import io
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import test_reward_function
+from constants import LOG_EXCERPT_CHARS, LOG_MAX_ITEMS, REWARD_FUNCTION_MAX_BYTES
+from lambda_function import lambda_handler
+from log_format import event_summary, excerpt
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from test_reward_function import (
+    SOURCE_TOO_LARGE_MESSAGE,
+    TRACK_PARSE_ERROR,
+    run_suites,
+    run_suites_on_tracks,
+)
+
+TRACK_NAME = "reInvent2019_track_ccw"
+# A passing reward function padded with a comment to just over the limit
+LARGE_REWARD_FUNCTION = (
+    BASIC_REWARD_FUNCTION
+    + "#" * (REWARD_FUNCTION_MAX_BYTES - len(BASIC_REWARD_FUNCTION))
+    + "\n"
+)
+
+
+class TestSourceSizeLimit(unittest.TestCase):
+    """Test cases for rejecting oversized reward functions."""
+
+    def test_rejected_before_checks(self):
+        """Test that an oversized source is rejected without any check."""
+        with mock.patch.object(test_reward_function, "run_flake8") as run_flake8:
+            errors = run_suites(LARGE_REWARD_FUNCTION, TRACK_NAME)
+        run_flake8.assert_not_called()
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0]["message"].startswith(SOURCE_TOO_LARGE_MESSAGE))
+        self.assertIn(str(REWARD_FUNCTION_MAX_BYTES + 1), errors[0]["message"])
+
+    def test_limit_in_bytes(self):
+        """Test that the limit counts UTF-8 bytes rather than characters."""
+        source = BASIC_REWARD_FUNCTION + "# " + "é" * (REWARD_FUNCTION_MAX_BYTES // 2)
+        errors = run_suites(source, TRACK_NAME)
+        self.assertTrue(errors[0]["message"].startswith(SOURCE_TOO_LARGE_MESSAGE))
+
+    def test_unknown_track_first(self):
+        """Test that an unknown track is reported over the size."""
+        errors = run_suites(LARGE_REWARD_FUNCTION, "unknown_track")
+        self.assertEqual(errors[0]["message"], TRACK_PARSE_ERROR)
+
+    def test_batch(self):
+        """Test that every known track of a batch reports the size."""
+        results = run_suites_on_tracks(
+            LARGE_REWARD_FUNCTION, [TRACK_NAME, "Oval_track", "unknown_track"]
+        )
+        self.assertEqual(results[TRACK_NAME], results["Oval_track"])
+        self.assertTrue(
+            results[TRACK_NAME][0]["message"].startswith(SOURCE_TOO_LARGE_MESSAGE)
+        )
+        self.assertEqual(results["unknown_track"][0]["message"], TRACK_PARSE_ERROR)
+
+
+class TestBoundedLogs(unittest.TestCase):
+    """Test cases for the size of what a validation logs."""
+
+    def test_excerpt(self):
+        """Test that long text keeps its head and tail only."""
+        self.assertEqual(excerpt("short"), "short")
+        text = "a" * 100 + "b" * 1000 + "c" * 100
+        short = excerpt(text, 200)
+        self.assertTrue(short.startswith("a" * 100))
+        self.assertTrue(short.endswith("c" * 100))
+        self.assertIn("[... 1000 characters ...]", short)
+
+    def test_event_summary(self):
+        """Test that sources and bulk items are summarized."""
+        event = {
+            "items": [
+                {"reward_function": "x" * 10, "track_name": TRACK_NAME}
+                for _ in range(LOG_MAX_ITEMS + 5)
+            ]
+        }
+        summary = event_summary(event)
+        self.assertEqual(len(summary["items"]), LOG_MAX_ITEMS + 1)
+        self.assertEqual(
+            summary["items"][0],
+            {"reward_function": "<10 characters>", "track_name": TRACK_NAME},
+        )
+        self.assertEqual(summary["items"][-1], "<5 more items>")
+        self.assertEqual(event["items"][0]["reward_function"], "x" * 10)
+
+    def test_handler_logs(self):
+        """Test that a large request logs a bounded amount."""
+        source = BASIC_REWARD_FUNCTION + "\n# padding\n" * 5000
+        event = {"reward_function": source, "track_name": TRACK_NAME}
+        with mock.patch.object(
+            test_reward_function, "get_worker_pool", return_value=None
+        ), self.assertLogs(level="INFO") as logs, contextlib.redirect_stdout(
+            io.StringIO()
+        ):
+            response = lambda_handler(event, None)
+        self.assertEqual(json.loads(response["body"]), [])
+        logged = sum(len(line) for line in logs.output)
+        self.assertLess(logged, 2 * LOG_EXCERPT_CHARS + 2000)
+        self.assertTrue(any("sha256" in line for line in logs.output))
+
+
+if __name__ == "__main__":
+    unittest.main()
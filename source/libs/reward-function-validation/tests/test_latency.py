@@ -0,0 +1,120 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import test_reward_function
+import validator
+from cache import ValidationCache
+from latency import LATENCY_FAIL, LATENCY_OK, LATENCY_WARN, LatencyReport, measure
+from lambda_function import lambda_handler
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from test_reward_function import LATENCY_FAILURE_MESSAGE, run_suites
+
+TRACK_NAME = "reInvent2019_track_ccw"
+# Loops over all waypoint pairs on every call
+QUADRATIC_REWARD_FUNCTION = """import math
+
+
+def reward_function(params):
+    total = 0.0
+    for x, y in params['waypoints']:
+        for a, b in params['waypoints']:
+            total += math.hypot(x - a, y - b)
+    return 1.0
+"""
+
+
+def _report(wall_ms):
+    report = LatencyReport()
+    report.wall_ns = [int(ms * 1e6) for ms in wall_ms]
+    report.cpu_ns = list(report.wall_ns)
+    return report
+
+
+class TestLatencyReport(unittest.TestCase):
+    """Test cases for the latency summary and budget."""
+
+    def test_summary(self):
+        """Test that percentiles and max are reported in milliseconds."""
+        summary = _report([1] * 99 + [20]).summary(warn_ms=10, fail_ms=50)
+        self.assertEqual(summary["calls"], 100)
+        self.assertEqual(summary["wall_ms"]["p50"], 1)
+        self.assertEqual(summary["wall_ms"]["max"], 20)
+        self.assertEqual(summary["cpu_ms"], summary["wall_ms"])
+
+    def test_status(self):
+        """Test that a slow tail warns and a slow median fails."""
+        self.assertEqual(_report([1] * 100).status(10, 50), LATENCY_OK)
+        self.assertEqual(_report([1] * 90 + [20] * 10).status(10, 50), LATENCY_WARN)
+        self.assertEqual(_report([60] * 100).status(10, 50), LATENCY_FAIL)
+        self.assertEqual(LatencyReport().status(10, 50), LATENCY_OK)
+
+    def test_measure(self):
+        """Test that warm-up calls are not timed and params are fresh."""
+        seen = []
+        report = measure(seen.append, lambda i: {"i": i}, 60, calls=30, warmup=5)
+        self.assertEqual(report.calls, 30)
+        self.assertEqual(seen, [{"i": i} for i in range(35)])
+        self.assertEqual(measure(seen.append, dict, 0).calls, 0)
+
+    def test_slow_warm_up(self):
+        """Test that calls too slow to finish the warm-up are timed and fail."""
+        report = measure(lambda params: time.sleep(0.06), lambda i: {}, 0.5, warmup=20)
+        self.assertGreater(report.calls, 0)
+        self.assertGreater(min(report.wall_ns), 0.06e9)
+        self.assertEqual(report.status(10, 50), LATENCY_FAIL)
+
+
+class TestLatencyChecks(unittest.TestCase):
+    """Test cases for latency measurement in the runtime checks."""
+
+    def test_metrics(self):
+        """Test that a validation reports the latency of the reward function."""
+        metrics = {}
+        self.assertEqual(
+            run_suites(BASIC_REWARD_FUNCTION, TRACK_NAME, None, metrics), []
+        )
+        latency = metrics["latency"]
+        self.assertEqual(latency["calls"], 300)
+        self.assertEqual(latency["status"], LATENCY_OK)
+        self.assertLessEqual(latency["cpu_ms"]["p50"], latency["cpu_ms"]["max"])
+
+    def test_slow_function_fails(self):
+        """Test that a median call over the limit fails and is not cached."""
+        cache = ValidationCache()
+        with mock.patch.object(
+            test_reward_function, "LATENCY_FAIL_MS", 0.5
+        ), mock.patch.object(
+            test_reward_function, "get_worker_pool", return_value=None
+        ):
+            result = run_suites(QUADRATIC_REWARD_FUNCTION, TRACK_NAME, cache)
+            self.assertTrue(result[0]["message"].startswith(LATENCY_FAILURE_MESSAGE))
+            self.assertEqual(result[0]["latency"]["status"], LATENCY_FAIL)
+            self.assertGreater(result[0]["latency"]["wall_ms"]["p50"], 0.5)
+        self.assertEqual(run_suites(QUADRATIC_REWARD_FUNCTION, TRACK_NAME, cache), [])
+
+    def test_lambda_response(self):
+        """Test that the Lambda response carries the metrics next to the body."""
+        # A fresh cache, so the runtime checks run and measure latency
+        with mock.patch.object(
+            validator, "get_validation_cache", return_value=ValidationCache()
+        ):
+            response = lambda_handler(
+                {"reward_function": BASIC_REWARD_FUNCTION, "track_name": TRACK_NAME},
+                None,
+            )
+        self.assertEqual(json.loads(response["body"]), [])
+        self.assertEqual(response["metrics"]["latency"]["status"], LATENCY_OK)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+from flake8 import checker
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+from lint import LintEngine, LintTimeoutError, get_lint_engine
+from test_reward_function import DeepRacerError, run_flake8
+
+
+class TestLintEngine(unittest.TestCase):
+    """Test cases for the in-process flake8 lint engine."""
+
+    def test_engine_is_shared(self):
+        """Test that the engine is built once per process."""
+        self.assertIs(get_lint_engine(), get_lint_engine())
+
+    def test_lint_returns_code_row_text(self):
+        """Test that violations come back as (code, row, text) tuples."""
+        violations = get_lint_engine().lint("import os\n")
+        self.assertEqual(violations, [("F401", 1, "'os' imported but unused")])
+
+    def test_select_and_ignore_options(self):
+        """Test that W codes and the ignored E codes are not reported."""
+        code = "x = 1+2  # comment\ny = '" + "a" * 100 + "'  \n"
+        self.assertEqual(get_lint_engine().lint(code), [])
+
+    def test_noqa_is_honoured(self):
+        """Test that inline noqa comments suppress violations."""
+        self.assertEqual(get_lint_engine().lint("import os  # noqa\n"), [])
+
+    def test_syntax_error_reports_exception_name(self):
+        """Test that syntax errors keep the exception name as the type."""
+        result = run_flake8("def reward_function(params)\n    return 1.0\n")
+        self.assertEqual(result[0]["type"], "SyntaxError")
+        self.assertEqual(result[0]["lineNumber"], "1")
+        self.assertEqual(result[0]["line"], "def reward_function(params)")
+
+    def test_crlf_line_endings(self):
+        """Test that CRLF sources report the same lines as LF sources."""
+        result = run_flake8(
+            "import os\r\ndef reward_function(params):\r\n    return 1.0\r\n"
+        )
+        self.assertEqual(result[0]["line"], "import os")
+
+    def test_timeout(self):
+        """Test that linting stops once the time limit is exceeded."""
+        with self.assertRaises(LintTimeoutError):
+            LintEngine().lint("x = 1\n" * 100, timeout=-1)
+
+    def test_timeout_is_best_effort(self):
+        """Test that a plugin call running past the timeout is not interrupted,
+        and that no plugin is called after it.
+        """
+        calls = []
+        original = checker.FileChecker.run_check
+
+        def slow_run_check(file_checker, plugin, **arguments):
+            calls.append(plugin)
+            if len(calls) == 1:
+                time.sleep(0.2)
+            return original(file_checker, plugin, **arguments)
+
+        with mock.patch.object(checker.FileChecker, "run_check", slow_run_check):
+            with self.assertRaises(LintTimeoutError):
+                LintEngine().lint("x = 1\n", timeout=0.1)
+        self.assertEqual(len(calls), 1)
+
+    def test_timeout_surfaces_as_deepracer_error(self):
+        """Test that run_flake8 reports a timeout as a DeepRacerError."""
+        engine = get_lint_engine()
+        original = engine.lint
+        engine.lint = lambda source, timeout: original(source, timeout=-1)
+        try:
+            with self.assertRaises(DeepRacerError) as cm:
+                run_flake8("x = 1\n")
+        finally:
+            del engine.lint
+        self.assertIn("Linting did not finish", str(cm.exception))
+        self.assertIn('"stage": "lint"', str(cm.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import linecache
+import os
+import sys
+import traceback
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import loader
+from context import ValidationContext
+from test_reward_function import DeepRacerError, wrap
+
+FAILING_REWARD_FUNCTION = """import math
+
+
+def reward_function(params):
+    return float(math.sqrt(params['speed']))
+"""
+
+
+class TestLoader(unittest.TestCase):
+    """Test cases for loading reward functions from source in memory."""
+
+    def setUp(self):
+        self.filename = loader.source_filename()
+
+    def tearDown(self):
+        loader.unload_reward_function(self.filename)
+
+    def test_filename_is_unique(self):
+        """Test that every load gets its own filename ending in reward_function.py."""
+        other = loader.source_filename()
+        self.assertNotEqual(self.filename, other)
+        self.assertTrue(other.endswith(loader.REWARD_FUNCTION_FILENAME))
+
+    def test_fresh_namespace(self):
+        """Test that loads do not share module state."""
+        first = loader.load_reward_function("x = 1\n", self.filename)
+        second = loader.load_reward_function("y = 2\n", self.filename)
+        self.assertEqual(first.x, 1)
+        self.assertFalse(hasattr(second, "x"))
+        self.assertEqual(second.__name__, "reward_function")
+
+    def test_traceback_reports_source_line(self):
+        """Test that tracebacks point at the submitted source."""
+        module = loader.load_reward_function(FAILING_REWARD_FUNCTION, self.filename)
+        try:
+            module.reward_function({"speed": -1})
+        except ValueError:
+            frame = traceback.extract_tb(sys.exc_info()[2])[-1]
+        self.assertEqual(frame.filename, self.filename)
+        self.assertEqual(frame.lineno, 5)
+        self.assertEqual(frame.line, "return float(math.sqrt(params['speed']))")
+
+    def test_wrap_reports_line_number(self):
+        """Test that wrap still reports the line number of the failure."""
+        module = loader.load_reward_function(FAILING_REWARD_FUNCTION, self.filename)
+        with self.assertRaises(DeepRacerError) as cm:
+            wrap(module.reward_function)({"speed": -1})
+        self.assertEqual(cm.exception._dict["lineNumber"], 5)
+        self.assertEqual(cm.exception._dict["message"], "math domain error")
+
+    def test_syntax_error_line_number(self):
+        """Test that syntax errors carry the filename and line of the source."""
+        with self.assertRaises(SyntaxError) as cm:
+            loader.load_reward_function("x = 1\ndef f(:\n", self.filename)
+        self.assertEqual(cm.exception.filename, self.filename)
+        self.assertEqual(cm.exception.lineno, 2)
+
+    def test_unload_clears_linecache(self):
+        """Test that unloading drops the source from linecache."""
+        loader.load_reward_function("x = 1\n", self.filename)
+        self.assertIn(self.filename, linecache.cache)
+        loader.unload_reward_function(self.filename)
+        self.assertNotIn(self.filename, linecache.cache)
+
+
+class TestValidationContext(unittest.TestCase):
+    """Test cases for the per-request validation context."""
+
+    def test_module_is_compiled_once(self):
+        """Test that all checks share one compiled reward function."""
+        context = ValidationContext(FAILING_REWARD_FUNCTION, "reInvent2019_track_ccw")
+        with mock.patch(
+            "context.load_reward_function", wraps=loader.load_reward_function
+        ) as load:
+            self.assertIs(context.reward_function, context.reward_function)
+        self.assertEqual(load.call_count, 1)
+        context.close()
+        self.assertNotIn(context.filename, linecache.cache)
+
+    def test_for_track_shares_source_state(self):
+        """Test that per-track views share the analysis and loaded module."""
+        context = ValidationContext(FAILING_REWARD_FUNCTION)
+        view = context.for_track("reInvent2019_track_ccw")
+        self.assertIsNone(context.track_name)
+        self.assertEqual(view.track.name, "reInvent2019_track_ccw")
+        self.assertIs(view.analysis, context.analysis)
+        self.assertIs(view.module, context.module)
+        self.assertEqual(context.for_track("Oval_track").track.name, "Oval_track")
+        context.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
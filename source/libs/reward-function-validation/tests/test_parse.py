@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import ast
+import inspect
 import os
 import sys
 import unittest
@@ -9,7 +10,12 @@ import unittest
 sys.path.append(
     os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
 )
-from test_reward_function import parse
+from test_reward_function import check_builtins, parse, run_suites
+
+TRACK_NAME = "reInvent2019_track_ccw"
+CHAINED_CALL_REWARD_FUNCTION = """def reward_function(params):
+    return float('1'.strip())
+"""
 
 
 class TestParse(unittest.TestCase):
@@ -136,6 +142,24 @@ def reward_function(params):
         results = self._parse_code(code)
         self.assertIn("float", results)
 
+    def test_chain_error_response(self):
+        """Test that a chained call on a literal fails where check_builtins raises."""
+        lines, start = inspect.getsourcelines(inspect.unwrap(check_builtins))
+        offset, line = next(
+            (i, line) for i, line in enumerate(lines) if "raise TypeError" in line
+        )
+        self.assertEqual(
+            run_suites(CHAINED_CALL_REWARD_FUNCTION, TRACK_NAME),
+            [
+                {
+                    "type": "TEST_FAILURE",
+                    "message": "can only join an iterable",
+                    "line": line.strip(),
+                    "lineNumber": start + offset,
+                }
+            ],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,182 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import pool
+import test_reward_function
+import tracks
+from constants import PRELOAD_TRACKS_ENV
+from context import ValidationContext
+from parallel import WorkerFailure, map_in_processes, run_requests
+from pool import PoolError, WorkerPool, get_worker_pool
+from reward_function_fixtures import OBJECT_AVOIDANCE_REWARD_FUNCTION
+from test_reward_function import run_runtime_checks, run_runtime_checks_in_process
+from tracks import TrackRegistry
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "..", "routes")
+TRACK_NAME = "reInvent2019_track_ccw"
+# Takes a while per call, and fails every scenario check with its return type
+SLOW_INT_REWARD_FUNCTION = """import math
+
+
+def reward_function(params):
+    total = 0.0
+    for i in range(100000):
+        total += math.sqrt(i)
+    return 1
+"""
+
+
+def _handler(request):
+    if request == "sleep":
+        time.sleep(60)
+    if request == "exit":
+        os._exit(1)
+    if request == "raise":
+        raise ValueError("bad request")
+    if request == "state":
+        return sorted({"numpy", "scipy", "shapely"} & set(sys.modules))
+    return os.getpid()
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Test cases for the pre-forked worker pool."""
+
+    def setUp(self):
+        self.pool = WorkerPool(_handler, size=2)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_requests_run_in_workers(self):
+        """Test that requests are served by the pool processes, in order."""
+        pids = self.pool.map([None] * 6)
+        self.assertNotIn(os.getpid(), pids)
+        self.assertEqual(len(set(pids)), 2)
+        self.assertEqual(self.pool.run("state"), ["numpy", "scipy", "shapely"])
+
+    def test_workers_are_reused(self):
+        """Test that a worker serves many requests without forking again."""
+        self.assertEqual(self.pool.run(None), self.pool.run(None))
+
+    def test_recycled_after_max_requests(self):
+        """Test that a worker is replaced after max_requests requests."""
+        self.pool.close()
+        self.pool = WorkerPool(_handler, size=1, max_requests=2)
+        pids = [self.pool.run(None) for _ in range(4)]
+        self.assertEqual(pids[0], pids[1])
+        self.assertEqual(pids[2], pids[3])
+        self.assertNotEqual(pids[1], pids[2])
+        self.assertEqual(self.pool.recycled, 2)
+
+    def test_recycled_over_memory_threshold(self):
+        """Test that a worker over max_rss_mb is replaced after its request."""
+        self.pool.close()
+        self.pool = WorkerPool(_handler, size=1, max_rss_mb=0)
+        self.assertNotEqual(self.pool.run(None), self.pool.run(None))
+
+    def test_track_preload(self):
+        """Test that workers are forked with every track loaded, unless the
+        track preload is disabled.
+        """
+        for value, loaded in (("1", True), ("0", False)):
+            registry = TrackRegistry(ROUTES_DIR)
+            with mock.patch.dict(
+                os.environ, {PRELOAD_TRACKS_ENV: value}
+            ), mock.patch.object(tracks, "_registry", registry):
+                WorkerPool(_handler, size=1).close()
+            self.assertEqual(bool(registry._tracks), loaded, value)
+
+    def test_handler_errors_are_raised(self):
+        """Test that a handler exception is raised in the caller."""
+        with self.assertRaises(PoolError) as cm:
+            self.pool.run("raise")
+        self.assertEqual(str(cm.exception), "ValueError: bad request")
+
+    def test_dead_and_stuck_workers_are_replaced(self):
+        """Test that failures only affect their own request."""
+        results = self.pool.map(["exit", "sleep", None, None], timeout=1)
+        self.assertEqual(results[0].reason, WorkerFailure.EXITED)
+        self.assertEqual(results[1].reason, WorkerFailure.TIMEOUT)
+        self.assertIsInstance(results[2], int)
+        self.assertEqual(len(self.pool._workers), 2)
+        self.assertIsInstance(self.pool.run(None), int)
+
+    def test_deadline(self):
+        """Test that pool requests follow the deadline rules of
+        map_in_processes.
+        """
+        self.pool.close()
+        self.pool = WorkerPool(_handler, size=1)
+        results = run_requests(
+            ["sleep", None], self.pool, deadline=time.monotonic() + 0.5
+        )
+        self.assertEqual(
+            [r.reason for r in results], [WorkerFailure.TIMEOUT, WorkerFailure.TIMEOUT]
+        )
+        self.assertEqual(self.pool.replaced, 1)
+        self.assertIsInstance(self.pool.run(None), int)
+
+
+class TestRuntimeChecksInPool(unittest.TestCase):
+    """Test cases for running the runtime checks in the process-wide pool."""
+
+    def test_matches_in_process_checks(self):
+        """Test that pooled runtime checks return the in-process results."""
+        for source in (
+            OBJECT_AVOIDANCE_REWARD_FUNCTION,
+            "def reward_function(p):\n    return 1\n",
+        ):
+            context = ValidationContext(source, TRACK_NAME)
+            try:
+                self.assertEqual(
+                    run_runtime_checks(context), run_runtime_checks_in_process(context)
+                )
+            finally:
+                context.close()
+        self.assertIsNotNone(get_worker_pool(test_reward_function._run_runtime_request))
+
+    def test_failures_keep_their_worker(self):
+        """Test that a failing validation does not leave checks running in
+        its worker, which would have it replaced.
+        """
+        worker_pool = WorkerPool(test_reward_function._run_runtime_request, size=1)
+        self.addCleanup(worker_pool.close)
+        with mock.patch.object(
+            test_reward_function, "get_worker_pool", return_value=worker_pool
+        ):
+            for _ in range(3):
+                context = ValidationContext(SLOW_INT_REWARD_FUNCTION, TRACK_NAME)
+                try:
+                    errors = run_runtime_checks(context)
+                finally:
+                    context.close()
+                self.assertEqual(
+                    errors[0]["message"], "Method returned non-floating type value: 1"
+                )
+        self.assertEqual(worker_pool.replaced, 0)
+
+    def test_disabled_by_environment(self):
+        """Test that VALIDATION_POOL_WORKERS=0 disables the pool."""
+        with mock.patch.dict(os.environ, {"VALIDATION_POOL_WORKERS": "0"}):
+            self.assertEqual(pool.pool_size(), 0)
+        with mock.patch.dict(os.environ, {"VALIDATION_POOL_WORKERS": "3"}):
+            self.assertEqual(pool.pool_size(), 3)
+
+    def test_no_pool_in_forked_children(self):
+        """Test that forked children run their checks in-process."""
+        self.assertEqual(
+            map_in_processes(lambda _: get_worker_pool(_handler), [None]), [None]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
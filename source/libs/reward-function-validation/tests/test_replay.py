@@ -0,0 +1,157 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+from replay import Trajectory, main, replay, replay_laps
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from tracks import TrackRegistry
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "..", "routes")
+TRACK_NAME = "reInvent2019_track_ccw"
+
+
+def reward_by_distance(params):
+    if params["distance_from_center"] <= 0.1 * params["track_width"]:
+        return 1.0
+    return 0.5
+
+
+class TestTrajectory(unittest.TestCase):
+    """Test cases for the per step state of a synthetic lap."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.track = TrackRegistry(ROUTES_DIR).get(TRACK_NAME)
+
+    def test_lap_is_consistent(self):
+        """Test that progress, steps and waypoints advance together."""
+        trajectory = Trajectory(self.track)
+        length = self.track.geometry.center_length
+        self.assertEqual(len(trajectory), int(np.ceil(length * 15)))
+        np.testing.assert_array_equal(
+            trajectory.steps, np.arange(1, len(trajectory) + 1)
+        )
+        self.assertEqual(trajectory.progress[0], 0)
+        self.assertTrue(np.all(np.diff(trajectory.progress) > 0))
+        self.assertLess(trajectory.progress[-1], 100)
+        closest = trajectory.closest_waypoints
+        self.assertTrue(np.all(closest[:, 1] - closest[:, 0] == 1))
+        self.assertTrue(np.all(np.diff(closest[:, 0]) >= 0))
+        self.assertEqual(closest[-1, 1], len(self.track.waypoints) - 1)
+
+    def test_center_line(self):
+        """Test that a lap without offset stays on the center line."""
+        trajectory = Trajectory(self.track)
+        points = self.track.geometry.center
+        previous, following = trajectory.closest_waypoints.T
+        segment = points[following] - points[previous]
+        relative = np.stack([trajectory.x, trajectory.y], axis=1) - points[previous]
+        cross = segment[:, 0] * relative[:, 1] - segment[:, 1] * relative[:, 0]
+        np.testing.assert_allclose(cross, 0, atol=1e-9)
+        np.testing.assert_allclose(trajectory.distance_from_center, 0, atol=1e-9)
+        self.assertTrue(np.all(trajectory.all_wheels_on_track))
+
+    def test_heading_follows_motion(self):
+        """Test that the heading points towards the next step."""
+        trajectory = Trajectory(self.track, 0.5)
+        dx = np.diff(trajectory.x)
+        dy = np.diff(trajectory.y)
+        expected = np.degrees(np.arctan2(dy, dx))
+        np.testing.assert_allclose(trajectory.heading[:-1], expected)
+        # A counter clockwise lap mostly steers left
+        self.assertGreater(np.mean(trajectory.steering_angle), 0)
+        self.assertLessEqual(np.max(np.abs(trajectory.steering_angle)), 30)
+
+    def test_offsets(self):
+        """Test that offsets move the car to either side and off the track."""
+        inner = Trajectory(self.track, -0.5)
+        outer = Trajectory(self.track, 0.5)
+        np.testing.assert_allclose(
+            inner.distance_from_center, inner.track_width / 4, atol=0.01
+        )
+        self.assertTrue(np.all(inner.is_left_of_center != outer.is_left_of_center))
+        for trajectory in (inner, outer):
+            self.assertTrue(np.all(trajectory.all_wheels_on_track))
+            self.assertFalse(np.any(trajectory.is_offtrack))
+
+    def test_off_track(self):
+        """Test that offsets beyond the half track width are off the track."""
+        for offset in (-1.5, 1.5):
+            trajectory = Trajectory(self.track, offset)
+            self.assertFalse(np.any(trajectory.all_wheels_on_track), offset)
+            self.assertTrue(np.all(trajectory.is_offtrack), offset)
+            self.assertTrue(
+                np.all(trajectory.distance_from_center > trajectory.track_width / 2)
+            )
+
+
+class TestReplay(unittest.TestCase):
+    """Test cases for replaying laps through a reward function."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.track = TrackRegistry(ROUTES_DIR).get(TRACK_NAME)
+
+    def test_rewards(self):
+        """Test that every step's reward is kept in a float array."""
+        result = replay(reward_by_distance, self.track)
+        self.assertEqual(result.rewards.dtype, np.float64)
+        self.assertEqual(len(result.rewards), len(Trajectory(self.track)))
+        self.assertEqual(result.summary()["mean"], 1.0)
+        self.assertEqual(
+            replay(reward_by_distance, self.track, 0.5).summary()["mean"], 0.5
+        )
+
+    def test_params_are_fresh(self):
+        """Test that a reward function mutating params does not affect later steps."""
+
+        def mutate(params):
+            params["objects_location"].clear()
+            params["closest_waypoints"][0] = -1
+            return 1.0
+
+        self.assertFalse(replay(mutate, self.track).failed)
+        self.assertEqual(len(self.track.params("valid_params")["objects_location"]), 6)
+
+    def test_stops_at_first_error(self):
+        """Test that the rewards stop at the step that failed."""
+
+        def fail_late(params):
+            if params["progress"] > 50:
+                return 1
+            return 1.0
+
+        result = replay(fail_late, self.track)
+        self.assertTrue(result.failed)
+        self.assertIn("non-floating", result.summary()["error"])
+        self.assertTrue(0 < len(result.rewards) < len(Trajectory(self.track)))
+
+    def test_replay_laps(self):
+        """Test that every track and offset is replayed."""
+        results = replay_laps(reward_by_distance, [self.track], offsets=(0.0, 0.5))
+        self.assertEqual([r.offset for r in results], [0.0, 0.5])
+
+    def test_command_line(self):
+        """Test that the script replays a reward function file."""
+        with tempfile.NamedTemporaryFile("w", suffix=".py") as f:
+            f.write(BASIC_REWARD_FUNCTION)
+            f.flush()
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                self.assertEqual(main([f.name, TRACK_NAME]), 0)
+        self.assertEqual(len(output.getvalue().splitlines()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,24 +20,9 @@ from test_reward_function import run_flake8
 class TestRunFlake8Linting(unittest.TestCase):
     """Test cases for the run_flake8 function linting capabilities."""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.reward_function_path = "/tmp/reward_function.py" # NOSONAR
-
-    def tearDown(self):
-        """Clean up after each test method."""
-        if os.path.exists(self.reward_function_path):
-            os.remove(self.reward_function_path)
-
-    def _write_test_code(self, code):
-        """Helper method to write test code to the expected file path."""
-        with open(self.reward_function_path, "w") as f:
-            f.write(code)
-
     def _run_flake8_and_get_result(self, code):
-        """Helper method to write code and run flake8."""
-        self._write_test_code(code)
-        return run_flake8()
+        """Helper method to run flake8 on the given code."""
+        return run_flake8(code)
 
     def _get_message_text(self, error_dict):
         """Helper method to extract message text from error dict, handling both string and list cases."""
@@ -290,20 +275,19 @@ def reward_function(params):
 
     def test_function_handles_exceptions(self):
         """Test that run_flake8 handles exceptions gracefully."""
-        # Test with a file that doesn't exist (should be handled by the function)
-        if os.path.exists(self.reward_function_path):
-            os.remove(self.reward_function_path)
+        # Source that cannot be tokenized (should be handled by the function)
+        code = "def reward_function(params):\n    return '\0\n"
 
         # This should not raise an exception but handle it internally
         try:
-            result = run_flake8()
-            # The function should handle the missing file gracefully
+            result = run_flake8(code)
+            # The function should handle the unreadable source gracefully
             self.assertIsInstance(
-                result, list, "Should return a list even with missing file"
+                result, list, "Should return a list even with unreadable source"
             )
         except Exception as e:
             self.fail(
-                f"run_flake8 should handle missing file gracefully, but raised: {e}"
+                f"run_flake8 should handle unreadable source gracefully, but raised: {e}"
             )
 
     def test_result_structure(self):
@@ -0,0 +1,159 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import contextlib
+import http.client
+import io
+import json
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import test_reward_function
+from lambda_function import lambda_handler
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from server import ValidationServer
+
+TRACK_NAME = "reInvent2019_track_ccw"
+EVENT = {"reward_function": BASIC_REWARD_FUNCTION, "track_name": TRACK_NAME}
+
+
+def _request(port, method, path, body=None):
+    """Send one request on a connection of its own, from a thread."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        data = None if body is None else json.dumps(body).encode()
+        connection.request(method, path, body=data)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read()), dict(response.headers)
+    finally:
+        connection.close()
+
+
+class _BlockingHandler:
+    """Handler that answers once released, counting its calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, event, _context):
+        self.calls += 1
+        self.release.wait(30)
+        return {"statusCode": 200, "body": json.dumps([event["track_name"]])}
+
+
+class TestValidationServer(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the HTTP validation service."""
+
+    async def _start(self, **kwargs):
+        server = ValidationServer(**kwargs)
+        await server.start("127.0.0.1", 0)
+        self.addAsyncCleanup(server.drain, 1)
+        return server
+
+    def _post(self, server, event):
+        return asyncio.create_task(
+            asyncio.to_thread(_request, server.port, "POST", "/validate", event)
+        )
+
+    async def _until(self, condition):
+        for _ in range(500):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        self.fail("condition not reached")
+
+    async def test_same_body_as_lambda(self):
+        """Test that a validation answers with the body of lambda_handler."""
+        with mock.patch.object(
+            test_reward_function, "get_worker_pool", return_value=None
+        ), contextlib.redirect_stdout(io.StringIO()):
+            server = await self._start(workers=2)
+            status, body, headers = await self._post(server, EVENT)
+            expected = json.loads(lambda_handler(EVENT, None)["body"])
+            bad_event = dict(EVENT, reward_function="def reward_function(:\n")
+            bad_status, bad_body, _ = await self._post(server, bad_event)
+        self.assertEqual((status, body), (200, expected))
+        self.assertIn("timings", json.loads(headers["X-Validation-Metrics"]))
+        self.assertEqual(bad_status, 200)
+        self.assertEqual(bad_body, json.loads(lambda_handler(bad_event, None)["body"]))
+
+    async def test_coalescing(self):
+        """Test that identical requests in flight share one validation."""
+        handler = _BlockingHandler()
+        server = await self._start(handler=handler, workers=1, queue_size=0)
+        tasks = [self._post(server, EVENT) for _ in range(3)]
+        await self._until(lambda: server.coalesced == 2)
+        handler.release.set()
+        results = await asyncio.gather(*tasks)
+        self.assertEqual(handler.calls, 1)
+        self.assertEqual(
+            [(status, body) for status, body, _ in results], [(200, [TRACK_NAME])] * 3
+        )
+
+    async def test_admission_queue(self):
+        """Test that requests past the workers and queue get a 503."""
+        handler = _BlockingHandler()
+        server = await self._start(handler=handler, workers=1, queue_size=1)
+        tasks = [
+            self._post(server, dict(EVENT, track_name=name)) for name in ("a", "b")
+        ]
+        await self._until(lambda: server.admitted == 2)
+        self.assertEqual(server.health()["queued"], 1)
+        status, _, headers = await self._post(server, dict(EVENT, track_name="c"))
+        self.assertEqual(status, 503)
+        self.assertEqual(headers["Retry-After"], "1")
+        handler.release.set()
+        results = await asyncio.gather(*tasks)
+        self.assertEqual([body for _, body, _ in results], [["a"], ["b"]])
+
+    async def test_invalid_requests(self):
+        """Test that requests lambda_handler cannot take get a 4xx."""
+        server = await self._start(handler=_BlockingHandler(), workers=1)
+        missing = {"reward_function": BASIC_REWARD_FUNCTION}
+        for method, path, body, expected in (
+            ("POST", "/validate", missing, 400),
+            ("POST", "/validate", ["not", "an", "object"], 400),
+            ("POST", "/validate", {"items": "not a list"}, 400),
+            ("GET", "/validate", None, 405),
+            ("POST", "/other", EVENT, 404),
+        ):
+            status, body, _ = await asyncio.to_thread(
+                _request, server.port, method, path, body
+            )
+            self.assertEqual(status, expected, path)
+            self.assertIn("message", body[0])
+
+    async def test_drain(self):
+        """Test that draining answers accepted requests and turns away
+        new ones.
+        """
+        handler = _BlockingHandler()
+        server = await self._start(handler=handler, workers=1)
+        status, health, _ = await asyncio.to_thread(
+            _request, server.port, "GET", "/health"
+        )
+        self.assertEqual((status, health["status"]), (200, "ok"))
+        task = self._post(server, EVENT)
+        await self._until(lambda: server.admitted == 1)
+        drain = asyncio.create_task(server.drain(10))
+        await asyncio.sleep(0.1)
+        self.assertFalse(drain.done())
+        with self.assertRaises(ConnectionError):
+            await asyncio.to_thread(_request, server.port, "GET", "/health")
+        handler.release.set()
+        self.assertTrue(await drain)
+        status, body, headers = await task
+        self.assertEqual((status, body), (200, [TRACK_NAME]))
+        self.assertEqual(headers["Connection"], "close")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+from replay import Trajectory
+from spatial import SegmentGrid
+from tracks import TrackRegistry
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "..", "routes")
+# A long track the grid answers from its cells, and a compact one it scans
+TRACK_NAMES = ("penbay_pro_cw", "reInvent2019_wide_ccw")
+
+
+class TestSegmentGrid(unittest.TestCase):
+    """Test cases for the nearest segment index of a track."""
+
+    @classmethod
+    def setUpClass(cls):
+        registry = TrackRegistry(ROUTES_DIR)
+        cls.tracks = [registry.get(name) for name in TRACK_NAMES]
+
+    def test_both_query_paths(self):
+        """Test that the fixture tracks cover the cell and the scan path."""
+        self.assertEqual([track.index.dense for track in self.tracks], [False, True])
+
+    def test_matches_scan(self):
+        """Test that the nearest segment is the one a full scan finds."""
+        rng = np.random.default_rng(0)
+        for track in self.tracks:
+            points = track.geometry.center
+            low, high = points.min(axis=0) - 3, points.max(axis=0) + 3
+            near = points[rng.integers(0, len(points), 5000)] + rng.normal(
+                0, 0.5, (5000, 2)
+            )
+            xy = np.concatenate([near, rng.uniform(low, high, (5000, 2))])
+            closest, _, _ = track.index.nearest(xy)
+            np.testing.assert_array_equal(
+                closest[:, 0], track.index.scan(xy), track.name
+            )
+            np.testing.assert_array_equal(closest[:, 1], closest[:, 0] + 1)
+
+    def test_points_on_waypoints(self):
+        """Test that waypoints lie on the center line at their arc length."""
+        for track in self.tracks:
+            geometry = track.geometry
+            closest, arc_length, offset = track.index.nearest(geometry.center[:-1])
+            self.assertTrue(np.all(closest.min(axis=1) <= np.arange(len(closest))))
+            np.testing.assert_allclose(offset, 0, atol=1e-9)
+            np.testing.assert_allclose(
+                arc_length, geometry.center_cumulative_length[:-1], atol=1e-9
+            )
+
+    def test_index_size(self):
+        """Test that the index holds one candidate list per cell, and no
+        copies of the segments per cell.
+        """
+        for track in self.tracks:
+            index = track.index
+            arrays = [v for v in vars(index).values() if isinstance(v, np.ndarray)]
+            segments = len(track.geometry.center) - 1
+            self.assertEqual(index.candidates.dtype, np.int32)
+            self.assertLessEqual(
+                sum(a.nbytes for a in arrays),
+                index.candidates.nbytes + index.empty.nbytes + 64 * segments,
+                track.name,
+            )
+
+    def test_matches_replay(self):
+        """Test that a replayed lap is located where it was driven."""
+        for track in self.tracks:
+            for offset in (-0.5, 0.5):
+                trajectory = Trajectory(track, offset)
+                xy = np.stack([trajectory.x, trajectory.y], axis=1)
+                closest, arc_length, lateral = track.index.nearest(xy)
+                np.testing.assert_array_equal(lateral > 0, trajectory.is_left_of_center)
+                # Inside a hairpin another part of the lap can be nearer
+                driven = abs(offset) * trajectory.track_width / 2
+                error = np.abs(np.abs(lateral) - driven)
+                self.assertGreater(np.mean(error < 0.05), 0.98)
+                along = trajectory.progress * track.geometry.center_length / 100
+                self.assertLess(np.median(np.abs(arc_length - along)), 0.05)
+
+    def test_single_point(self):
+        """Test that a single (x, y) is answered as a batch of one."""
+        track = self.tracks[0]
+        closest, arc_length, offset = track.index.nearest(track.geometry.center[3])
+        self.assertEqual(closest.shape, (1, 2))
+        self.assertEqual(arc_length.shape, (1,))
+        self.assertEqual(offset.shape, (1,))
+
+    def test_degenerate_segments(self):
+        """Test that repeated points do not divide by zero."""
+        points = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 0.0], [1.0, 1.0]])
+        cumulative = np.array([0.0, 1.0, 1.0, 2.0])
+        index = SegmentGrid(points, cumulative, 0.5)
+        closest, arc_length, offset = index.nearest([[0.5, 0.2], [1.2, 0.5]])
+        np.testing.assert_array_equal(closest[:, 0], [0, 2])
+        np.testing.assert_allclose(arc_length, [0.5, 1.5])
+        np.testing.assert_allclose(offset, [0.2, -0.2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import ast
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+from static_analysis import StaticAnalysis, TreeWalk
+
+
+class TestStaticAnalysis(unittest.TestCase):
+    """Test cases for the single-pass static analysis of a reward function."""
+
+    def test_imports(self):
+        """Test that imports are reported the way the former Analyzer did."""
+        code = "import os.path\nimport math, numpy as np\nfrom shapely.geometry import Point, Polygon\n"
+        self.assertEqual(
+            StaticAnalysis(code).imports,
+            {"os.path", "math", "numpy", "shapely.geometry"},
+        )
+
+    def test_call_order(self):
+        """Test that call arguments are recorded before the chain they belong to."""
+        code = "a.b(len(x)).c(str(y), k=open(z))\nprint(obj.attr)\n"
+        self.assertEqual(
+            StaticAnalysis(code).calls,
+            ["str", "len", "a.b.c", "obj.attr", "print"],
+        )
+
+    def test_chain_error(self):
+        """Test that chains not rooted at a name are flagged."""
+        analysis = StaticAnalysis("x = len(y)\nz = '{}'.format(x)\nprint(z)\n")
+        self.assertTrue(analysis.chain_error)
+        self.assertEqual(analysis.calls, ["len"])
+
+    def test_forbidden_strings(self):
+        """Test that restricted strings are found anywhere in the source."""
+        analysis = StaticAnalysis("# np.savetxt\nx = 1\n")
+        self.assertEqual(analysis.forbidden_strings, ["save", "savetxt"])
+
+    def test_source_is_parsed_once(self):
+        """Test that all properties share one parse of the source."""
+        analysis = StaticAnalysis("import math\nprint(math.pi)\n")
+        with mock.patch("static_analysis.ast.parse", wraps=ast.parse) as parse:
+            analysis.imports
+            analysis.calls
+            analysis.chain_error
+        self.assertEqual(parse.call_count, 1)
+
+    def test_syntax_error_is_raised(self):
+        """Test that unparsable sources raise SyntaxError on access."""
+        with self.assertRaises(SyntaxError):
+            StaticAnalysis("def f(:\n").imports
+
+    def test_deep_tree_does_not_recurse(self):
+        """Test that very deep trees are walked without hitting the recursion limit."""
+        node = ast.Name(id="x", ctx=ast.Load())
+        for _ in range(sys.getrecursionlimit() * 2):
+            node = ast.UnaryOp(op=ast.USub(), operand=node)
+        tree = ast.Module(
+            body=[
+                ast.Expr(
+                    value=ast.Call(
+                        func=ast.Name(id="f", ctx=ast.Load()), args=[node], keywords=[]
+                    )
+                )
+            ],
+            type_ignores=[],
+        )
+        self.assertEqual(TreeWalk(tree).calls, ["f"])
+
+
+if __name__ == "__main__":
+    unittest.main()
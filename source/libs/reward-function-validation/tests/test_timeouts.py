@@ -0,0 +1,99 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import deadline
+from parallel import map_in_processes
+from pool import WorkerPool
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from test_reward_function import TIMED_OUT_MESSAGE, _run_runtime_request
+
+TRACK_NAME = "reInvent2019_track_ccw"
+BUDGET = 20
+# Passes the synchronous import check, then spins in the off track test
+OFF_TRACK_RUNAWAY_REWARD_FUNCTION = """def reward_function(params):
+    while params['is_offtrack']:
+        pass
+    return 1.0
+"""
+RUNAWAY_REWARD_FUNCTION = """def reward_function(params):
+    while True:
+        pass
+"""
+
+
+def _cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class TestRunawayRewardFunctions(unittest.TestCase):
+    """Soak test: runaway reward functions must not slow down later requests."""
+
+    REQUESTS = 40
+
+    def setUp(self):
+        # Scenarios of a fast reward function get the minimum budget
+        patcher = mock.patch.object(deadline, "SCENARIO_MIN_BUDGET_SEC", 0.05)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = WorkerPool(_run_runtime_request, size=1)
+        self.addCleanup(self.pool.close)
+
+    def _throughput(self):
+        request = (BASIC_REWARD_FUNCTION, TRACK_NAME, BUDGET)
+        start = time.perf_counter()
+        for _ in range(self.REQUESTS):
+            results, _ = self.pool.run(request)
+            self.assertEqual(results, [])
+        return self.REQUESTS / (time.perf_counter() - start)
+
+    def test_throughput_recovers_after_runaway_functions(self):
+        """Test that timed out evaluations are killed with their worker."""
+        before = self._throughput()
+        for _ in range(3):
+            results, _ = self.pool.run(
+                (OFF_TRACK_RUNAWAY_REWARD_FUNCTION, TRACK_NAME, BUDGET)
+            )
+            self.assertEqual(results[0]["message"], TIMED_OUT_MESSAGE)
+            self.assertEqual(results[0]["stage"], "runtime")
+        self.assertEqual(self.pool.replaced, 3)
+
+        worker = next(iter(self.pool._workers))
+        idle_cpu = _cpu_seconds(worker.process.pid)
+        time.sleep(0.3)
+        self.assertLess(_cpu_seconds(worker.process.pid) - idle_cpu, 0.1)
+        self.assertGreater(self._throughput(), before * 0.5)
+
+    def test_runaway_on_main_thread(self):
+        """Test that an evaluation that never yields is stopped by the deadline."""
+        failure = self.pool.run(
+            (RUNAWAY_REWARD_FUNCTION, TRACK_NAME, BUDGET), timeout=1
+        )
+        self.assertEqual(failure.reason, "timeout")
+        self.assertEqual(self.pool.replaced, 1)
+        results, _ = self.pool.run((BASIC_REWARD_FUNCTION, TRACK_NAME, BUDGET))
+        self.assertEqual(results, [])
+
+    def test_batch_workers_are_replaced(self):
+        """Test that a batch worker left with a spinning thread is not reused."""
+        results = map_in_processes(
+            lambda source: _run_runtime_request((source, TRACK_NAME, BUDGET)),
+            [OFF_TRACK_RUNAWAY_REWARD_FUNCTION, BASIC_REWARD_FUNCTION],
+            workers=1,
+        )
+        self.assertEqual(results[0][0][0]["message"], TIMED_OUT_MESSAGE)
+        self.assertEqual(results[1][0], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import io
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+import test_reward_function
+import validator
+from cache import ValidationCache
+from constants import METRICS_NAMESPACE
+from lambda_function import lambda_handler
+from reward_function_fixtures import BASIC_REWARD_FUNCTION
+from test_reward_function import (
+    MODULE_CHECKS,
+    RUNTIME_CHECKS,
+    STATIC_CHECKS,
+    run_suites,
+    run_suites_on_tracks,
+)
+from timings import Timings, metric_record
+
+TRACK_NAME = "reInvent2019_track_ccw"
+STAGES = ("lint", "static", "import", "runtime", "latency", "fuzz", "total")
+CHECKS = tuple(
+    check.__name__ for check in STATIC_CHECKS + MODULE_CHECKS + RUNTIME_CHECKS
+)
+
+
+def _metric_lines(output):
+    # Embedded metric format records among the other output lines
+    records = []
+    for line in output.splitlines():
+        if line.startswith("{"):
+            record = json.loads(line)
+            if "_aws" in record:
+                records.append(record)
+    return records
+
+
+class TestTimings(unittest.TestCase):
+    """Test cases for recording and logging timings."""
+
+    def test_stage(self):
+        """Test that a stage is recorded in milliseconds, even if it raises."""
+        timings = Timings()
+        with self.assertRaises(ValueError), timings.stage("failing"):
+            raise ValueError()
+        timings.update({"other": 2.5})
+        self.assertGreaterEqual(timings.ms["failing"], 0)
+        self.assertEqual(timings.ms["other"], 2.5)
+
+    def test_metric_record(self):
+        """Test that timings map to one embedded metric format record."""
+        record = metric_record({"lint": 1.5, "total": 3.0}, {"track_name": "a"})
+        directive = record["_aws"]["CloudWatchMetrics"][0]
+        self.assertEqual(directive["Namespace"], METRICS_NAMESPACE)
+        self.assertEqual(directive["Dimensions"], [[]])
+        self.assertEqual(
+            directive["Metrics"],
+            [
+                {"Name": "lint", "Unit": "Milliseconds"},
+                {"Name": "total", "Unit": "Milliseconds"},
+            ],
+        )
+        self.assertIsInstance(record["_aws"]["Timestamp"], int)
+        self.assertEqual(record["lint"], 1.5)
+        self.assertEqual(record["track_name"], "a")
+
+
+class TestValidationTimings(unittest.TestCase):
+    """Test cases for the timings of a validation."""
+
+    def _validate(self, **kwargs):
+        metrics = {}
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = run_suites(BASIC_REWARD_FUNCTION, TRACK_NAME, metrics=metrics)
+        self.assertEqual(result, [])
+        return metrics["timings"], _metric_lines(output.getvalue())
+
+    def _assert_complete(self, timings):
+        for name in STAGES + CHECKS:
+            self.assertIn(name, timings)
+        self.assertLessEqual(timings["lint"], timings["check_syntax"])
+        self.assertLessEqual(timings["fuzz"], timings["runtime"])
+        self.assertLessEqual(timings["runtime"], timings["total"])
+
+    def test_pool(self):
+        """Test that the pool worker returns the timings of its checks."""
+        timings, records = self._validate()
+        self._assert_complete(timings)
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        names = [m["Name"] for m in record["_aws"]["CloudWatchMetrics"][0]["Metrics"]]
+        self.assertEqual(names, list(timings))
+        self.assertEqual({name: record[name] for name in names}, timings)
+        self.assertEqual(record["track_name"], TRACK_NAME)
+
+    def test_in_process(self):
+        """Test that checks run in-process record the same timings."""
+        with mock.patch.object(
+            test_reward_function, "get_worker_pool", return_value=None
+        ):
+            timings, _ = self._validate()
+        self._assert_complete(timings)
+
+    def test_cached(self):
+        """Test that a cached result is timed without the checks it skips."""
+        cache = ValidationCache()
+        run_suites(BASIC_REWARD_FUNCTION, TRACK_NAME, cache)
+        metrics = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_suites(BASIC_REWARD_FUNCTION, TRACK_NAME, cache, metrics)
+        self.assertEqual(list(metrics["timings"]), ["total"])
+
+    def test_batch(self):
+        """Test that batch mode reports the runtime timings of each track."""
+        tracks = [TRACK_NAME, "Oval_track"]
+        metrics = {}
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            run_suites_on_tracks(BASIC_REWARD_FUNCTION, tracks, metrics=metrics)
+        timings = metrics["timings"]
+        for name in ("lint", "static", "runtime", "total"):
+            self.assertIn(name, timings)
+        self.assertEqual(sorted(timings["tracks"]), sorted(tracks))
+        for track_timings in timings["tracks"].values():
+            self.assertIn("fuzz", track_timings)
+        record = _metric_lines(output.getvalue())[-1]
+        self.assertEqual(record["track_names"], tracks)
+        self.assertNotIn("tracks", record)
+
+    def test_lambda_response(self):
+        """Test that the Lambda response carries the timings."""
+        with mock.patch.object(
+            validator, "get_validation_cache", return_value=ValidationCache()
+        ), contextlib.redirect_stdout(io.StringIO()):
+            response = lambda_handler(
+                {"reward_function": BASIC_REWARD_FUNCTION, "track_name": TRACK_NAME},
+                None,
+            )
+        self._assert_complete(response["metrics"]["timings"])
+
+
+if __name__ == "__main__":
+    unittest.main()
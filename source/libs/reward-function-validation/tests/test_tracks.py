@@ -0,0 +1,95 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", "lib", "reward_func_validator")
+)
+from scenarios import SCENARIO_NAMES, get_params
+from test_reward_function import run_suites
+from tracks import TrackNotFoundError, TrackRegistry
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), "..", "routes")
+TRACK_NAME = "reInvent2019_track_ccw"
+WAYPOINTS_WRITING_REWARD_FUNCTION = """def reward_function(params):
+    waypoints = params['waypoints']
+    waypoints[0][0] = params['x']
+    return 1.0
+"""
+
+
+class TestTrackRegistry(unittest.TestCase):
+    """Test cases for the per-process track registry."""
+
+    def setUp(self):
+        self.registry = TrackRegistry(ROUTES_DIR)
+
+    def test_index_contains_all_routes(self):
+        """Test that every .npy file in routes is indexed by name."""
+        self.assertEqual(len(self.registry.names), len(os.listdir(ROUTES_DIR)))
+        self.assertIn(TRACK_NAME, self.registry)
+
+    def test_unknown_track(self):
+        """Test that unknown or path-like names are rejected."""
+        self.assertNotIn("not_a_track", self.registry)
+        for name in ("not_a_track", "../routes/" + TRACK_NAME, ""):
+            with self.assertRaises(TrackNotFoundError):
+                self.registry.get(name)
+
+    def test_track_is_memoized(self):
+        """Test that a track is loaded once and then shared."""
+        self.assertIs(self.registry.get(TRACK_NAME), self.registry.get(TRACK_NAME))
+
+    def test_scenarios_match_get_params(self):
+        """Test that the memoized scenarios are the get_params output."""
+        track = self.registry.get(TRACK_NAME)
+        waypoints = np.load(os.path.join(ROUTES_DIR, f"{TRACK_NAME}.npy"))
+        for name, expected in zip(SCENARIO_NAMES, get_params(waypoints)):
+            params = track.params(name)
+            self.assertEqual(params.keys(), expected.keys())
+            np.testing.assert_array_equal(
+                params.pop("waypoints"), expected.pop("waypoints")
+            )
+            self.assertEqual(params, expected)
+        self.assertEqual(track.track_length, expected["track_length"])
+        self.assertEqual(track.track_width, expected["track_width"])
+
+    def test_shared_state_is_read_only(self):
+        """Test that shared waypoints and scenarios cannot be modified."""
+        track = self.registry.get(TRACK_NAME)
+        with self.assertRaises(ValueError):
+            track.waypoints[0, 0] = 0
+        with self.assertRaises(TypeError):
+            track.scenarios["start_car"]["x"] = 0
+
+    def test_params_are_copies(self):
+        """Test that mutating handed out params does not leak between calls."""
+        track = self.registry.get(TRACK_NAME)
+        params = track.params("valid_params")
+        params["x"] = -1
+        params["closest_waypoints"].append(2)
+        params["objects_location"][0][0] = -1
+        params["waypoints"][0, 0] = -1
+        fresh = track.params("valid_params")
+        self.assertNotEqual(fresh["x"], -1)
+        self.assertEqual(fresh["closest_waypoints"], [0, 1])
+        self.assertNotEqual(fresh["objects_location"][0][0], -1)
+        self.assertNotEqual(fresh["waypoints"][0, 0], -1)
+
+    def test_reward_function_may_write_waypoints(self):
+        """Test that a reward function writing to its waypoints is valid."""
+        self.assertEqual(run_suites(WAYPOINTS_WRITING_REWARD_FUNCTION, TRACK_NAME), [])
+
+    def test_preload(self):
+        """Test that preload loads every indexed track."""
+        self.registry.preload()
+        self.assertEqual(len(self.registry._tracks), len(self.registry.names))
+
+
+if __name__ == "__main__":
+    unittest.main()